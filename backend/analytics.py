@@ -0,0 +1,152 @@
+"""
+Analytics Events
+----------------
+Append-only visit/download event log with minute, hour and day rollups
+
+Events arrive from the counter flusher already aggregated per minute, so
+each flush appends one row per (type, resume, minute) and adds the same
+counts to the three rollup grains in one MERGE. Time series are read from
+the rollups only; AnalyticsEvents is never scanned by the API.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+# Counter column -> event type stored in AnalyticsEvents/AnalyticsRollups
+EVENT_TYPES = {
+    'VisitorCount': 'visit',
+    'DownloadCount': 'download',
+}
+
+# bucket -> (width, default window when ?from= is omitted)
+BUCKETS = {
+    'minute': (timedelta(minutes=1), timedelta(hours=1)),
+    'hour': (timedelta(hours=1), timedelta(days=1)),
+    'day': (timedelta(days=1), timedelta(days=30)),
+}
+
+# Longest series one request may ask for
+MAX_POINTS = 1500
+
+# Rows per statement: 4 parameters each, under SQL Server's 2100 limit
+ROWS_PER_STATEMENT = 500
+
+
+def bucket_start(moment, bucket):
+    """Start of the bucket containing `moment`"""
+    moment = moment.replace(second=0, microsecond=0)
+    if bucket in ('hour', 'day'):
+        moment = moment.replace(minute=0)
+    if bucket == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def parse_time(value, default):
+    """ISO 8601 date or datetime from a query arg; raises ValueError"""
+    if not value:
+        return default
+    try:
+        return datetime.fromisoformat(value.strip().replace('Z', ''))
+    except ValueError:
+        raise ValueError(f'Invalid date: {value} (use ISO 8601, e.g. 2026-01-31T14:00)')
+
+
+def parse_range(args, now=None):
+    """
+    (start, end, bucket) for ?from=&to=&bucket=
+
+    Raises ValueError for an unknown bucket, a reversed range or more than
+    MAX_POINTS buckets.
+    """
+    bucket = (args.get('bucket') or 'hour').lower()
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+    width, window = BUCKETS[bucket]
+    end = parse_time(args.get('to'), now or datetime.now())
+    start = parse_time(args.get('from'), end - window)
+    if start >= end:
+        raise ValueError("'from' must be before 'to'")
+    start = bucket_start(start, bucket)
+    if (end - start) / width > MAX_POINTS:
+        raise ValueError(f'Range too large: at most {MAX_POINTS} {bucket} buckets')
+    return start, end, bucket
+
+
+class AnalyticsEventStore:
+    """Writes events and rollups inside the caller's transaction, and reads series"""
+
+    def append(self, cursor, events):
+        """
+        Append events and add them to every rollup grain
+
+        Args:
+            events: list of (counter column, ResumeID or None, minute start, count)
+        """
+        events = [(EVENT_TYPES[column], resume_id, minute, count)
+                  for column, resume_id, minute, count in events if count]
+        if not events:
+            return
+
+        for start in range(0, len(events), ROWS_PER_STATEMENT):
+            chunk = events[start:start + ROWS_PER_STATEMENT]
+            cursor.execute(
+                "INSERT INTO AnalyticsEvents (EventType, ResumeID, OccurredAt, EventCount) VALUES "
+                + ', '.join('(?, ?, ?, ?)' for _ in chunk),
+                [value for event in chunk for value in event]
+            )
+
+        rollups = Counter()
+        for event_type, _, minute, count in events:
+            for bucket in BUCKETS:
+                rollups[(bucket, bucket_start(minute, bucket), event_type)] += count
+        rows = [key + (count,) for key, count in rollups.items()]
+        for start in range(0, len(rows), ROWS_PER_STATEMENT):
+            chunk = rows[start:start + ROWS_PER_STATEMENT]
+            cursor.execute(f"""
+                MERGE AnalyticsRollups WITH (HOLDLOCK) AS t
+                USING (VALUES {', '.join('(?, ?, ?, ?)' for _ in chunk)})
+                    AS s(BucketSize, BucketStart, EventType, EventCount)
+                ON t.BucketSize = s.BucketSize AND t.BucketStart = s.BucketStart
+                   AND t.EventType = s.EventType
+                WHEN MATCHED THEN
+                    UPDATE SET t.EventCount = t.EventCount + s.EventCount
+                WHEN NOT MATCHED THEN
+                    INSERT (BucketSize, BucketStart, EventType, EventCount)
+                    VALUES (s.BucketSize, s.BucketStart, s.EventType, s.EventCount);
+            """, [value for row in chunk for value in row])
+
+    def timeseries(self, cursor, start, end, bucket, pending=()):
+        """
+        Visits and downloads per bucket in [start, end), zero-filled
+
+        Args:
+            pending: (counter column, minute start, count) not yet flushed,
+                     added so the newest bucket is not behind by a flush
+
+        Returns:
+            list: {'bucket_start', 'visits', 'downloads'} dicts, oldest first
+        """
+        cursor.execute("""
+            SELECT BucketStart, EventType, EventCount
+            FROM AnalyticsRollups
+            WHERE BucketSize = ? AND BucketStart >= ? AND BucketStart < ?
+        """, (bucket, start, end))
+        counts = Counter()
+        for bucket_time, event_type, count in cursor.fetchall():
+            counts[(bucket_time, event_type)] += count
+        for column, minute, count in pending:
+            if start <= minute < end:
+                counts[(bucket_start(minute, bucket), EVENT_TYPES[column])] += count
+
+        width = BUCKETS[bucket][0]
+        series = []
+        moment = start
+        while moment < end:
+            series.append({
+                'bucket_start': moment.isoformat(),
+                'visits': counts.get((moment, 'visit'), 0),
+                'downloads': counts.get((moment, 'download'), 0),
+            })
+            moment += width
+        return series
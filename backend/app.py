@@ -7,16 +7,36 @@ Flask Main Application - With Role-Based Authentication, Analytics Tracking, Mas
 Handles authentication, job management, resume operations, visitor/download tracking, and master data
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, g
 from flask_cors import CORS
 from config import Config
-from datetime import datetime
-import hashlib
+from model import ResumeBatchLoader, RESUME_SELECT_SQL, insert_resume_children
+from pagination import (InvalidCursorError, parse_page_size, decode_cursor,
+                        keyset_clause, order_and_limit, split_page)
+from search import JobSearchIndex
+from matching import SkillMatcher
+from counters import CounterAggregator
+from analytics import AnalyticsEventStore, parse_range
+from sketches import UniqueVisitorTracker, AvailabilityFilters
+from passwords import PasswordHasher
+from tokens import TokenService, InvalidTokenError
+from bulk import (COURSE_LEVELS, GEO_LEVELS, JobBulkImporter, MasterBulkUpserter, detect_format,
+                  iter_records, split_skills)
+from cache import ResponseCache, MasterDataCache, MasterDataResolver, MASTER_TABLES, cached_response
+from reference import REFERENCE_TABLES, ReferenceDataStore, GeoTree, register_reference_routes
+from autocomplete import AUTOCOMPLETE_SOURCES, AutocompleteIndex
+from normalization import SkillNormalizer, merge_duplicate_skills
+from serialization import FastJSONProvider
+from versions import DataVersions
+from datetime import datetime, date, timedelta
 import re
+import secrets
+import pyodbc
 
 def create_app():
     """Creates and configures the Flask application"""
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     CORS(app, resources={
         r"/api/*": {
             "origins": "*",
@@ -24,15 +44,152 @@ def create_app():
             "allow_headers": ["Content-Type", "Authorization"]
         }
     })
+    
+    @app.teardown_request
+    def release_db_connections(exc):
+        """Return pooled connections a handler left open (early return or exception)"""
+        Config.release_thread_connections()
+    
     return app
 
 app = create_app()
 
-# ==================== HELPER FUNCTIONS ====================
+# Shared per-dataset versions; how this worker learns about the others' writes
+data_versions = DataVersions(
+    Config.get_db_connection,
+    check_interval=Config.DATA_VERSION_CHECK_SECONDS
+)
+
+@app.before_request
+def sync_data_versions():
+    """Apply other workers' writes to the in-memory state before handling the request"""
+    if request.method != 'OPTIONS' and request.path != '/api/health':
+        data_versions.sync()
+
+# Keyword index over active jobs, kept current by the job write endpoints; other
+# workers' job writes (and edits made outside the API) trigger a background rebuild
+job_index = JobSearchIndex(Config.get_db_connection, reload_after=Config.JOB_INDEX_RELOAD_SECONDS)
+data_versions.on_change('jobs', job_index.reload_in_background)
+
+# Resume <-> job skill matching, kept current by the resume and job write endpoints;
+# other workers' writes trigger a background rebuild
+skill_matcher = SkillMatcher(Config.get_db_connection,
+                             reload_after=Config.SKILL_MATCHER_RELOAD_SECONDS)
+data_versions.on_change('jobs', skill_matcher.reload_in_background)
+data_versions.on_change('resumes', skill_matcher.reload_in_background)
+
+# Cached job listing responses; every job write (in any worker) bumps the 'jobs' version
+job_cache = ResponseCache(
+    ttl=Config.JOB_CACHE_TTL_SECONDS,
+    max_entries=Config.JOB_CACHE_MAX_ENTRIES,
+    max_bytes=Config.JOB_CACHE_MAX_BYTES,
+    versions=data_versions,
+    dataset='jobs'
+)
+
+# Name -> ID map for the master tables create_job links to
+master_cache = MasterDataCache(ttl=Config.MASTER_CACHE_TTL_SECONDS)
+
+# Versioned snapshots of the master tables behind the reference GET endpoints
+reference_data = ReferenceDataStore(
+    REFERENCE_TABLES,
+    Config.get_db_connection,
+    dumps=lambda obj: app.json.dumps(obj),
+    ttl=Config.REFERENCE_TTL_SECONDS
+)
+
+# Country -> State -> City tree over the geography snapshots
+geo_tree = GeoTree(reference_data)
+
+# Maps skill spellings onto existing JobSkillsMaster names ("PYTHON " -> "Python")
+skill_normalizer = SkillNormalizer()
+
+# Frequency-ranked prefix completion for skills, companies, courses and cities
+autocomplete = AutocompleteIndex(
+    Config.get_db_connection,
+    reload_after=Config.AUTOCOMPLETE_RELOAD_SECONDS
+)
+
+# Salted scrypt/PBKDF2 hashing in a process pool; upgrades legacy SHA-256 on login
+password_hasher = PasswordHasher(
+    algorithm=Config.PASSWORD_HASH_ALGORITHM,
+    scrypt_n=Config.PASSWORD_SCRYPT_N,
+    scrypt_r=Config.PASSWORD_SCRYPT_R,
+    scrypt_p=Config.PASSWORD_SCRYPT_P,
+    pbkdf2_iterations=Config.PASSWORD_PBKDF2_ITERATIONS,
+    workers=Config.PASSWORD_HASH_WORKERS
+)
+
+# HMAC-signed session tokens issued at login, verified without the database
+if not Config.TOKEN_SECRET:
+    print("⚠️  Warning: TOKEN_SECRET is not set; using a random per-process key")
+token_service = TokenService(
+    Config.TOKEN_SECRET or secrets.token_bytes(32),
+    ttl=Config.TOKEN_TTL_SECONDS,
+    cache_size=Config.TOKEN_CACHE_SIZE
+)
 
-def hash_password(password):
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+def load_token_revocations():
+    """Copy unexpired logouts from RevokedTokens (all workers) into token_service"""
+    conn = Config.get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT Jti, ExpiresAt FROM RevokedTokens WHERE ExpiresAt > ?",
+                       (int(datetime.now().timestamp()),))
+        token_service.load_revocations(cursor.fetchall())
+        cursor.close()
+    finally:
+        conn.close()
+
+# Read at startup and again whenever another worker logs a token out
+data_versions.on_change('tokens', load_token_revocations, initial=True)
+
+@app.before_request
+def authenticate_request():
+    """Put the bearer token's claims in g.user; reject requests with a bad token"""
+    g.user = None
+    header = request.headers.get('Authorization', '')
+    if request.method == 'OPTIONS' or not header.startswith('Bearer '):
+        return None
+    try:
+        g.user = token_service.verify(header[len('Bearer '):].strip())
+    except InvalidTokenError as e:
+        return jsonify({
+            'success': False,
+            'message': f'{str(e)}. Please log in again.'
+        }), 401
+    return None
+
+# username/email/phone Bloom filters; a miss answers check-availability
+availability = AvailabilityFilters(
+    Config.get_db_connection,
+    error_rate=Config.BLOOM_ERROR_RATE,
+    min_capacity=Config.BLOOM_MIN_CAPACITY,
+    reload_after=Config.BLOOM_RELOAD_SECONDS
+)
+data_versions.on_change('users', availability.invalidate)
+
+# Per-minute visit/download events and their minute/hour/day rollups
+analytics_events = AnalyticsEventStore()
+
+# HyperLogLog unique-visitor sketches, persisted by the counter flusher
+unique_visitors = UniqueVisitorTracker(
+    global_precision=Config.HLL_GLOBAL_PRECISION,
+    resume_precision=Config.HLL_RESUME_PRECISION,
+    max_sketches=Config.HLL_MAX_SKETCHES
+)
+
+# Visitor/download hits, buffered and flushed to Resumes in the background
+counters = CounterAggregator(
+    Config.get_db_connection,
+    shards=Config.COUNTER_SHARDS,
+    interval=Config.COUNTER_FLUSH_INTERVAL_SECONDS,
+    threshold=Config.COUNTER_FLUSH_THRESHOLD,
+    events=analytics_events,
+    sketches=unique_visitors
+)
+
+# ==================== HELPER FUNCTIONS ====================
 
 def validate_email(email):
     """Validate email format"""
@@ -55,6 +212,217 @@ def validate_password(password):
         return False
     return True
 
+# Unique index on users (migrations/001_users_unique_indexes.sql) -> message
+USER_UNIQUE_INDEXES = {
+    'UX_users_username': 'Username already taken',
+    'UX_users_email': 'Email already registered',
+    'UX_users_phone': 'Phone number already registered',
+}
+
+def duplicate_user_message(error):
+    """Register message for a unique-index violation, or None if it is another error"""
+    text = str(error)
+    for index_name, message in USER_UNIQUE_INDEXES.items():
+        if index_name in text:
+            return message
+    return None
+
+# ==================== JOB QUERY HELPERS ====================
+
+JOB_SELECT_SQL = """
+    SELECT 
+        j.JobID, j.JobTitle, c.CompanyName, j.JobDescription,
+        j.ExperienceRequired, j.Package, jt.JobTypeName, co.CourseName,
+        s.SectorName, cnt.CountryName, st.StateName, ct.CityName,
+        j.CreatedAt, u.username as posted_by
+    FROM Jobs j
+    LEFT JOIN Companies c ON j.CompanyID = c.CompanyID
+    LEFT JOIN JobTypes jt ON j.JobTypeID = jt.JobTypeID
+    LEFT JOIN Courses co ON j.CourseID = co.CourseID
+    LEFT JOIN Sectors s ON j.SectorID = s.SectorID
+    LEFT JOIN Countries cnt ON j.CountryID = cnt.CountryID
+    LEFT JOIN States st ON j.StateID = st.StateID
+    LEFT JOIN Cities ct ON j.CityID = ct.CityID
+    LEFT JOIN users u ON j.PostedByUserID = u.id
+"""
+
+def fetch_job_skills(cursor, job_ids):
+    """
+    Load skill names for many jobs in a single query
+    
+    The IDs travel as one comma-separated parameter and are expanded with
+    STRING_SPLIT, so the round-trip count does not depend on len(job_ids).
+    
+    Returns:
+        dict: JobID -> list of skill names (empty list for jobs without skills)
+    """
+    skills = {job_id: [] for job_id in job_ids}
+    if not skills:
+        return skills
+    
+    cursor.execute("""
+        SELECT js.JobID, jsm.SkillName
+        FROM JobSkills js
+        JOIN JobSkillsMaster jsm ON js.SkillID = jsm.SkillID
+        JOIN STRING_SPLIT(?, ',') ids ON js.JobID = CAST(ids.value AS INT)
+    """, (','.join(str(int(job_id)) for job_id in skills),))
+    
+    for job_id, skill_name in cursor.fetchall():
+        skills[job_id].append(skill_name)
+    return skills
+
+# Query arg -> (Jobs FK column, master table, master key, master name column)
+JOB_FILTERS = {
+    'sector': ('j.SectorID', 'Sectors', 'SectorID', 'SectorName'),
+    'job_type': ('j.JobTypeID', 'JobTypes', 'JobTypeID', 'JobTypeName'),
+    'course': ('j.CourseID', 'Courses', 'CourseID', 'CourseName'),
+    'country': ('j.CountryID', 'Countries', 'CountryID', 'CountryName'),
+    'state': ('j.StateID', 'States', 'StateID', 'StateName'),
+    'city': ('j.CityID', 'Cities', 'CityID', 'CityName'),
+}
+
+# Experience levels offered by job.html with their year ranges (None = open-ended)
+EXPERIENCE_LEVELS = [
+    ('Fresher', 0, 1),
+    ('Junior', 1, 3),
+    ('Mid-Level', 3, 5),
+    ('Senior', 5, 8),
+    ('Lead', 8, None),
+]
+
+def _arg_values(args, name):
+    """Collect ?name=a&name=b and ?name=a,b into one list"""
+    values = []
+    for raw in args.getlist(name):
+        values.extend(v.strip() for v in raw.split(',') if v.strip())
+    return values
+
+def _placeholders(values):
+    return ', '.join('?' for _ in values)
+
+def build_job_filters(args):
+    """
+    Translate /api/jobs query arguments into SQL predicates on Jobs
+    
+    Supported arguments (all optional, repeatable or comma-separated):
+        sector, job_type, course, country, state, city  - master names
+        sector_id, job_type_id, ... city_id              - master IDs
+        experience                                       - level names
+        experience_min, experience_max                   - years
+        skills + skills_match=any|all                    - skill names
+    
+    Name filters become `FK IN (SELECT id FROM Master WHERE Name IN ...)` so
+    they seek on the Jobs FK index instead of filtering the joined rows.
+    
+    Returns:
+        tuple: (list of SQL predicates, list of params)
+    
+    Raises:
+        ValueError: For malformed IDs, years or skills_match
+    """
+    clauses = []
+    params = []
+    
+    for name, (column, table, key, name_column) in JOB_FILTERS.items():
+        ids = _arg_values(args, f'{name}_id')
+        names = _arg_values(args, name)
+        if ids:
+            try:
+                ids = [int(v) for v in ids]
+            except ValueError:
+                raise ValueError(f'{name}_id must be an integer')
+            clauses.append(f"{column} IN ({_placeholders(ids)})")
+            params.extend(ids)
+        if names:
+            clauses.append(f"{column} IN (SELECT {key} FROM {table} "
+                           f"WHERE {name_column} IN ({_placeholders(names)}))")
+            params.extend(names)
+    
+    levels = _arg_values(args, 'experience')
+    if args.get('experience_min') or args.get('experience_max'):
+        try:
+            low = float(args.get('experience_min') or 0)
+            high = float(args['experience_max']) if args.get('experience_max') else None
+        except ValueError:
+            raise ValueError('experience_min and experience_max must be numbers')
+        in_range = [level for level, start, end in EXPERIENCE_LEVELS
+                    if (high is None or start <= high) and (end is None or end >= low)]
+        levels = [level for level in levels if level in in_range] if levels else in_range
+        if not levels:
+            clauses.append("1 = 0")
+    if levels:
+        clauses.append(f"j.ExperienceRequired IN ({_placeholders(levels)})")
+        params.extend(levels)
+    
+    skills = _arg_values(args, 'skills')
+    if skills:
+        match = args.get('skills_match', 'any').lower()
+        if match not in ('any', 'all'):
+            raise ValueError("skills_match must be 'any' or 'all'")
+        skill_join = f"""
+            SELECT js.JobID
+            FROM JobSkills js
+            JOIN JobSkillsMaster jsm ON js.SkillID = jsm.SkillID
+            WHERE jsm.SkillName IN ({_placeholders(skills)})"""
+        params.extend(skills)
+        if match == 'all':
+            distinct = list(dict.fromkeys(s.lower() for s in skills))
+            clauses.append(f"j.JobID IN ({skill_join}"
+                           f" GROUP BY js.JobID HAVING COUNT(DISTINCT jsm.SkillName) = ?)")
+            params.append(len(distinct))
+        else:
+            clauses.append(f"j.JobID IN ({skill_join})")
+    
+    return clauses, params
+
+def job_row_to_dict(row, skills):
+    """Convert a JOB_SELECT_SQL row plus its skill list into the API shape"""
+    return {
+        'id': row[0],
+        'job_title': row[1],
+        'company_name': row[2],
+        'job_description': row[3],
+        'experience_required': row[4],
+        'package': row[5],
+        'job_type': row[6],
+        'education': row[7],
+        'sector': row[8],
+        'country': row[9],
+        'state': row[10],
+        'city': row[11],
+        'created_at': row[12],
+        'posted_by': row[13],
+        'skills_required': skills
+    }
+
+# ==================== STARTUP ====================
+
+def warm_caches():
+    """Build the in-process indexes and caches before serving traffic"""
+    password_hasher.start()
+    try:
+        # Versions first, so writes landing during the loads are noticed later
+        data_versions.sync()
+        conn = Config.get_db_connection()
+        cursor = conn.cursor()
+        job_index.load(cursor)
+        skill_matcher.load(cursor)
+        master_cache.warm(cursor)
+        reference_data.warm(cursor)
+        autocomplete.load(cursor)
+        skill_normalizer.load(cursor)
+        availability.load(cursor)
+        cursor.close()
+        conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Caches not warmed, they will load on first use: {e}")
+
+def shutdown_services():
+    """Flush buffered writes and stop background workers before the process exits"""
+    counters.stop()
+    password_hasher.close()
+    Config.get_pool().close_all()
+
 # ==================== HEALTH CHECK ====================
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -62,14 +430,32 @@ def health_check():
     return jsonify({
         'success': True,
         'message': 'Resume Builder API is running',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'db_pool': Config.pool_stats(),
+        'data_versions': data_versions.stats(),
+        'job_cache': job_cache.stats(),
+        'master_cache': master_cache.stats(),
+        'reference_data': reference_data.stats(),
+        'geo_tree': geo_tree.stats(),
+        'autocomplete': autocomplete.stats(),
+        'skill_normalizer': skill_normalizer.stats(),
+        'skill_matcher': skill_matcher.stats(),
+        'counters': counters.stats(),
+        'unique_visitors': unique_visitors.stats(),
+        'availability_filters': availability.stats(),
+        'tokens': token_service.stats()
     })
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
 @app.route('/api/auth/check-availability', methods=['POST'])
 def check_availability():
-    """Check if username/email/phone is available"""
+    """
+    Check if username/email/phone is available
+    
+    A Bloom filter miss answers "available" without touching the database;
+    only probable matches are confirmed with a lookup.
+    """
     try:
         data = request.get_json()
         field = data.get('field')
@@ -78,9 +464,6 @@ def check_availability():
         if not field or not value:
             return jsonify({'available': False}), 400
         
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
         field_map = {
             'username': 'username',
             'email': 'email',
@@ -90,14 +473,26 @@ def check_availability():
         if field not in field_map:
             return jsonify({'available': False}), 400
         
+        if availability.needs_reload():
+            # Until the rebuild lands the old filters answer (or, before the
+            # first load, every check goes to the database)
+            availability.reload_in_background()
+        
+        if not availability.might_exist(field, value):
+            return jsonify({'available': True})
+        
+        conn = Config.get_db_connection()
+        cursor = conn.cursor()
+        
         db_field = field_map[field]
-        cursor.execute(f"SELECT COUNT(*) FROM users WHERE {db_field} = ?", (value,))
-        count = cursor.fetchone()[0]
+        cursor.execute(f"SELECT TOP 1 1 FROM users WHERE {db_field} = ?", (value,))
+        exists = cursor.fetchone() is not None
+        availability.record_confirmation(field, exists)
         
         cursor.close()
         conn.close()
         
-        return jsonify({'available': count == 0})
+        return jsonify({'available': not exists})
         
     except Exception as e:
         print(f"❌ ERROR in check_availability: {str(e)}")
@@ -156,12 +551,12 @@ def register():
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
+        # Three index seeks in one round trip (no scan of users)
         cursor.execute("""
             SELECT 
-                COUNT(CASE WHEN username = ? THEN 1 END) as username_exists,
-                COUNT(CASE WHEN email = ? THEN 1 END) as email_exists,
-                COUNT(CASE WHEN phone = ? THEN 1 END) as phone_exists
-            FROM users
+                CASE WHEN EXISTS (SELECT 1 FROM users WHERE username = ?) THEN 1 ELSE 0 END,
+                CASE WHEN EXISTS (SELECT 1 FROM users WHERE email = ?) THEN 1 ELSE 0 END,
+                CASE WHEN EXISTS (SELECT 1 FROM users WHERE phone = ?) THEN 1 ELSE 0 END
         """, (username, email, phone))
         
         result = cursor.fetchone()
@@ -190,17 +585,34 @@ def register():
                 'message': 'Phone number already registered'
             }), 400
         
-        hashed_password = hash_password(password)
+        hashed_password = password_hasher.hash(password)
         
-        cursor.execute("""
-            INSERT INTO users (username, first_name, last_name, email, phone, password, type, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, GETDATE())
-        """, (username, first_name, last_name, email, phone, hashed_password, user_type))
+        # A concurrent registration can pass the probes too; the unique
+        # indexes reject the second INSERT
+        try:
+            cursor.execute("""
+                INSERT INTO users (username, first_name, last_name, email, phone, password, type, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, GETDATE())
+            """, (username, first_name, last_name, email, phone, hashed_password, user_type))
+        except pyodbc.IntegrityError as e:
+            message = duplicate_user_message(e)
+            if message is None:
+                raise
+            conn.rollback()
+            cursor.close()
+            conn.close()
+            return jsonify({
+                'success': False,
+                'message': message
+            }), 400
         
         conn.commit()
         cursor.close()
         conn.close()
         
+        availability.add(username=username, email=email, phone=phone)
+        data_versions.bump('users')
+        
         print(f"✓ User registered successfully: {username} as {user_type}")
         
         return jsonify({
@@ -232,19 +644,30 @@ def login():
                 'message': 'Username and password are required'
             }), 400
         
-        hashed_password = hash_password(password)
-        
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT id, username, first_name, last_name, email, phone, type
+            SELECT id, username, first_name, last_name, email, phone, type, password
             FROM users
-            WHERE username = ? AND password = ?
-        """, (username, hashed_password))
+            WHERE username = ?
+        """, (username,))
         
         user = cursor.fetchone()
         
+        if user is None:
+            password_hasher.verify_dummy(password)
+        elif not password_hasher.verify(password, user[7]):
+            user = None
+        elif password_hasher.needs_rehash(user[7]):
+            # Legacy SHA-256 (or an old cost): store a current hash now that
+            # we know the password; the guard skips it if it changed meanwhile
+            cursor.execute(
+                "UPDATE users SET password = ? WHERE id = ? AND password = ?",
+                (password_hasher.hash(password), user[0], user[7])
+            )
+            conn.commit()
+        
         cursor.close()
         conn.close()
         
@@ -259,12 +682,16 @@ def login():
                 'type': user[6]
             }
             
+            token, claims = token_service.issue(user[0], user[1], user[6])
+            
             print(f"✓ User logged in successfully: {username} as {user[6]}")
             
             return jsonify({
                 'success': True,
                 'message': 'Login successful',
-                'user': user_data
+                'user': user_data,
+                'token': token,
+                'expires_at': datetime.fromtimestamp(claims['exp']).isoformat()
             })
         else:
             return jsonify({
@@ -281,877 +708,344 @@ def login():
             'message': 'Login failed. Please try again.'
         }), 500
 
-# ==================== SECTORS CRUD ====================
-
-@app.route('/api/sectors', methods=['GET'])
-def get_sectors():
-    """Get all sectors from database"""
-    try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT SectorID, SectorName, IsActive
-            FROM Sectors 
-            WHERE IsActive = 1
-            ORDER BY SectorName
-        """)
-        
-        sectors = []
-        for row in cursor.fetchall():
-            sectors.append({
-                'SectorID': row[0],
-                'SectorName': row[1],
-                'IsActive': row[2]
-            })
-        
-        cursor.close()
-        conn.close()
-        
+@app.route('/api/auth/logout', methods=['POST'])
+def logout():
+    """Revoke the bearer token sent with the request"""
+    if g.user is None:
         return jsonify({
-            'success': True,
-            'data': sectors
-        })
-        
-    except Exception as e:
-        print(f"❌ ERROR in get_sectors: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/sectors', methods=['POST'])
-def create_sector():
-    """Create new sector"""
-    try:
-        data = request.get_json()
-        
-        if not data.get('SectorName'):
-            return jsonify({'success': False, 'message': 'Sector name is required'}), 400
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO Sectors (SectorName, IsActive, CreatedAt)
-            VALUES (?, 1, GETDATE())
-        """, (data['SectorName'],))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Sector created successfully'}), 201
-        
-    except Exception as e:
-        print(f"❌ ERROR in create_sector: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/sectors/<int:sector_id>', methods=['PUT'])
-def update_sector(sector_id):
-    """Update sector"""
-    try:
-        data = request.get_json()
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Sectors 
-            SET SectorName = ?, UpdatedDate = GETDATE()
-            WHERE SectorID = ?
-        """, (data['SectorName'], sector_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Sector updated successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in update_sector: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/sectors/<int:sector_id>', methods=['DELETE'])
-def delete_sector(sector_id):
-    """Delete sector (soft delete)"""
-    try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Sectors 
-            SET IsActive = 0, UpdatedDate = GETDATE()
-            WHERE SectorID = ?
-        """, (sector_id,))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Sector deleted successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in delete_sector: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-# ==================== COUNTRIES CRUD ====================
-
-@app.route('/api/countries', methods=['GET'])
-def get_countries():
-    """Get all countries"""
-    try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT CountryID, CountryName, CountryCode, IsActive
-            FROM Countries 
-            WHERE IsActive = 1
-            ORDER BY CountryName
-        """)
-        
-        countries = []
-        for row in cursor.fetchall():
-            countries.append({
-                'CountryID': row[0],
-                'CountryName': row[1],
-                'CountryCode': row[2],
-                'IsActive': row[3]
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'data': countries})
-        
-    except Exception as e:
-        print(f"❌ ERROR in get_countries: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/countries', methods=['POST'])
-def create_country():
-    """Create new country"""
-    try:
-        data = request.get_json()
-        
-        if not data.get('CountryName'):
-            return jsonify({'success': False, 'message': 'Country name is required'}), 400
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO Countries (CountryName, CountryCode, IsActive, CreatedAt)
-            VALUES (?, ?, 1, GETDATE())
-        """, (data['CountryName'], data.get('CountryCode', '')))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Country created successfully'}), 201
-        
-    except Exception as e:
-        print(f"❌ ERROR in create_country: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/countries/<int:country_id>', methods=['PUT'])
-def update_country(country_id):
-    """Update country"""
-    try:
-        data = request.get_json()
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Countries 
-            SET CountryName = ?, CountryCode = ?, UpdatedDate = GETDATE()
-            WHERE CountryID = ?
-        """, (data['CountryName'], data.get('CountryCode', ''), country_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Country updated successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in update_country: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/countries/<int:country_id>', methods=['DELETE'])
-def delete_country(country_id):
-    """Delete country (soft delete)"""
-    try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Countries 
-            SET IsActive = 0, UpdatedDate = GETDATE()
-            WHERE CountryID = ?
-        """, (country_id,))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Country deleted successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in delete_country: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-# ==================== STATES CRUD ====================
-
-@app.route('/api/states', methods=['GET'])
-def get_states():
-    """Get all states or filter by country"""
-    try:
-        country_id = request.args.get('country_id')
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        if country_id:
-            cursor.execute("""
-                SELECT s.StateID, s.StateName, s.StateCode, s.CountryID, c.CountryName, s.IsActive
-                FROM States s
-                JOIN Countries c ON s.CountryID = c.CountryID
-                WHERE s.IsActive = 1 AND s.CountryID = ?
-                ORDER BY s.StateName
-            """, (country_id,))
-        else:
-            cursor.execute("""
-                SELECT s.StateID, s.StateName, s.StateCode, s.CountryID, c.CountryName, s.IsActive
-                FROM States s
-                JOIN Countries c ON s.CountryID = c.CountryID
-                WHERE s.IsActive = 1
-                ORDER BY c.CountryName, s.StateName
-            """)
-        
-        states = []
-        for row in cursor.fetchall():
-            states.append({
-                'StateID': row[0],
-                'StateName': row[1],
-                'StateCode': row[2],
-                'CountryID': row[3],
-                'CountryName': row[4],
-                'IsActive': row[5]
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'data': states})
-        
-    except Exception as e:
-        print(f"❌ ERROR in get_states: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/states', methods=['POST'])
-def create_state():
-    """Create new state"""
-    try:
-        data = request.get_json()
-        
-        if not data.get('StateName') or not data.get('CountryID'):
-            return jsonify({'success': False, 'message': 'State name and country are required'}), 400
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO States (CountryID, StateName, StateCode, IsActive, CreatedAt)
-            VALUES (?, ?, ?, 1, GETDATE())
-        """, (data['CountryID'], data['StateName'], data.get('StateCode', '')))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'State created successfully'}), 201
-        
-    except Exception as e:
-        print(f"❌ ERROR in create_state: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/states/<int:state_id>', methods=['PUT'])
-def update_state(state_id):
-    """Update state"""
-    try:
-        data = request.get_json()
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE States 
-            SET CountryID = ?, StateName = ?, StateCode = ?, UpdatedDate = GETDATE()
-            WHERE StateID = ?
-        """, (data['CountryID'], data['StateName'], data.get('StateCode', ''), state_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'State updated successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in update_state: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/states/<int:state_id>', methods=['DELETE'])
-def delete_state(state_id):
-    """Delete state (soft delete)"""
-    try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE States 
-            SET IsActive = 0, UpdatedDate = GETDATE()
-            WHERE StateID = ?
-        """, (state_id,))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'State deleted successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in delete_state: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-# ==================== CITIES CRUD ====================
-
-@app.route('/api/cities', methods=['GET'])
-def get_cities():
-    """Get all cities or filter by state"""
-    try:
-        state_id = request.args.get('state_id')
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        if state_id:
-            cursor.execute("""
-                SELECT c.CityID, c.CityName, c.StateID, s.StateName, co.CountryID, co.CountryName, c.IsActive
-                FROM Cities c
-                JOIN States s ON c.StateID = s.StateID
-                JOIN Countries co ON s.CountryID = co.CountryID
-                WHERE c.IsActive = 1 AND c.StateID = ?
-                ORDER BY c.CityName
-            """, (state_id,))
-        else:
-            cursor.execute("""
-                SELECT c.CityID, c.CityName, c.StateID, s.StateName, co.CountryID, co.CountryName, c.IsActive
-                FROM Cities c
-                JOIN States s ON c.StateID = s.StateID
-                JOIN Countries co ON s.CountryID = co.CountryID
-                WHERE c.IsActive = 1
-                ORDER BY co.CountryName, s.StateName, c.CityName
-            """)
-        
-        cities = []
-        for row in cursor.fetchall():
-            cities.append({
-                'CityID': row[0],
-                'CityName': row[1],
-                'StateID': row[2],
-                'StateName': row[3],
-                'CountryID': row[4],
-                'CountryName': row[5],
-                'IsActive': row[6]
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'data': cities})
-        
-    except Exception as e:
-        print(f"❌ ERROR in get_cities: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/cities', methods=['POST'])
-def create_city():
-    """Create new city"""
-    try:
-        data = request.get_json()
-        
-        if not data.get('CityName') or not data.get('StateID'):
-            return jsonify({'success': False, 'message': 'City name and state are required'}), 400
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO Cities (StateID, CityName, IsActive, CreatedAt)
-            VALUES (?, ?, 1, GETDATE())
-        """, (data['StateID'], data['CityName']))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'City created successfully'}), 201
-        
-    except Exception as e:
-        print(f"❌ ERROR in create_city: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/cities/<int:city_id>', methods=['PUT'])
-def update_city(city_id):
-    """Update city"""
-    try:
-        data = request.get_json()
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Cities 
-            SET StateID = ?, CityName = ?, UpdatedDate = GETDATE()
-            WHERE CityID = ?
-        """, (data['StateID'], data['CityName'], city_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'City updated successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in update_city: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/cities/<int:city_id>', methods=['DELETE'])
-def delete_city(city_id):
-    """Delete city (soft delete)"""
+            'success': False,
+            'message': 'Not logged in'
+        }), 401
     try:
+        # Stored for the other workers, which load it on their next request;
+        # expired revocations are pruned on the way
         conn = Config.get_db_connection()
         cursor = conn.cursor()
-        
+        cursor.execute("DELETE FROM RevokedTokens WHERE ExpiresAt <= ?",
+                       (int(datetime.now().timestamp()),))
         cursor.execute("""
-            UPDATE Cities 
-            SET IsActive = 0, UpdatedDate = GETDATE()
-            WHERE CityID = ?
-        """, (city_id,))
-        
+            INSERT INTO RevokedTokens (Jti, ExpiresAt)
+            SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM RevokedTokens WHERE Jti = ?)
+        """, (g.user['jti'], g.user['exp'], g.user['jti']))
         conn.commit()
         cursor.close()
         conn.close()
-        
-        return jsonify({'success': True, 'message': 'City deleted successfully'})
-        
     except Exception as e:
-        print(f"❌ ERROR in delete_city: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
+        # The token stays valid everywhere, so the client can simply retry
+        print(f"❌ ERROR in logout: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Logout failed. Please try again.'
+        }), 500
+    token_service.revoke(g.user)
+    data_versions.bump('tokens')
+    print(f"✓ User logged out: {g.user['username']}")
+    return jsonify({
+        'success': True,
+        'message': 'Logged out'
+    })
 
-# ==================== COURSES CRUD ====================
+# ==================== MASTER DATA CRUD ====================
 
-@app.route('/api/courses', methods=['GET'])
-def get_courses():
-    """Get all courses"""
-    try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT CourseID, CourseName, CourseType, Description, IsActive
-            FROM Courses 
-            WHERE IsActive = 1
-            ORDER BY CourseName
-        """)
-        
-        courses = []
-        for row in cursor.fetchall():
-            courses.append({
-                'CourseID': row[0],
-                'CourseName': row[1],
-                'CourseType': row[2],
-                'Description': row[3],
-                'IsActive': row[4]
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'data': courses})
-        
-    except Exception as e:
-        print(f"❌ ERROR in get_courses: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
+def reference_changed(kind, action, data):
+    """Keep the other caches in step with a master-table write"""
+    master_cache.invalidate(kind)
+    if action == 'update':
+        job_cache.bump_version()  # job listings show master names
+    if action == 'create':
+        autocomplete.add(kind, data.get(MASTER_TABLES[kind][2]))
+    else:
+        autocomplete.invalidate(kind)
 
-@app.route('/api/courses', methods=['POST'])
-def create_course():
-    """Create new course"""
-    try:
-        data = request.get_json()
-        
-        if not data.get('CourseName'):
-            return jsonify({'success': False, 'message': 'Course name is required'}), 400
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO Courses (CourseName, CourseType, Description, IsActive, CreatedAt)
-            VALUES (?, ?, ?, 1, GETDATE())
-        """, (data['CourseName'], data.get('CourseType', ''), data.get('Description', '')))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Course created successfully'}), 201
-        
-    except Exception as e:
-        print(f"❌ ERROR in create_course: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
+# Sectors, countries, states, cities, courses, skills, companies and job types
+register_reference_routes(app, reference_data, reference_changed)
 
-@app.route('/api/courses/<int:course_id>', methods=['PUT'])
-def update_course(course_id):
-    """Update course"""
-    try:
-        data = request.get_json()
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Courses 
-            SET CourseName = ?, CourseType = ?, Description = ?, UpdatedDate = GETDATE()
-            WHERE CourseID = ?
-        """, (data['CourseName'], data.get('CourseType', ''), data.get('Description', ''), course_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Course updated successfully'})
-        
-    except Exception as e:
-        print(f"❌ ERROR in update_course: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
-
-@app.route('/api/courses/<int:course_id>', methods=['DELETE'])
-def delete_course(course_id):
-    """Delete course (soft delete)"""
+@app.route('/api/geo/tree', methods=['GET'])
+def get_geo_tree():
+    """
+    Country -> State -> City hierarchy in one response
+    
+    ?country_id= or ?state_id= returns that subtree; ?depth=country|state
+    stops below that level. Send If-None-Match to get a 304 when unchanged.
+    """
     try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE Courses 
-            SET IsActive = 0, UpdatedDate = GETDATE()
-            WHERE CourseID = ?
-        """, (course_id,))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Course deleted successfully'})
-        
+        return geo_tree.serve()
     except Exception as e:
-        print(f"❌ ERROR in delete_course: {str(e)}")
+        print(f"❌ ERROR in get_geo_tree: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
-# ==================== JOB SKILLS MASTER CRUD ====================
-
-@app.route('/api/job-skills-master', methods=['GET'])
-def get_job_skills_master():
-    """Get all skills from JobSkillsMaster"""
+def bulk_upsert_master(levels, label):
+    """Run a MasterBulkUpserter over the request body and refresh the caches it touched"""
+    fmt = detect_format(request.content_type, request.args.get('format'))
+    if fmt not in ('jsonl', 'csv'):
+        return jsonify({'success': False, 'message': 'Format must be jsonl or csv'}), 400
+    
+    conn = Config.get_db_connection()
     try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT SkillID, SkillName, Category, IsActive
-            FROM JobSkillsMaster 
-            WHERE IsActive = 1
-            ORDER BY SkillName
-        """)
-        
-        skills = []
-        for row in cursor.fetchall():
-            skills.append({
-                'SkillID': row[0],
-                'SkillName': row[1],
-                'Category': row[2],
-                'IsActive': row[3]
-            })
-        
-        cursor.close()
+        upserter = MasterBulkUpserter(conn, levels, chunk_size=Config.MASTER_BULK_CHUNK_SIZE)
+        summary = upserter.run(iter_records(request.stream, fmt))
+    finally:
         conn.close()
-        
-        return jsonify({'success': True, 'data': skills})
-        
-    except Exception as e:
-        print(f"❌ ERROR in get_job_skills_master: {str(e)}")
-        return jsonify({'success': False, 'message': str(e)}), 500
+    
+    changed = upserter.changed_kinds()
+    reference_data.invalidate(*changed)
+    for kind in changed:
+        reference_changed(kind, 'update', None)
+    
+    totals = {action: sum(c[action] for c in summary['counts'].values())
+              for action in ('inserted', 'updated', 'unchanged')}
+    print(f"✓ Bulk {label} upsert: {summary['rows']} rows, {totals['inserted']} inserted, "
+          f"{totals['updated']} updated, {summary['failed']} failed")
+    
+    ok = summary['failed'] < summary['rows']
+    return jsonify({'success': ok, **summary}), 200 if ok else 400
 
-@app.route('/api/job-skills-master', methods=['POST'])
-def create_job_skill_master():
-    """Create new skill in JobSkillsMaster"""
+@app.route('/api/geo/bulk', methods=['POST'])
+def bulk_upsert_geography():
+    """
+    Insert or update countries, states and cities from a JSONL or CSV upload
+    
+    Each row has country and optionally country_code, state, state_code and
+    city; missing parents are created. Returns inserted/updated/unchanged
+    counts per table and the first 100 row errors.
+    """
     try:
-        data = request.get_json()
-        
-        if not data.get('SkillName'):
-            return jsonify({'success': False, 'message': 'Skill name is required'}), 400
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO JobSkillsMaster (SkillName, Category, IsActive, CreatedAt)
-            VALUES (?, ?, 1, GETDATE())
-        """, (data['SkillName'], data.get('Category', '')))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Skill created successfully'}), 201
-        
+        return bulk_upsert_master(GEO_LEVELS, 'geography')
     except Exception as e:
-        print(f"❌ ERROR in create_job_skill_master: {str(e)}")
+        print(f"❌ ERROR in bulk_upsert_geography: {str(e)}")
+        import traceback
+        traceback.print_exc()
         return jsonify({'success': False, 'message': str(e)}), 500
 
-@app.route('/api/job-skills-master/<int:skill_id>', methods=['PUT'])
-def update_job_skill_master(skill_id):
-    """Update skill in JobSkillsMaster"""
+@app.route('/api/courses/bulk', methods=['POST'])
+def bulk_upsert_courses():
+    """Insert or update courses (course, course_type, description) from a JSONL or CSV upload"""
     try:
-        data = request.get_json()
-        
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE JobSkillsMaster 
-            SET SkillName = ?, Category = ?
-            WHERE SkillID = ?
-        """, (data['SkillName'], data.get('Category', ''), skill_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'message': 'Skill updated successfully'})
-        
+        return bulk_upsert_master(COURSE_LEVELS, 'course')
     except Exception as e:
-        print(f"❌ ERROR in update_job_skill_master: {str(e)}")
+        print(f"❌ ERROR in bulk_upsert_courses: {str(e)}")
+        import traceback
+        traceback.print_exc()
         return jsonify({'success': False, 'message': str(e)}), 500
 
-@app.route('/api/job-skills-master/<int:skill_id>', methods=['DELETE'])
-def delete_job_skill_master(skill_id):
-    """Delete skill from JobSkillsMaster (soft delete)"""
+@app.route('/api/job-skills-master/merge-duplicates', methods=['POST'])
+def merge_duplicate_job_skills():
+    """
+    Consolidate duplicate skills
+    
+    Returns the merge plan: 'groups' of skills whose names differ only in
+    case, spacing or separators, and 'suggestions' of near-duplicates
+    (possible typos) for a person to review. With ?apply=1 (admins only) the
+    groups are carried out: JobSkills links move to the surviving skill and
+    the duplicates are deactivated. Suggestions are never applied.
+    """
     try:
+        apply = request.args.get('apply', '').lower() in ('1', 'true', 'yes')
+        if apply and (g.user is None or g.user.get('type') != 'admin'):
+            return jsonify({'success': False, 'message': 'Admin login required to apply merges'}), 403
+        
         conn = Config.get_db_connection()
         cursor = conn.cursor()
+        skill_normalizer.load(cursor)
+        groups = skill_normalizer.plan_merges()
+        suggestions = skill_normalizer.plan_suggestions()
+        
+        result = None
+        if apply and groups:
+            result = merge_duplicate_skills(conn, groups)
+            # Job skill lists changed under every index that holds them
+            skill_normalizer.load(cursor)
+            skill_matcher.load(cursor)
+            job_index.load(cursor)
+            master_cache.invalidate('skills')
+            reference_data.invalidate('skills')
+            autocomplete.invalidate('skills')
+            job_cache.bump_version()
+            print(f"✓ Merged {result['skills_merged']} duplicate skills into {len(groups)}")
         
-        cursor.execute("""
-            UPDATE JobSkillsMaster 
-            SET IsActive = 0
-            WHERE SkillID = ?
-        """, (skill_id,))
-        
-        conn.commit()
         cursor.close()
         conn.close()
         
-        return jsonify({'success': True, 'message': 'Skill deleted successfully'})
-        
+        return jsonify({
+            'success': True,
+            'applied': result is not None,
+            'result': result,
+            'groups': [{
+                'survivor': {'SkillID': group['survivor'][0], 'SkillName': group['survivor'][1]},
+                'duplicates': [{'SkillID': skill_id, 'SkillName': name}
+                               for skill_id, name in group['duplicates']]
+            } for group in groups],
+            'suggestions': [{
+                'skill': {'SkillID': item['skill'][0], 'SkillName': item['skill'][1]},
+                'similar_to': {'SkillID': item['similar_to'][0], 'SkillName': item['similar_to'][1]},
+                'distance': item['distance']
+            } for item in suggestions]
+        })
     except Exception as e:
-        print(f"❌ ERROR in delete_job_skill_master: {str(e)}")
+        print(f"❌ ERROR in merge_duplicate_job_skills: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
-# ==================== COMPANIES CRUD ====================
-
-@app.route('/api/companies', methods=['GET'])
-def get_companies():
-    """Get all companies"""
+@app.route('/api/autocomplete/<kind>', methods=['GET'])
+def get_autocomplete(kind):
+    """
+    Most-used names starting with ?prefix= (case-insensitive)
+    
+    kind is skills, companies, courses or cities; ?limit= caps the results.
+    """
     try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT CompanyID, CompanyName, CreatedAt
-            FROM Companies 
-            ORDER BY CompanyName
-        """)
-        
-        companies = []
-        for row in cursor.fetchall():
-            companies.append({
-                'CompanyID': row[0],
-                'CompanyName': row[1],
-                'CreatedAt': str(row[2]) if row[2] else None
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({'success': True, 'data': companies})
-        
+        if kind not in AUTOCOMPLETE_SOURCES:
+            return jsonify({
+                'success': False,
+                'message': f"kind must be one of: {', '.join(AUTOCOMPLETE_SOURCES)}"
+            }), 404
+        try:
+            limit = int(request.args.get('limit', Config.AUTOCOMPLETE_LIMIT_DEFAULT))
+        except ValueError:
+            return jsonify({'success': False, 'message': 'limit must be an integer'}), 400
+        limit = max(1, min(limit, Config.AUTOCOMPLETE_LIMIT_MAX))
+        
+        matches = autocomplete.complete(kind, request.args.get('prefix', ''), limit)
+        return jsonify({
+            'success': True,
+            'data': [{'name': name, 'frequency': frequency} for name, frequency in matches]
+        })
     except Exception as e:
-        print(f"❌ ERROR in get_companies: {str(e)}")
+        print(f"❌ ERROR in get_autocomplete: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
-@app.route('/api/companies', methods=['POST'])
-def create_company():
-    """Create new company"""
+# ==================== JOB POSTINGS MANAGEMENT (USING Jobs TABLE) ====================
+
+@app.route('/api/jobs', methods=['GET'])
+@cached_response(job_cache)
+def get_all_jobs():
+    """Get a page of job postings, filtered in SQL (see build_job_filters)"""
     try:
-        data = request.get_json()
-        
-        if not data.get('CompanyName'):
-            return jsonify({'success': False, 'message': 'Company name is required'}), 400
+        page_size = parse_page_size(request.args.get('limit'))
+        clauses, params = build_job_filters(request.args)
+        if request.args.get('cursor'):
+            clause, cursor_params = keyset_clause('j.CreatedAt', 'j.JobID',
+                                                  decode_cursor(request.args['cursor']))
+            clauses.append(clause)
+            params.extend(cursor_params)
+        where = " AND ".join(["WHERE j.IsActive = 1"] + clauses)
         
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            INSERT INTO Companies (CompanyName, CreatedAt)
-            VALUES (?, GETDATE())
-        """, (data['CompanyName'],))
+        # Fetch one extra row to learn whether another page exists
+        cursor.execute(JOB_SELECT_SQL + where + order_and_limit('j.CreatedAt', 'j.JobID'),
+                       (*params, page_size + 1))
+        rows, next_cursor = split_page(cursor.fetchall(), page_size, 12, 0)
+        
+        # One query for every job's skills instead of one per job
+        skills_by_job = fetch_job_skills(cursor, [row[0] for row in rows])
+        jobs = [job_row_to_dict(row, skills_by_job[row[0]]) for row in rows]
         
-        conn.commit()
         cursor.close()
         conn.close()
+        return jsonify({'success': True, 'jobs': jobs, 'count': len(jobs),
+                        'next_cursor': next_cursor})
         
-        return jsonify({'success': True, 'message': 'Company created successfully'}), 201
-        
+    except ValueError as e:
+        # Bad filter argument or InvalidCursorError
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        print(f"❌ ERROR in create_company: {str(e)}")
+        print(f"❌ ERROR in get_all_jobs: {str(e)}")
+        import traceback; traceback.print_exc()
         return jsonify({'success': False, 'message': str(e)}), 500
 
-# ==================== JOB TYPES CRUD ====================
-
-@app.route('/api/job-types', methods=['GET'])
-def get_job_types():
-    """Get all job types"""
+@app.route('/api/jobs/stats', methods=['GET'])
+@cached_response(job_cache)
+def get_job_stats():
+    """Totals for the jobs dashboard, with the same filters as GET /api/jobs"""
     try:
+        clauses, params = build_job_filters(request.args)
+        where = " AND ".join(["WHERE j.IsActive = 1"] + clauses)
+        
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT JobTypeID, JobTypeName, IsActive
-            FROM JobTypes 
-            WHERE IsActive = 1
-            ORDER BY JobTypeName
-        """)
-        
-        job_types = []
-        for row in cursor.fetchall():
-            job_types.append({
-                'JobTypeID': row[0],
-                'JobTypeName': row[1],
-                'IsActive': row[2]
-            })
+        # One grouped scan instead of counting the pages a client has loaded
+        cursor.execute(f"""
+            SELECT jt.JobTypeName, j.ExperienceRequired, COUNT(*),
+                   SUM(CASE WHEN j.CreatedAt >= DATEADD(day, -7, GETDATE()) THEN 1 ELSE 0 END)
+            FROM Jobs j
+            LEFT JOIN JobTypes jt ON j.JobTypeID = jt.JobTypeID
+            {where}
+            GROUP BY jt.JobTypeName, j.ExperienceRequired
+        """, params)
+        
+        stats = {'total': 0, 'this_week': 0, 'by_type': {}, 'by_experience': {}}
+        for job_type, experience, count, this_week in cursor.fetchall():
+            stats['total'] += count
+            stats['this_week'] += this_week or 0
+            if job_type:
+                stats['by_type'][job_type] = stats['by_type'].get(job_type, 0) + count
+            if experience:
+                stats['by_experience'][experience] = stats['by_experience'].get(experience, 0) + count
         
         cursor.close()
         conn.close()
+        return jsonify({'success': True, 'data': stats})
         
-        return jsonify({'success': True, 'data': job_types})
-        
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        print(f"❌ ERROR in get_job_types: {str(e)}")
+        print(f"❌ ERROR in get_job_stats: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
-# ==================== JOB POSTINGS MANAGEMENT (USING Jobs TABLE) ====================
-
-@app.route('/api/jobs', methods=['GET'])
-def get_all_jobs():
-    """Get all job postings from Jobs table"""
+@app.route('/api/jobs/search', methods=['GET'])
+@cached_response(job_cache)
+def search_jobs():
+    """Keyword search over title, description, company and skills (?q=&limit=)"""
     try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'message': 'Search query (q) is required'}), 400
+        limit = parse_page_size(request.args.get('limit'))
+        
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT 
-                j.JobID, j.JobTitle, c.CompanyName, j.JobDescription,
-                j.ExperienceRequired, j.Package, jt.JobTypeName, co.CourseName,
-                s.SectorName, cnt.CountryName, st.StateName, ct.CityName,
-                j.CreatedAt, u.username as posted_by
-            FROM Jobs j
-            LEFT JOIN Companies c ON j.CompanyID = c.CompanyID
-            LEFT JOIN JobTypes jt ON j.JobTypeID = jt.JobTypeID
-            LEFT JOIN Courses co ON j.CourseID = co.CourseID
-            LEFT JOIN Sectors s ON j.SectorID = s.SectorID
-            LEFT JOIN Countries cnt ON j.CountryID = cnt.CountryID
-            LEFT JOIN States st ON j.StateID = st.StateID
-            LEFT JOIN Cities ct ON j.CityID = ct.CityID
-            LEFT JOIN users u ON j.PostedByUserID = u.id
-            WHERE j.IsActive = 1
-            ORDER BY j.CreatedAt DESC
-        """)
+        if not job_index.loaded:
+            job_index.load(cursor)
+        elif job_index.needs_reload():
+            job_index.reload_in_background()  # this search still uses the current index
+        hits = job_index.search(query, limit)
         
         jobs = []
-        for row in cursor.fetchall():
-            job_id = row[0]
-            
-            # Get skills for this job from JobSkills table
-            cursor.execute("""
-                SELECT jsm.SkillName
-                FROM JobSkills js
-                JOIN JobSkillsMaster jsm ON js.SkillID = jsm.SkillID
-                WHERE js.JobID = ?
-            """, (job_id,))
-            
-            skills = [s[0] for s in cursor.fetchall()]
+        if hits:
+            cursor.execute(JOB_SELECT_SQL + """
+                JOIN STRING_SPLIT(?, ',') ids ON j.JobID = CAST(ids.value AS INT)
+                WHERE j.IsActive = 1
+            """, (','.join(str(job_id) for job_id, _ in hits),))
+            rows = {row[0]: row for row in cursor.fetchall()}
+            skills_by_job = fetch_job_skills(cursor, list(rows))
             
-            jobs.append({
-                'id': job_id,
-                'job_title': row[1],
-                'company_name': row[2],
-                'job_description': row[3],
-                'experience_required': row[4],
-                'package': row[5],
-                'job_type': row[6],
-                'education': row[7],
-                'sector': row[8],
-                'country': row[9],
-                'state': row[10],
-                'city': row[11],
-                'created_at': str(row[12]) if row[12] else None,
-                'posted_by': row[13],
-                'skills_required': skills
-            })
+            # Keep the index's ranking order
+            for job_id, score in hits:
+                if job_id in rows:
+                    job = job_row_to_dict(rows[job_id], skills_by_job[job_id])
+                    job['score'] = round(score, 4)
+                    jobs.append(job)
         
         cursor.close()
         conn.close()
         return jsonify({'success': True, 'jobs': jobs, 'count': len(jobs)})
         
     except Exception as e:
-        print(f"❌ ERROR in get_all_jobs: {str(e)}")
-        import traceback; traceback.print_exc()
+        print(f"❌ ERROR in search_jobs: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
+@cached_response(job_cache)
 def get_job_by_id(job_id):
     """Get single job posting by ID from Jobs table"""
     try:
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT 
-                j.JobID, j.JobTitle, c.CompanyName, j.JobDescription,
-                j.ExperienceRequired, j.Package, jt.JobTypeName, co.CourseName,
-                s.SectorName, cnt.CountryName, st.StateName, ct.CityName,
-                j.CreatedAt, u.username as posted_by
-            FROM Jobs j
-            LEFT JOIN Companies c ON j.CompanyID = c.CompanyID
-            LEFT JOIN JobTypes jt ON j.JobTypeID = jt.JobTypeID
-            LEFT JOIN Courses co ON j.CourseID = co.CourseID
-            LEFT JOIN Sectors s ON j.SectorID = s.SectorID
-            LEFT JOIN Countries cnt ON j.CountryID = cnt.CountryID
-            LEFT JOIN States st ON j.StateID = st.StateID
-            LEFT JOIN Cities ct ON j.CityID = ct.CityID
-            LEFT JOIN users u ON j.PostedByUserID = u.id
+        cursor.execute(JOB_SELECT_SQL + """
             WHERE j.JobID = ? AND j.IsActive = 1
         """, (job_id,))
         
@@ -1159,33 +1053,8 @@ def get_job_by_id(job_id):
         if not row:
             return jsonify({'success': False, 'message': 'Job not found'}), 404
         
-        # Get skills for this job
-        cursor.execute("""
-            SELECT jsm.SkillName
-            FROM JobSkills js
-            JOIN JobSkillsMaster jsm ON js.SkillID = jsm.SkillID
-            WHERE js.JobID = ?
-        """, (job_id,))
-        
-        skills = [s[0] for s in cursor.fetchall()]
-        
-        job = {
-            'id': row[0],
-            'job_title': row[1],
-            'company_name': row[2],
-            'job_description': row[3],
-            'experience_required': row[4],
-            'package': row[5],
-            'job_type': row[6],
-            'education': row[7],
-            'sector': row[8],
-            'country': row[9],
-            'state': row[10],
-            'city': row[11],
-            'created_at': str(row[12]) if row[12] else None,
-            'posted_by': row[13],
-            'skills_required': skills
-        }
+        skills = fetch_job_skills(cursor, [row[0]])[row[0]]
+        job = job_row_to_dict(row, skills)
         
         cursor.close()
         conn.close()
@@ -1195,107 +1064,87 @@ def get_job_by_id(job_id):
         print(f"❌ ERROR in get_job_by_id: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/jobs/<int:job_id>/matches', methods=['GET'])
+def get_job_matches(job_id):
+    """Resumes ranked by how many of the job's skills they have (?limit=)"""
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+        
+        conn = Config.get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT JobID FROM Jobs WHERE JobID = ? AND IsActive = 1", (job_id,))
+        if not cursor.fetchone():
+            cursor.close()
+            conn.close()
+            return jsonify({'success': False, 'message': 'Job not found'}), 404
+        
+        if not skill_matcher.loaded:
+            skill_matcher.load(cursor)
+        elif skill_matcher.needs_reload():
+            skill_matcher.reload_in_background()
+        skills = fetch_job_skills(cursor, [job_id])[job_id]
+        hits = skill_matcher.match_resumes(skills, limit)
+        
+        matches = []
+        if hits:
+            cursor.execute("""
+                SELECT r.ResumeID, r.ResumeTitle, r.Status, p.FullName
+                FROM Resumes r
+                JOIN STRING_SPLIT(?, ',') ids ON r.ResumeID = CAST(ids.value AS INT)
+                LEFT JOIN PersonalInformation p ON r.ResumeID = p.ResumeID
+            """, (','.join(str(resume_id) for resume_id, _, _ in hits),))
+            rows = {row[0]: row for row in cursor.fetchall()}
+            for resume_id, score, matched in hits:
+                if resume_id in rows:
+                    row = rows[resume_id]
+                    matches.append({
+                        'resume_id': row[0],
+                        'resume_title': row[1],
+                        'status': row[2],
+                        'full_name': row[3],
+                        'score': round(score, 4),
+                        'matched_skills': matched
+                    })
+        
+        cursor.close()
+        conn.close()
+        return jsonify({'success': True, 'job_id': job_id, 'skills_required': skills,
+                        'matches': matches, 'count': len(matches)})
+        
+    except Exception as e:
+        print(f"❌ ERROR in get_job_matches: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/jobs', methods=['POST'])
 def create_job():
-    """Create a new job posting in Jobs table"""
+    """Create a new job posting in Jobs table (requires a login token)"""
     try:
+        if g.user is None:
+            return jsonify({'success': False, 'message': 'Login required to post jobs'}), 401
+        
         data = request.get_json()
         
-        # TODO: Get user ID from session/token - using default for now
-        user_id = data.get('user_id', 1)
+        # The poster is always the logged-in user
+        user_id = g.user['sub']
         
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
-        # Get or create company
-        cursor.execute("SELECT CompanyID FROM Companies WHERE CompanyName = ?", (data['company_name'],))
-        company = cursor.fetchone()
-        
-        if company:
-            company_id = company[0]
-        else:
-            cursor.execute("INSERT INTO Companies (CompanyName, CreatedAt) VALUES (?, GETDATE())", (data['company_name'],))
-            conn.commit()
-            cursor.execute("SELECT @@IDENTITY")
-            company_id = cursor.fetchone()[0]
-        
-        # Get or create sector
-        sector_id = None
-        if data.get('sector'):
-            cursor.execute("SELECT SectorID FROM Sectors WHERE SectorName = ?", (data['sector'],))
-            sector = cursor.fetchone()
-            if not sector:
-                cursor.execute("INSERT INTO Sectors (SectorName, IsActive, CreatedAt) VALUES (?, 1, GETDATE())", (data['sector'],))
-                conn.commit()
-                cursor.execute("SELECT @@IDENTITY")
-                sector_id = cursor.fetchone()[0]
-            else:
-                sector_id = sector[0]
-        
-        # Get or create course
-        course_id = None
-        if data.get('course'):
-            cursor.execute("SELECT CourseID FROM Courses WHERE CourseName = ?", (data['course'],))
-            course = cursor.fetchone()
-            if not course:
-                cursor.execute("INSERT INTO Courses (CourseName, IsActive, CreatedAt) VALUES (?, 1, GETDATE())", (data['course'],))
-                conn.commit()
-                cursor.execute("SELECT @@IDENTITY")
-                course_id = cursor.fetchone()[0]
-            else:
-                course_id = course[0]
-        
-        # Get or create country
-        country_id = None
-        if data.get('country'):
-            cursor.execute("SELECT CountryID FROM Countries WHERE CountryName = ?", (data['country'],))
-            country = cursor.fetchone()
-            if not country:
-                cursor.execute("INSERT INTO Countries (CountryName, IsActive, CreatedAt) VALUES (?, 1, GETDATE())", (data['country'],))
-                conn.commit()
-                cursor.execute("SELECT @@IDENTITY")
-                country_id = cursor.fetchone()[0]
-            else:
-                country_id = country[0]
-        
-        # Get or create state
-        state_id = None
-        if data.get('state') and country_id:
-            cursor.execute("SELECT StateID FROM States WHERE StateName = ? AND CountryID = ?", (data['state'], country_id))
-            state = cursor.fetchone()
-            if not state:
-                cursor.execute("INSERT INTO States (StateName, CountryID, IsActive, CreatedAt) VALUES (?, ?, 1, GETDATE())", (data['state'], country_id))
-                conn.commit()
-                cursor.execute("SELECT @@IDENTITY")
-                state_id = cursor.fetchone()[0]
-            else:
-                state_id = state[0]
-        
-        # Get or create city
-        city_id = None
-        if data.get('city') and state_id:
-            cursor.execute("SELECT CityID FROM Cities WHERE CityName = ? AND StateID = ?", (data['city'], state_id))
-            city = cursor.fetchone()
-            if not city:
-                cursor.execute("INSERT INTO Cities (CityName, StateID, IsActive, CreatedAt) VALUES (?, ?, 1, GETDATE())", (data['city'], state_id))
-                conn.commit()
-                cursor.execute("SELECT @@IDENTITY")
-                city_id = cursor.fetchone()[0]
-            else:
-                city_id = city[0]
-        
-        # Get or create job type
-        job_type_id = None
-        if data.get('job_type'):
-            cursor.execute("SELECT JobTypeID FROM JobTypes WHERE JobTypeName = ?", (data['job_type'],))
-            job_type = cursor.fetchone()
-            if not job_type:
-                cursor.execute("INSERT INTO JobTypes (JobTypeName, IsActive, CreatedAt) VALUES (?, 1, GETDATE())", (data['job_type'],))
-                conn.commit()
-                cursor.execute("SELECT @@IDENTITY")
-                job_type_id = cursor.fetchone()[0]
-            else:
-                job_type_id = job_type[0]
+        # Case and punctuation variants map onto existing skills
+        if not skill_normalizer.loaded:
+            skill_normalizer.load(cursor)
+        data['skills_required'] = skill_normalizer.normalize_skills(data.get('skills_required'))
+        
+        # Resolve master rows from the cache; new ones are inserted uncommitted
+        resolver = MasterDataResolver(master_cache, cursor)
+        company_id = resolver.resolve('companies', data['company_name'])
+        sector_id = resolver.resolve('sectors', data.get('sector'))
+        course_id = resolver.resolve('courses', data.get('course'))
+        country_id = resolver.resolve('countries', data.get('country'))
+        state_id = resolver.resolve('states', data.get('state'), country_id) if country_id else None
+        city_id = resolver.resolve('cities', data.get('city'), state_id) if state_id else None
+        job_type_id = resolver.resolve('job_types', data.get('job_type'))
         
         # Insert job posting into Jobs table
         cursor.execute("""
@@ -1304,6 +1153,7 @@ def create_job():
                 CountryID, StateID, CityID, JobTypeID, ExperienceRequired,
                 Package, PostedByUserID, IsActive, CreatedAt
             )
+            OUTPUT INSERTED.JobID
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, GETDATE())
         """, (
             data['job_title'],
@@ -1319,36 +1169,33 @@ def create_job():
             data['package'],
             user_id
         ))
-        
-        conn.commit()
-        cursor.execute("SELECT @@IDENTITY")
         job_id = cursor.fetchone()[0]
         
-        # Add skills to JobSkills table
-        if data.get('skills_required'):
-            for skill_name in data['skills_required']:
-                # Get or create skill in JobSkillsMaster
-                cursor.execute("SELECT SkillID FROM JobSkillsMaster WHERE SkillName = ?", (skill_name,))
-                skill = cursor.fetchone()
-                
-                if skill:
-                    skill_id = skill[0]
-                else:
-                    cursor.execute("INSERT INTO JobSkillsMaster (SkillName, IsActive, CreatedAt) VALUES (?, 1, GETDATE())", (skill_name,))
-                    conn.commit()
-                    cursor.execute("SELECT @@IDENTITY")
-                    skill_id = cursor.fetchone()[0]
-                
-                # Link skill to job in JobSkills table
-                cursor.execute("""
-                    INSERT INTO JobSkills (JobID, SkillID, CreatedAt)
-                    VALUES (?, ?, GETDATE())
-                """, (job_id, skill_id))
+        # Link skills to the job in one multi-row insert
+        skill_ids = []
+        for skill_name in data.get('skills_required') or []:
+            skill_id = resolver.resolve('skills', skill_name)
+            if skill_id is not None and skill_id not in skill_ids:
+                skill_ids.append(skill_id)
+        if skill_ids:
+            cursor.execute(
+                "INSERT INTO JobSkills (JobID, SkillID, CreatedAt) VALUES "
+                + ", ".join("(?, ?, GETDATE())" for _ in skill_ids),
+                [value for skill_id in skill_ids for value in (job_id, skill_id)]
+            )
         
+        # Single commit for master rows, job and skills
         conn.commit()
+        reference_data.invalidate(*resolver.publish())
         cursor.close()
         conn.close()
         
+        job_cache.bump_version()
+        job_index.add(int(job_id), data['job_title'], data['job_description'],
+                      data['company_name'], data.get('skills_required'))
+        skill_matcher.set_job(int(job_id), data.get('skills_required'))
+        autocomplete.record_job(data)
+        
         print(f"✓ Job created successfully: ID {job_id}")
         
         return jsonify({
@@ -1363,6 +1210,58 @@ def create_job():
         traceback.print_exc()
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/jobs/bulk', methods=['POST'])
+def bulk_create_jobs():
+    """
+    Import many job postings from a JSONL or CSV upload
+    
+    Format comes from ?format=jsonl|csv or the Content-Type. CSV cells in
+    skills_required are separated with ';' or '|'. Every job is posted as the
+    logged-in user. Returns a result per row.
+    """
+    try:
+        if g.user is None:
+            return jsonify({'success': False, 'message': 'Login required to post jobs'}), 401
+        
+        fmt = detect_format(request.content_type, request.args.get('format'))
+        if fmt not in ('jsonl', 'csv'):
+            return jsonify({'success': False, 'message': 'Format must be jsonl or csv'}), 400
+        
+        conn = Config.get_db_connection()
+        if not skill_normalizer.loaded:
+            skill_normalizer.load(conn.cursor())
+        importer = JobBulkImporter(conn, master_cache, g.user['sub'],
+                                   chunk_size=Config.BULK_CHUNK_SIZE,
+                                   normalize_skills=skill_normalizer.normalize_skills)
+        results = importer.run(iter_records(request.stream, fmt))
+        conn.close()
+        
+        reference_data.invalidate(*importer.master_kinds)
+        if importer.created:
+            job_cache.bump_version()
+            for job_id, record in importer.created:
+                skills = split_skills(record.get('skills_required'))
+                job_index.add(job_id, record['job_title'], record['job_description'],
+                              record['company_name'], skills)
+                skill_matcher.set_job(job_id, skills)
+                autocomplete.record_job(record)
+        
+        inserted = len(importer.created)
+        print(f"✓ Bulk job import: {inserted} inserted, {len(results) - inserted} failed")
+        
+        return jsonify({
+            'success': inserted > 0,
+            'inserted': inserted,
+            'failed': len(results) - inserted,
+            'results': results
+        }), 201 if inserted else 400
+        
+    except Exception as e:
+        print(f"❌ ERROR in bulk_create_jobs: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 @app.route('/api/jobs/<int:job_id>', methods=['PUT'])
 def update_job(job_id):
     """Update an existing job posting in Jobs table"""
@@ -1397,6 +1296,10 @@ def update_job(job_id):
         cursor.close()
         conn.close()
         
+        job_cache.bump_version()
+        job_index.update(job_id, title=data.get('job_title'),
+                         description=data.get('job_description'))
+        
         return jsonify({'success': True, 'message': 'Job updated successfully'})
         
     except Exception as e:
@@ -1422,6 +1325,10 @@ def delete_job(job_id):
         cursor.close()
         conn.close()
         
+        job_cache.bump_version()
+        job_index.remove(job_id)
+        skill_matcher.remove_job(job_id)
+        
         return jsonify({'success': True, 'message': 'Job deleted successfully'})
         
     except Exception as e:
@@ -1432,48 +1339,29 @@ def delete_job(job_id):
 
 @app.route('/api/visitor/increment', methods=['POST'])
 def increment_visitor():
-    """Increment visitor count"""
+    """
+    Count a visit to the most recently updated resume
+    
+    Queued in memory and written by the counter flusher, so the response
+    carries the last known count plus pending hits. Unique visitors are
+    keyed by the optional visitor_id in the body, else by client address
+    and user agent.
+    """
     try:
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT TOP 1 ResumeID, VisitorCount 
-            FROM Resumes 
-            ORDER BY UpdatedDate DESC
-        """)
-        
-        result = cursor.fetchone()
-        
-        if result:
-            resume_id = result[0]
-            current_count = result[1] or 0
-            
-            cursor.execute("""
-                UPDATE Resumes 
-                SET VisitorCount = ?, UpdatedDate = GETDATE()
-                WHERE ResumeID = ?
-            """, (current_count + 1, resume_id))
-            
-            new_count = current_count + 1
-        else:
-            cursor.execute("""
-                INSERT INTO Resumes (ResumeTitle, Status, VisitorCount, DownloadCount, CreatedDate, UpdatedDate)
-                VALUES (?, ?, 1, 0, GETDATE(), GETDATE())
-            """, ('Untitled Resume', 'Draft'))
-            
-            cursor.execute("SELECT @@IDENTITY")
-            resume_id = cursor.fetchone()[0]
-            new_count = 1
+        data = request.get_json(silent=True) or {}
+        visitor_id = data.get('visitor_id') or \
+            f"{request.remote_addr}|{request.headers.get('User-Agent', '')}"
         
-        conn.commit()
-        cursor.close()
-        conn.close()
+        counters.increment('VisitorCount')
+        # script.js reuses the ID for download tracking; flushing stays in the background
+        resume_id = counters.resolve_latest_resume_id()
+        unique_visitors.add(str(visitor_id), resume_id)
         
         return jsonify({
             'success': True,
-            'resume_id': int(resume_id),
-            'visitor_count': new_count
+            'resume_id': resume_id,
+            'visitor_count': counters.estimate('VisitorCount'),
+            'queued': True
         })
         
     except Exception as e:
@@ -1482,46 +1370,30 @@ def increment_visitor():
 
 @app.route('/api/download/increment', methods=['POST'])
 def increment_download():
-    """Increment download count"""
+    """
+    Count a download of a resume
+    
+    Queued like visits; an unknown resume_id is dropped at flush time
+    because the UPDATE matches no row.
+    """
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         resume_id = data.get('resume_id')
         
         if not resume_id:
             return jsonify({'success': False, 'message': 'Resume ID is required'}), 400
+        try:
+            resume_id = int(resume_id)
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'Resume ID must be an integer'}), 400
         
-        conn = Config.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT DownloadCount 
-            FROM Resumes 
-            WHERE ResumeID = ?
-        """, (resume_id,))
-        
-        result = cursor.fetchone()
-        
-        if not result:
-            cursor.close()
-            conn.close()
-            return jsonify({'success': False, 'message': 'Resume not found'}), 404
-        
-        current_count = result[0] or 0
-        
-        cursor.execute("""
-            UPDATE Resumes 
-            SET DownloadCount = ?, UpdatedDate = GETDATE()
-            WHERE ResumeID = ?
-        """, (current_count + 1, resume_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+        counters.increment('DownloadCount', resume_id)
         
         return jsonify({
             'success': True,
-            'resume_id': int(resume_id),
-            'download_count': current_count + 1
+            'resume_id': resume_id,
+            'download_count': counters.estimate('DownloadCount', resume_id),
+            'queued': True
         })
         
     except Exception as e:
@@ -1531,7 +1403,7 @@ def increment_download():
 # ==================== ANALYTICS ====================
 @app.route('/api/analytics', methods=['GET'])
 def get_analytics():
-    """Get total visitor and download counts"""
+    """Get total visitor and download counts, plus unique visitors (?resume_id= adds one resume's)"""
     try:
         conn = Config.get_db_connection()
         cursor = conn.cursor()
@@ -1548,162 +1420,165 @@ def get_analytics():
         if row:
             total_visitors = row[0]
             total_downloads = row[1]
-            last_updated = str(row[2]) if row[2] else None
+            last_updated = row[2]
         else:
             total_visitors = 0
             total_downloads = 0
             last_updated = None
         
+        # Include hits the counter flusher has not written yet
+        total_visitors += counters.pending_total('VisitorCount')
+        total_downloads += counters.pending_total('DownloadCount')
+        
+        # HyperLogLog estimates (about 1% error)
+        today = date.today()
+        data = {
+            'visitor_count': total_visitors,
+            'download_count': total_downloads,
+            'unique_visitors': unique_visitors.estimate(cursor),
+            'unique_visitors_today': unique_visitors.estimate(cursor, f'day:{today.isoformat()}'),
+            'unique_visitors_7d': unique_visitors.estimate_union(
+                cursor, [f'day:{(today - timedelta(days=n)).isoformat()}' for n in range(7)]),
+            'last_updated': last_updated
+        }
+        
+        resume_id = request.args.get('resume_id', type=int)
+        if resume_id is not None:
+            data['resume'] = {
+                'resume_id': resume_id,
+                'unique_visitors': unique_visitors.estimate(cursor, f'resume:{resume_id}')
+            }
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'success': True, 'data': data})
+        
+    except Exception as e:
+        print(f"❌ ERROR in get_analytics: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/analytics/timeseries', methods=['GET'])
+def get_analytics_timeseries():
+    """
+    Visits and downloads per bucket (?from=&to=&bucket=minute|hour|day)
+    
+    Served from the rollup tables; defaults to the last hour, day or 30 days
+    depending on the bucket.
+    """
+    try:
+        start, end, bucket = parse_range(request.args)
+        
+        conn = Config.get_db_connection()
+        cursor = conn.cursor()
+        series = analytics_events.timeseries(cursor, start, end, bucket,
+                                             pending=counters.pending_events())
         cursor.close()
         conn.close()
         
         return jsonify({
             'success': True,
-            'data': {
-                'visitor_count': total_visitors,
-                'download_count': total_downloads,
-                'last_updated': last_updated
+            'bucket': bucket,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'series': series,
+            'totals': {
+                'visits': sum(point['visits'] for point in series),
+                'downloads': sum(point['downloads'] for point in series)
             }
         })
         
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
-        print(f"❌ ERROR in get_analytics: {str(e)}")
+        print(f"❌ ERROR in get_analytics_timeseries: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 # ==================== RESUME MANAGEMENT ====================
 
 @app.route('/api/resumes', methods=['GET'])
 def get_all_resumes():
-    """Get all resumes"""
+    """Get a page of resumes (?limit=&cursor=)"""
+    try:
+        page_size = parse_page_size(request.args.get('limit'))
+        where = ""
+        params = []
+        if request.args.get('cursor'):
+            clause, params = keyset_clause('CreatedDate', 'ResumeID',
+                                           decode_cursor(request.args['cursor']))
+            where = "WHERE " + clause
+        
+        conn = Config.get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(RESUME_SELECT_SQL + where + order_and_limit('CreatedDate', 'ResumeID'),
+                       (*params, page_size + 1))
+        resumes, next_cursor = split_page(cursor.fetchall(), page_size, 3, 0)
+        
+        # One query per child table for the whole page, not seven per resume
+        result = ResumeBatchLoader(cursor).load(resumes)
+        
+        cursor.close()
+        conn.close()
+        
+        body = {'success': True, 'data': result, 'count': len(result), 'next_cursor': next_cursor}
+        if len(result) >= Config.JSON_STREAM_MIN_ITEMS:
+            return app.json.stream(body)  # encoded as it is sent
+        return jsonify(body)
+        
+    except InvalidCursorError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except Exception as e:
+        print(f"❌ ERROR in get_all_resumes: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/resumes/stats', methods=['GET'])
+def get_resume_stats():
+    """Totals, top locations and top skills across every resume (for dashboard.html)"""
     try:
         conn = Config.get_db_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT ResumeID, ResumeTitle, Status, CreatedDate, 
-                   VisitorCount, DownloadCount 
-            FROM Resumes 
-            ORDER BY CreatedDate DESC
+            SELECT (SELECT COUNT(*) FROM Resumes),
+                   (SELECT COUNT(*) FROM WorkExperience),
+                   (SELECT COUNT(*) FROM Education),
+                   (SELECT COUNT(*) FROM Skills)
         """)
-        resumes = cursor.fetchall()
+        resumes, work, education, skills = cursor.fetchone()
         
-        if not resumes:
-            cursor.close()
-            conn.close()
-            return jsonify({'success': True, 'data': [], 'count': 0})
+        cursor.execute("""
+            SELECT TOP 10 Location, COUNT(*) AS Total
+            FROM PersonalInformation
+            WHERE Location IS NOT NULL AND Location <> ''
+            GROUP BY Location
+            ORDER BY Total DESC
+        """)
+        locations = [{'name': name, 'count': count} for name, count in cursor.fetchall()]
         
-        result = []
-        for resume in resumes:
-            resume_id = resume[0]
-            
-            cursor.execute("""
-                SELECT FullName, Email, PhoneNumber, DateOfBirth, Location, 
-                       LinkedInURL, GitHubURL, CareerObjective, PhotoPath
-                FROM PersonalInformation 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            p = cursor.fetchone()
-            personal_info = {
-                'full_name': p[0] if p and p[0] else 'Unknown',
-                'email': p[1] if p and p[1] else 'No email',
-                'phone_number': p[2] if p and p[2] else None,
-                'date_of_birth': str(p[3]) if p and p[3] else None,
-                'location': p[4] if p and p[4] else 'N/A',
-                'linkedin_url': p[5] if p and p[5] else None,
-                'github_url': p[6] if p and p[6] else None,
-                'career_objective': p[7] if p and p[7] else None,
-                'photo_path': p[8] if p and len(p) > 8 and p[8] else None
-            } if p else {'full_name': 'Unknown', 'email': 'No email', 'location': 'N/A'}
-            
-            cursor.execute("""
-                SELECT CompanyName, JobRole, DateOfJoin, LastWorkingDate, Experience 
-                FROM WorkExperience 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            work_experience = [{
-                'company_name': w[0],
-                'job_role': w[1],
-                'date_of_join': str(w[2]) if w[2] else None,
-                'last_working_date': str(w[3]) if w[3] else None,
-                'experience': w[4]
-            } for w in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT College, University, Course, Year, CGPA 
-                FROM Education 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            education = [{
-                'institution_name': e[0],
-                'university_name': e[1],
-                'course_name': e[2],
-                'year_of_completion': e[3],
-                'cgpa': float(e[4]) if e[4] else None
-            } for e in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT ProjectTitle, ProjectLink, Organization, Description 
-                FROM Projects 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            projects = [{
-                'project_title': p[0],
-                'project_link': p[1],
-                'organization': p[2],
-                'description': p[3]
-            } for p in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT SkillType, SkillName 
-                FROM Skills 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            skills = [{
-                'skill_type': s[0],
-                'skill_name': s[1]
-            } for s in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT CertificationName 
-                FROM Certifications 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            certifications = [{
-                'certification_name': c[0]
-            } for c in cursor.fetchall()]
-            
-            cursor.execute("""
-                SELECT InterestName 
-                FROM Interests 
-                WHERE ResumeID = ?
-            """, (resume_id,))
-            interests = [{
-                'interest_name': i[0]
-            } for i in cursor.fetchall()]
-            
-            result.append({
-                'resume_id': resume_id,
-                'resume_title': resume[1] if resume[1] else 'Untitled Resume',
-                'status': resume[2] if len(resume) > 2 else 'Draft',
-                'created_at': str(resume[3]) if resume[3] else None,
-                'visitor_count': resume[4] if len(resume) > 4 else 0,
-                'download_count': resume[5] if len(resume) > 5 else 0,
-                'personal_info': personal_info,
-                'work_experience': work_experience,
-                'education': education,
-                'projects': projects,
-                'skills': skills,
-                'certifications': certifications,
-                'interests': interests
-            })
+        cursor.execute("""
+            SELECT TOP 10 SkillName, COUNT(*) AS Total
+            FROM Skills
+            WHERE SkillName IS NOT NULL AND SkillName <> ''
+            GROUP BY SkillName
+            ORDER BY Total DESC
+        """)
+        top_skills = [{'name': name, 'count': count} for name, count in cursor.fetchall()]
         
         cursor.close()
         conn.close()
         
-        return jsonify({'success': True, 'data': result, 'count': len(result)})
+        return jsonify({'success': True, 'data': {
+            'total_resumes': resumes,
+            'total_work': work,
+            'total_education': education,
+            'total_skills': skills,
+            'top_locations': locations,
+            'top_skills': top_skills
+        }})
         
     except Exception as e:
-        print(f"❌ ERROR in get_all_resumes: {str(e)}")
+        print(f"❌ ERROR in get_resume_stats: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/api/resume', methods=['POST'])
@@ -1720,11 +1595,9 @@ def create_resume():
         
         cursor.execute("""
             INSERT INTO Resumes (ResumeTitle, Status, VisitorCount, DownloadCount, CreatedDate, UpdatedDate) 
+            OUTPUT INSERTED.ResumeID
             VALUES (?, ?, 0, 0, GETDATE(), GETDATE())
         """, (data.get('resume_title', 'Untitled Resume'), 'Draft'))
-        conn.commit()
-        
-        cursor.execute("SELECT @@IDENTITY")
         resume_id = cursor.fetchone()[0]
         
         if 'personal_info' in data:
@@ -1738,64 +1611,71 @@ def create_resume():
                 pi.get('phone_number'), pi.get('date_of_birth'), pi.get('location'),
                 pi.get('linkedin_url'), pi.get('github_url'), pi.get('career_objective')))
         
-        if 'work_experience' in data:
-            for work in data['work_experience']:
-                cursor.execute("""
-                    INSERT INTO WorkExperience 
-                    (ResumeID, CompanyName, JobRole, DateOfJoin, LastWorkingDate, Experience, CreatedDate) 
-                    VALUES (?, ?, ?, ?, ?, ?, GETDATE())
-                """, (resume_id, work.get('company_name'), work.get('job_role'),
-                    work.get('date_of_join'), work.get('last_working_date'), work.get('experience')))
-        
-        if 'education' in data:
-            for edu in data['education']:
-                cursor.execute("""
-                    INSERT INTO Education 
-                    (ResumeID, College, University, Course, Year, CGPA, CreatedDate) 
-                    VALUES (?, ?, ?, ?, ?, ?, GETDATE())
-                """, (resume_id, edu.get('college'), edu.get('university'),
-                    edu.get('course'), edu.get('year'), edu.get('cgpa')))
-        
-        if 'projects' in data:
-            for proj in data['projects']:
-                cursor.execute("""
-                    INSERT INTO Projects 
-                    (ResumeID, ProjectTitle, ProjectLink, Organization, Description, CreatedDate) 
-                    VALUES (?, ?, ?, ?, ?, GETDATE())
-                """, (resume_id, proj.get('project_title'), proj.get('project_link'),
-                    proj.get('organization'), proj.get('description')))
-        
-        if 'skills' in data:
-            for skill in data['skills']:
-                cursor.execute("""
-                    INSERT INTO Skills (ResumeID, SkillType, SkillName, CreatedDate) 
-                    VALUES (?, ?, ?, GETDATE())
-                """, (resume_id, skill.get('skill_type'), skill.get('skill_name')))
-        
-        if 'certifications' in data:
-            for cert in data['certifications']:
-                cursor.execute("""
-                    INSERT INTO Certifications (ResumeID, CertificationName, CreatedDate) 
-                    VALUES (?, ?, GETDATE())
-                """, (resume_id, cert.get('certification_name')))
-        
-        if 'interests' in data:
-            for interest in data['interests']:
-                cursor.execute("""
-                    INSERT INTO Interests (ResumeID, InterestName, CreatedDate) 
-                    VALUES (?, ?, GETDATE())
-                """, (resume_id, interest.get('interest_name')))
+        # One multi-row insert per child table, all in the same transaction
+        insert_resume_children(cursor, resume_id, data)
         
         conn.commit()
         cursor.close()
         conn.close()
         
+        skill_matcher.set_resume(int(resume_id),
+                                 [s.get('skill_name') for s in data.get('skills') or []])
+        data_versions.bump('resumes')
+        
         return jsonify({'success': True, 'message': 'Resume created successfully', 'resume_id': int(resume_id)}), 201
         
     except Exception as e:
         print(f"❌ ERROR in create_resume: {str(e)}")
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/resume/<int:resume_id>/recommended-jobs', methods=['GET'])
+def get_recommended_jobs(resume_id):
+    """Active jobs ranked by how much of their required skills the resume covers (?limit=)"""
+    try:
+        limit = parse_page_size(request.args.get('limit'))
+        
+        conn = Config.get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT ResumeID FROM Resumes WHERE ResumeID = ?", (resume_id,))
+        if not cursor.fetchone():
+            cursor.close()
+            conn.close()
+            return jsonify({'success': False, 'message': 'Resume not found'}), 404
+        
+        if not skill_matcher.loaded:
+            skill_matcher.load(cursor)
+        elif skill_matcher.needs_reload():
+            skill_matcher.reload_in_background()
+        cursor.execute("SELECT SkillName FROM Skills WHERE ResumeID = ?", (resume_id,))
+        skills = [row[0] for row in cursor.fetchall()]
+        hits = skill_matcher.match_jobs(skills, limit)
+        
+        jobs = []
+        if hits:
+            cursor.execute(JOB_SELECT_SQL + """
+                JOIN STRING_SPLIT(?, ',') ids ON j.JobID = CAST(ids.value AS INT)
+                WHERE j.IsActive = 1
+            """, (','.join(str(job_id) for job_id, _, _ in hits),))
+            rows = {row[0]: row for row in cursor.fetchall()}
+            skills_by_job = fetch_job_skills(cursor, list(rows))
+            
+            # Keep the matcher's ranking order
+            for job_id, score, matched in hits:
+                if job_id in rows:
+                    job = job_row_to_dict(rows[job_id], skills_by_job[job_id])
+                    job['score'] = round(score, 4)
+                    job['matched_skills'] = matched
+                    jobs.append(job)
+        
+        cursor.close()
+        conn.close()
+        return jsonify({'success': True, 'resume_id': resume_id, 'jobs': jobs, 'count': len(jobs)})
+        
+    except Exception as e:
+        print(f"❌ ERROR in get_recommended_jobs: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
 if __name__ == '__main__':
     """Run the application"""
     
@@ -1804,6 +1684,7 @@ if __name__ == '__main__':
     print("="*50)
     print("Server running at: http://localhost:5000")
     print("API base URL: http://localhost:5000/api")
+    print("Development server only; for production run: python serve.py")
     print("\nPress CTRL+C to stop the server")
     print("="*50 + "\n")
     
@@ -1812,4 +1693,6 @@ if __name__ == '__main__':
     except Exception as e:
         print(f"⚠️  Warning: Could not connect to database: {e}")
     
+    warm_caches()
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,342 @@
+"""
+Autocomplete
+------------
+Frequency-ranked prefix completion over master names, answered from
+sorted arrays in memory
+
+Names are kept sorted by lower-cased key, so the entries starting with a
+prefix form one contiguous range found with two bisects. The top k of that
+range by frequency come from a range-maximum structure (block maxima plus a
+sparse table over the blocks), popped best-first through a small heap, so
+a query costs O(k log k) whatever the size of the range.
+"""
+
+import heapq
+import threading
+import time
+from bisect import bisect_left
+
+import numpy as np
+
+from bulk import split_skills
+
+# kind -> query returning (name, active jobs using it)
+AUTOCOMPLETE_SOURCES = {
+    'skills': """
+        SELECT m.SkillName, COUNT(j.JobID)
+        FROM JobSkillsMaster m
+        LEFT JOIN (JobSkills js JOIN Jobs j ON j.JobID = js.JobID AND j.IsActive = 1)
+            ON js.SkillID = m.SkillID
+        WHERE m.IsActive = 1
+        GROUP BY m.SkillID, m.SkillName
+    """,
+    'companies': """
+        SELECT c.CompanyName, COUNT(j.JobID)
+        FROM Companies c
+        LEFT JOIN Jobs j ON j.CompanyID = c.CompanyID AND j.IsActive = 1
+        GROUP BY c.CompanyID, c.CompanyName
+    """,
+    'courses': """
+        SELECT co.CourseName, COUNT(j.JobID)
+        FROM Courses co
+        LEFT JOIN Jobs j ON j.CourseID = co.CourseID AND j.IsActive = 1
+        WHERE co.IsActive = 1
+        GROUP BY co.CourseID, co.CourseName
+    """,
+    'cities': """
+        SELECT ci.CityName, COUNT(j.JobID)
+        FROM Cities ci
+        LEFT JOIN Jobs j ON j.CityID = ci.CityID AND j.IsActive = 1
+        WHERE ci.IsActive = 1
+        GROUP BY ci.CityID, ci.CityName
+    """,
+}
+
+# Job fields whose values count towards each kind's frequencies
+JOB_FIELDS = {'companies': 'company_name', 'courses': 'course', 'cities': 'city'}
+
+# Sorts after every character a name can contain
+KEY_END = '\U0010ffff'
+
+
+def completion_key(name):
+    """Case- and whitespace-insensitive key a prefix is matched against"""
+    return ' '.join(str(name).split()).lower()
+
+
+class PrefixIndex:
+    """
+    Immutable sorted name array with frequencies and range-maximum lookup
+
+    Duplicate keys (e.g. the same city name in two states) are merged and
+    their frequencies added.
+    """
+
+    BLOCK = 64
+
+    def __init__(self, entries):
+        merged = {}
+        for name, frequency in entries:
+            if not name or not str(name).strip():
+                continue
+            key = completion_key(name)
+            if key in merged:
+                merged[key][1] += frequency or 0
+            else:
+                merged[key] = [' '.join(str(name).split()), frequency or 0]
+        self.keys = sorted(merged)
+        self.names = [merged[key][0] for key in self.keys]
+        n = len(self.keys)
+        self.frequencies = np.array([merged[key][1] for key in self.keys], dtype=np.int64)
+
+        # One unique score per entry: frequency first, then the alphabetically
+        # earlier key, so a maximum also identifies its position
+        self._n = max(n, 1)
+        self._scores = self.frequencies * self._n + (n - 1 - np.arange(n, dtype=np.int64))
+
+        padded = np.full(-(-n // self.BLOCK) * self.BLOCK, -1, dtype=np.int64)
+        padded[:n] = self._scores
+        self._levels = [padded.reshape(-1, self.BLOCK).max(axis=1, initial=-1)]
+        width = 1
+        while width * 2 <= len(self._levels[-1]):
+            prev = self._levels[-1]
+            self._levels.append(np.maximum(prev[:-width], prev[width:]))
+            width *= 2
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, key):
+        """Position of an exact key, or None"""
+        i = bisect_left(self.keys, key)
+        return i if i < len(self.keys) and self.keys[i] == key else None
+
+    def prefix_range(self, prefix):
+        return bisect_left(self.keys, prefix), bisect_left(self.keys, prefix + KEY_END)
+
+    def ranked(self, prefix):
+        """Positions of the entries starting with `prefix`, best first (a generator)"""
+        lo, hi = self.prefix_range(prefix)
+        if lo >= hi:
+            return
+        heap = [(-self._range_max(lo, hi), lo, hi)]
+        while heap:
+            score, lo, hi = heapq.heappop(heap)
+            position = len(self.keys) - 1 - (-score) % self._n
+            yield position
+            if lo < position:
+                heapq.heappush(heap, (-self._range_max(lo, position), lo, position))
+            if position + 1 < hi:
+                heapq.heappush(heap, (-self._range_max(position + 1, hi), position + 1, hi))
+
+    def _range_max(self, lo, hi):
+        """Highest score in [lo, hi)"""
+        block = self.BLOCK
+        first, last = lo // block, (hi - 1) // block
+        if first == last:
+            return int(self._scores[lo:hi].max())
+        best = max(self._scores[lo:(first + 1) * block].max(), self._scores[last * block:hi].max())
+        if last - first > 1:
+            level = (last - first - 1).bit_length() - 1
+            table = self._levels[level]
+            best = max(best, table[first + 1], table[last - (1 << level)])
+        return int(best)
+
+
+class CompletionSet:
+    """
+    PrefixIndex plus a small overlay of names added or re-counted since it was built
+
+    Queries merge the two. Once the overlay holds COMPACT_AFTER names it is
+    folded into a new PrefixIndex by a background thread; queries and adds
+    carry on against the old one meanwhile.
+    """
+
+    COMPACT_AFTER = 1000
+
+    def __init__(self, entries=()):
+        self._base = PrefixIndex(entries)
+        self._pending = {}  # key -> [name, frequency]; overrides the base entry
+        self._lock = threading.Lock()
+        self._compacting = False
+
+    def __len__(self):
+        base, pending = self._base, self._pending
+        return len(base) + sum(1 for key in list(pending) if base.find(key) is None)
+
+    def add(self, name, amount=0):
+        """Add a name (if new) and `amount` to its frequency"""
+        if not name or not str(name).strip():
+            return
+        key = completion_key(name)
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                position = self._base.find(key)
+                if position is None:
+                    entry = [' '.join(str(name).split()), 0]
+                else:
+                    entry = [self._base.names[position], int(self._base.frequencies[position])]
+                self._pending[key] = entry
+            entry[1] += amount
+            compact = len(self._pending) >= self.COMPACT_AFTER and not self._compacting
+            if compact:
+                self._compacting = True
+        if compact:
+            threading.Thread(target=self._compact, name='autocomplete-compact', daemon=True).start()
+
+    def complete(self, prefix, k=10):
+        """
+        Top `k` names starting with `prefix`
+
+        Returns:
+            list: (name, frequency), highest frequency first, ties alphabetical
+        """
+        key = completion_key(prefix)
+        if key and prefix[-1].isspace():
+            key += ' '  # "new " should not match "newark"
+        prefix = key
+        with self._lock:
+            base = self._base
+            overlay = [(-frequency, key, name) for key, (name, frequency) in self._pending.items()
+                       if key.startswith(prefix)]
+            shadowed = {key for _, key, _ in overlay}
+
+        results = heapq.nsmallest(k, overlay)
+        taken = 0
+        for position in base.ranked(prefix):
+            if taken >= k:
+                break
+            key = base.keys[position]
+            if key in shadowed:
+                continue
+            results.append((-int(base.frequencies[position]), key, base.names[position]))
+            taken += 1
+        results.sort()
+        return [(name, -negative) for negative, _, name in results[:k]]
+
+    def _compact(self):
+        try:
+            with self._lock:
+                base = self._base
+                folded = {key: tuple(entry) for key, entry in self._pending.items()}
+            entries = {key: (name, int(frequency))
+                       for key, name, frequency in zip(base.keys, base.names, base.frequencies)}
+            entries.update(folded)
+            rebuilt = PrefixIndex(entries.values())
+            with self._lock:
+                self._base = rebuilt
+                # Keep only names added or re-counted while the rebuild ran
+                self._pending = {key: entry for key, entry in self._pending.items()
+                                 if folded.get(key) != tuple(entry)}
+        finally:
+            self._compacting = False
+
+
+class AutocompleteIndex:
+    """
+    One CompletionSet per kind, loaded from the database
+
+    Sets are rebuilt in a background thread after `reload_after` seconds or
+    invalidate(kind), and keep answering from the previous data until the
+    rebuild is swapped in. Names added while a rebuild runs are replayed
+    onto the new set.
+    """
+
+    RETRY_AFTER = 30  # Seconds before a failed background rebuild is retried
+
+    def __init__(self, connect, reload_after=300):
+        self.connect = connect
+        self.reload_after = reload_after
+        self._sets = {}       # kind -> CompletionSet
+        self._loaded_at = {}  # kind -> monotonic time
+        self._replay = {}     # kind -> [(name, amount)] while that kind is loading
+        self._retry_at = {}   # kind -> monotonic time before which no rebuild starts
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'loads': 0, 'load_failures': 0}
+
+    def load(self, cursor, kinds=None):
+        """Build the sets for every (or the given) kind from the database"""
+        for kind in kinds or AUTOCOMPLETE_SOURCES:
+            with self._lock:
+                self._replay.setdefault(kind, [])
+            try:
+                cursor.execute(AUTOCOMPLETE_SOURCES[kind])
+                completions = CompletionSet(cursor.fetchall())
+            except Exception:
+                with self._lock:
+                    self._replay.pop(kind, None)
+                raise
+            with self._lock:
+                for name, amount in self._replay.pop(kind):
+                    completions.add(name, amount)
+                self._sets[kind] = completions
+                self._loaded_at[kind] = time.monotonic()
+                self._stats['loads'] += 1
+
+    def complete(self, kind, prefix, k=10):
+        """Top `k` (name, frequency) for `prefix`; loads the kind on first use"""
+        completions = self._sets.get(kind)
+        if completions is None:
+            self._load_now(kind)
+            completions = self._sets[kind]
+        elif time.monotonic() - self._loaded_at.get(kind, 0) > self.reload_after:
+            self._reload_in_background(kind)
+        self._stats['queries'] += 1
+        return completions.complete(prefix, k)
+
+    def add(self, kind, name, amount=0):
+        """Add a name and/or `amount` uses of it; no-op for kinds not loaded yet"""
+        with self._lock:
+            completions = self._sets.get(kind)
+            if kind in self._replay:
+                self._replay[kind].append((name, amount))
+        if completions is not None:
+            completions.add(name, amount)
+
+    def record_job(self, record):
+        """Count one use of each master name a newly created job refers to"""
+        for kind, field in JOB_FIELDS.items():
+            self.add(kind, record.get(field), 1)
+        for skill in {completion_key(s): s for s in split_skills(record.get('skills_required'))}.values():
+            self.add('skills', skill, 1)
+
+    def invalidate(self, kind):
+        """Rebuild one kind in the background (after renames and deletes)"""
+        if kind in AUTOCOMPLETE_SOURCES:
+            self._reload_in_background(kind)
+
+    def stats(self):
+        snapshot = dict(self._stats)
+        snapshot['entries'] = {kind: len(s) for kind, s in list(self._sets.items())}
+        return snapshot
+
+    def _load_now(self, kind):
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            self.load(cursor, [kind])
+            cursor.close()
+        finally:
+            conn.close()
+
+    def _reload_in_background(self, kind):
+        with self._lock:
+            if kind in self._replay:
+                return  # already loading
+            if time.monotonic() < self._retry_at.get(kind, 0):
+                return  # last rebuild failed; keep serving the old set for now
+            self._replay[kind] = []
+
+        def run():
+            try:
+                self._load_now(kind)
+            except Exception as e:
+                self._stats['load_failures'] += 1
+                print(f"❌ ERROR reloading autocomplete ({kind}): {str(e)}")
+                # load() clears this on its own failures, but not if connect() failed
+                with self._lock:
+                    self._replay.pop(kind, None)
+                    self._retry_at[kind] = time.monotonic() + self.RETRY_AFTER
+
+        threading.Thread(target=run, name=f'autocomplete-{kind}', daemon=True).start()
@@ -0,0 +1,846 @@
+"""
+API Benchmarks
+--------------
+Measures round trips and throughput of hot API paths against an in-memory
+fake database, so they run without SQL Server.
+
+Usage:
+    python benchmark.py                 # run every benchmark
+    python benchmark.py jobs_query_count
+"""
+
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from config import Config
+
+
+# ==========================================
+# FAKE DATABASE
+# ==========================================
+
+class FakeCursor:
+    """Cursor that answers queries through a responder and counts them"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        self.connection.queries.append(sql)
+        if self.connection.latency:
+            time.sleep(self.connection.latency)
+        self._rows = list(self.connection.responder(sql, params))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        self.connection.queries.append(sql)
+        if self.connection.latency:
+            time.sleep(self.connection.latency)
+        for params in seq_of_params:
+            self.connection.responder(sql, params)
+        self._rows = []
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """
+    Connection stand-in; responder(sql, params) returns the result rows
+
+    `latency` (seconds) is slept per statement and per commit to model the
+    network round trip.
+    """
+
+    def __init__(self, responder, latency=0.0):
+        self.responder = responder
+        self.latency = latency
+        self.queries = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_jobs_responder(job_count, skills_per_job=5):
+    """Responder serving job_count synthetic jobs with their skills"""
+    created = datetime(2026, 1, 1)
+    jobs = [
+        (job_id, f'Engineer {job_id}', 'Acme', 'Build things', '2-4 years', '10 LPA',
+         'Full Time', 'B.Tech', 'IT', 'India', 'Karnataka', 'Bengaluru',
+         created - timedelta(minutes=job_id), 'recruiter')
+        for job_id in range(1, job_count + 1)
+    ]
+
+    def responder(sql, params):
+        if 'FROM JobSkills' in sql:
+            wanted = {int(v) for v in params[0].split(',')} if params else set()
+            return [(job[0], f'Skill{n}') for job in jobs if job[0] in wanted
+                    for n in range(skills_per_job)]
+        if 'FROM Jobs' in sql:
+            return jobs[:params[-1]]
+        return []
+
+    return responder
+
+
+def make_resumes_responder(resume_count, children_per_table=3):
+    """Responder serving resume_count synthetic resumes with child rows"""
+    created = datetime(2026, 1, 1)
+    resumes = [(resume_id, f'Resume {resume_id}', 'Draft',
+                created - timedelta(minutes=resume_id), 0, 0)
+               for resume_id in range(1, resume_count + 1)]
+    child_rows = {
+        'PersonalInformation': ('Jane Doe', 'jane@example.com', '9999999999', None,
+                                'Pune', None, None, 'Objective', None),
+        'WorkExperience': ('Acme', 'Engineer', date(2022, 1, 10), date(2024, 3, 31), '2 years'),
+        'Education': ('College', 'University', 'B.Tech', 2024, Decimal('8.50')),
+        'Projects': ('Project', None, 'Acme', 'Description'),
+        'Skills': ('Technical', 'Python'),
+        'Certifications': ('AWS',),
+        'Interests': ('Chess',),
+    }
+
+    def responder(sql, params):
+        for table, row in child_rows.items():
+            if f'FROM {table}' in sql:
+                wanted = [int(v) for v in params[0].split(',')]
+                per_resume = 1 if table == 'PersonalInformation' else children_per_table
+                return [(resume_id,) + row for resume_id in wanted for _ in range(per_resume)]
+        if 'FROM Resumes' in sql:
+            return resumes[:params[-1]]
+        return []
+
+    return responder
+
+
+def run_with_fake_db(responder, path):
+    """Issue a GET against the app with the fake database; returns (queries, seconds)"""
+    from app import app
+
+    connection = FakeConnection(responder)
+    original = Config.get_db_connection
+    Config.get_db_connection = staticmethod(lambda: connection)
+    try:
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - start
+    finally:
+        Config.get_db_connection = original
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return len(connection.queries), elapsed
+
+
+# ==========================================
+# BENCHMARKS
+# ==========================================
+
+def bench_jobs_query_count():
+    """GET /api/jobs: round trips must stay constant as the job count grows"""
+    print(f"{'jobs':>8} {'queries':>8} {'ms':>10}")
+    for job_count in (10, 50, 100, 200):
+        queries, elapsed = run_with_fake_db(make_jobs_responder(job_count),
+                                            f'/api/jobs?limit={job_count}')
+        print(f"{job_count:>8} {queries:>8} {elapsed * 1000:>10.1f}")
+
+
+def bench_resumes_query_count():
+    """GET /api/resumes: one query per child table, independent of resume count"""
+    print(f"{'resumes':>8} {'queries':>8} {'ms':>10}")
+    for resume_count in (10, 50, 100, 200):
+        queries, elapsed = run_with_fake_db(make_resumes_responder(resume_count),
+                                            f'/api/resumes?limit={resume_count}')
+        print(f"{resume_count:>8} {queries:>8} {elapsed * 1000:>10.1f}")
+
+
+def bench_search_latency():
+    """JobSearchIndex.search over 100k synthetic jobs (target: < 50 ms)"""
+    import random
+    from search import JobSearchIndex
+
+    random.seed(7)
+    vocabulary = [f'term{n}' for n in range(5000)]
+    common = ['engineer', 'developer', 'senior', 'python', 'java', 'manager', 'data', 'cloud']
+    index = JobSearchIndex()
+    index.loaded = True
+
+    start = time.perf_counter()
+    with index._lock:
+        for job_id in range(100000):
+            index._add_locked(job_id, {
+                'title': ' '.join(random.sample(common, 2)),
+                'description': ' '.join(random.choices(vocabulary, k=60)),
+                'company': f'company{job_id % 500}',
+                'skills': random.sample(common, 3),
+            })
+    index.warm()
+    print(f"build: {time.perf_counter() - start:.1f}s, {index.stats()}")
+
+    print(f"{'query':<32} {'hits':>6} {'ms':>8}")
+    for query in ('python engineer', 'term12 term99', 'senior data cloud developer', 'nomatch'):
+        start = time.perf_counter()
+        hits = index.search(query)
+        print(f"{query:<32} {len(hits):>6} {(time.perf_counter() - start) * 1000:>8.1f}")
+
+
+def make_write_responder():
+    """Responder for write paths: empty master tables, sequential OUTPUT IDs"""
+    counter = iter(range(1, 10 ** 9))
+
+    def responder(sql, params):
+        if 'DataVersions' in sql:
+            return []
+        if 'OUTPUT s.RowNum' in sql:
+            return [(row[0], next(counter)) for row in responder.staged]
+        if 'OUTPUT INSERTED.JobID' in sql or 'OUTPUT INSERTED.ResumeID' in sql:
+            return [(next(counter),)]
+        if 'OUTPUT INSERTED' in sql:
+            # master insert: echo (id, name, parent) per VALUES row
+            width = 2 if ('INSERT INTO States' in sql or 'INSERT INTO Cities' in sql) else 1
+            return [(next(counter), params[i], params[i + 1] if width == 2 else None)
+                    for i in range(0, len(params), width)]
+        if 'INSERT INTO #JobImport' in sql:
+            responder.staged.append(params)
+        if 'TRUNCATE TABLE #JobImport' in sql:
+            responder.staged = []
+        return []
+
+    responder.staged = []
+    return responder
+
+
+def sample_job(n):
+    return {
+        'job_title': f'Engineer {n}', 'company_name': f'Company {n % 50}',
+        'job_description': 'Build and ship features', 'experience_required': 'Junior',
+        'package': '8 LPA', 'job_type': 'Full-Time', 'sector': 'IT', 'course': 'B.Tech',
+        'country': 'India', 'state': 'Karnataka', 'city': f'City {n % 20}',
+        'skills_required': ['Python', 'SQL', f'Skill {n % 30}'],
+    }
+
+
+def bench_bulk_import():
+    """POST /api/jobs/bulk vs looping POST /api/jobs: jobs/sec at 1 ms RTT (target: 50x)"""
+    import json
+    from app import app, data_versions, master_cache, token_service
+
+    job_count = 2000
+    client = app.test_client()
+    token, _ = token_service.issue(1, 'recruiter', 'recruiter')
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    original, original_versions = Config.get_db_connection, data_versions.connect
+    rates = {}
+    print(f"{'mode':>5} {'jobs':>6} {'statements':>11} {'commits':>8} {'round trips':>12} "
+          f"{'ms':>9} {'jobs/s':>9}")
+    try:
+        for label in ('loop', 'bulk'):
+            for kind in list(master_cache._maps):
+                master_cache.invalidate(kind)
+            connection = FakeConnection(make_write_responder(), latency=0.001)
+            Config.get_db_connection = staticmethod(lambda: connection)
+            # Each request also syncs the shared versions and each write bumps them
+            data_versions.connect = lambda: connection
+            start = time.perf_counter()
+            if label == 'loop':
+                for n in range(job_count):
+                    client.post('/api/jobs', json=sample_job(n))
+            else:
+                body = '\n'.join(json.dumps(sample_job(n)) for n in range(job_count))
+                response = client.post('/api/jobs/bulk', data=body,
+                                       content_type='application/x-ndjson')
+                assert response.status_code == 201, response.get_json()
+            elapsed = time.perf_counter() - start
+            rates[label] = job_count / elapsed
+            round_trips = len(connection.queries) + connection.commits
+            print(f"{label:>5} {job_count:>6} {len(connection.queries):>11} "
+                  f"{connection.commits:>8} {round_trips:>12} "
+                  f"{elapsed * 1000:>9.1f} {rates[label]:>9.0f}")
+    finally:
+        Config.get_db_connection = original
+        data_versions.connect = original_versions
+    print(f"bulk speedup: {rates['bulk'] / rates['loop']:.0f}x")
+
+
+def sample_resume(rows_per_table):
+    return {
+        'resume_title': 'Benchmark Resume',
+        'personal_info': {'full_name': 'Jane Doe', 'email': 'jane@example.com'},
+        'work_experience': [{'company_name': f'Company {n}', 'job_role': 'Engineer',
+                             'experience': '1 year'} for n in range(rows_per_table)],
+        'education': [{'college': f'College {n}', 'course': 'B.Tech', 'year': 2020 + n % 5,
+                       'cgpa': 8.5} for n in range(rows_per_table)],
+        'projects': [{'project_title': f'Project {n}', 'description': 'Built it'}
+                     for n in range(rows_per_table)],
+        'skills': [{'skill_type': 'Technical', 'skill_name': f'Skill {n}'}
+                   for n in range(rows_per_table)],
+        'certifications': [{'certification_name': f'Cert {n}'} for n in range(rows_per_table)],
+        'interests': [{'interest_name': f'Interest {n}'} for n in range(rows_per_table)],
+    }
+
+
+def bench_resume_write():
+    """POST /api/resume child rows: one statement per row vs one per table (1 ms RTT)"""
+    import model
+    from app import app
+
+    client = app.test_client()
+    original = Config.get_db_connection
+    batch_limit = model.MAX_ROWS_PER_STATEMENT
+    print(f"{'mode':>8} {'rows':>6} {'statements':>11} {'ms':>9} {'rows/s':>9}")
+    try:
+        for rows_per_table in (5, 25, 100):
+            body = sample_resume(rows_per_table)
+            child_rows = rows_per_table * len(model.RESUME_CHILD_INSERTS)
+            for label, limit in (('per-row', 1), ('batched', batch_limit)):
+                model.MAX_ROWS_PER_STATEMENT = limit
+                connection = FakeConnection(make_write_responder(), latency=0.001)
+                Config.get_db_connection = staticmethod(lambda: connection)
+                start = time.perf_counter()
+                response = client.post('/api/resume', json=body)
+                elapsed = time.perf_counter() - start
+                assert response.status_code == 201, response.get_json()
+                print(f"{label:>8} {child_rows:>6} {len(connection.queries):>11} "
+                      f"{elapsed * 1000:>9.1f} {child_rows / elapsed:>9.0f}")
+    finally:
+        model.MAX_ROWS_PER_STATEMENT = batch_limit
+        Config.get_db_connection = original
+
+
+def bench_skill_matching():
+    """SkillIndex.top_k: one job against 1M synthetic resumes (target: well under 1 s)"""
+    import numpy as np
+    from matching import SkillIndex
+
+    rng = np.random.default_rng(7)
+    resume_count, skills_per_resume, vocabulary = 1000000, 10, 5000
+    # Zipf-like popularity so a few skills (python, sql...) are very common
+    popularity = 1.0 / np.arange(1, vocabulary + 1)
+    popularity /= popularity.sum()
+    entities = np.repeat(np.arange(1, resume_count + 1), skills_per_resume)
+    skills = rng.choice(vocabulary, size=entities.size, p=popularity)
+
+    index = SkillIndex()
+    start = time.perf_counter()
+    index.rebuild(entities, skills)
+    print(f"build: {time.perf_counter() - start:.1f}s, {index.matrix.n_rows} resumes, "
+          f"{index.matrix.indices.size} skill links")
+
+    print(f"{'job skills':<28} {'ms':>8} {'top score':>10}")
+    for query in ([0, 1, 2], [0, 5, 40, 300, 2000], list(range(0, 400, 20)), [4999]):
+        start = time.perf_counter()
+        hits = index.top_k(query, 20)
+        elapsed = time.perf_counter() - start
+        label = ','.join(map(str, query[:5])) + ('...' if len(query) > 5 else '')
+        print(f"{label:<28} {elapsed * 1000:>8.1f} {hits[0][1] if hits else 0:>10.3f}")
+
+    for n in range(500):
+        index.set(resume_count + n, rng.choice(vocabulary, size=skills_per_resume, p=popularity))
+    start = time.perf_counter()
+    index.top_k([0, 5, 40, 300, 2000], 20)
+    print(f"with 500 pending writes: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def bench_counters():
+    """Visitor/download increments from 8 threads: hits/sec and flush statements"""
+    import threading
+    from counters import CounterAggregator
+
+    counts = {}
+
+    def responder(sql, params):
+        if 'FROM Resumes r' in sql:  # batched per-resume UPDATE ... OUTPUT
+            rows = []
+            for i in range(0, len(params), 2):
+                counts[params[i]] = counts.get(params[i], 0) + params[i + 1]
+                rows.append((params[i], counts[params[i]]))
+            return rows
+        if 'UPDATE Resumes' in sql:  # most recent resume
+            counts[0] = counts.get(0, 0) + params[0]
+            return [(0, counts[0])]
+        return []
+
+    connection = FakeConnection(responder, latency=0.001)
+    aggregator = CounterAggregator(lambda: connection, interval=0.5, threshold=10000)
+    threads, hits_per_thread = 8, 25000
+
+    def worker(n):
+        for i in range(hits_per_thread):
+            if i % 4:
+                aggregator.increment('VisitorCount')
+            else:
+                aggregator.increment('DownloadCount', (n * 31 + i) % 500 + 1)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    aggregator.stop()
+
+    total = threads * hits_per_thread
+    assert sum(counts.values()) == total, (sum(counts.values()), total)
+    print(f"{total} hits in {elapsed * 1000:.0f} ms ({total / elapsed:,.0f} hits/s), "
+          f"{len(connection.queries)} statements, {connection.commits} commits "
+          f"(was {total * 2} statements, {total} commits)")
+
+
+def bench_unique_visitors():
+    """HyperLogLog: add throughput, estimate error and merging of worker sketches"""
+    from sketches import HyperLogLog
+
+    print(f"{'precision':>9} {'bytes':>7} {'visitors':>9} {'estimate':>9} {'error':>7} {'adds/s':>9}")
+    for precision in (10, 14):
+        for visitors in (1000, 100000, 1000000):
+            sketch = HyperLogLog(precision)
+            start = time.perf_counter()
+            for n in range(visitors):
+                sketch.add(f'visitor-{n}')
+            elapsed = time.perf_counter() - start
+            estimate = sketch.estimate()
+            print(f"{precision:>9} {sketch.size:>7} {visitors:>9} {estimate:>9} "
+                  f"{(estimate - visitors) / visitors:>7.2%} {visitors / elapsed:>9,.0f}")
+
+    # Two workers with overlapping visitors: the union counts each once
+    first, second = HyperLogLog(14), HyperLogLog(14)
+    for n in range(60000):
+        first.add(f'visitor-{n}')
+    for n in range(40000, 100000):
+        second.add(f'visitor-{n}')
+    print(f"merged 60k + 60k (20k shared): {first.copy().merge(second).estimate()} (true 100000)")
+
+
+def bench_availability():
+    """check-availability over 200k users: DB lookups avoided and false-positive rate"""
+    import random
+    from app import app, availability
+
+    user_count = 200000
+    users = [(f'user{n}', f'user{n}@example.com', f'{9000000000 + n}') for n in range(user_count)]
+    taken = {field: {row[i] for row in users} for i, field in enumerate(('username', 'email', 'phone'))}
+
+    def responder(sql, params):
+        if 'SELECT COUNT(*) FROM users' in sql:
+            return [(user_count,)]
+        if 'FROM users WHERE' in sql:
+            field = sql.split('WHERE ')[1].split(' =')[0]
+            return [(1,)] if params[0] in taken[field] else []
+        if 'FROM users' in sql:
+            return users
+        return []
+
+    connection = FakeConnection(responder)
+    original = Config.get_db_connection
+    Config.get_db_connection = staticmethod(lambda: connection)
+    try:
+        start = time.perf_counter()
+        availability.load(connection.cursor())
+        print(f"load: {time.perf_counter() - start:.1f}s")
+
+        # Typing a new username: mostly unseen prefixes, some taken names
+        random.seed(3)
+        checks = [('username', f'user{random.randrange(user_count)}') if random.random() < 0.1
+                  else ('username', f'newname{n}') for n in range(20000)]
+        client = app.test_client()
+        queries_before = len(connection.queries)
+        start = time.perf_counter()
+        for field, value in checks:
+            client.post('/api/auth/check-availability', json={'field': field, 'value': value})
+        elapsed = time.perf_counter() - start
+    finally:
+        Config.get_db_connection = original
+
+    stats = availability.stats()['username']
+    print(f"{len(checks)} checks in {elapsed * 1000:.0f} ms, "
+          f"{len(connection.queries) - queries_before} DB lookups (was {len(checks)})")
+    print(f"observed FP rate {stats['observed_false_positive_rate']:.4f}, "
+          f"expected {stats['expected_false_positive_rate']:.4f}, "
+          f"{stats['bits'] // 8 // 1024} KB per filter")
+
+
+def bench_register_uniqueness():
+    """
+    register's duplicate check at 1M users: COUNT(CASE ...) scan vs EXISTS seeks
+
+    Runs on an in-memory SQLite copy of the users shape. The plans (full
+    scan vs unique-index seek) carry over to SQL Server, the absolute
+    numbers do not.
+    """
+    import sqlite3
+
+    user_count = 1000000
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, phone TEXT)")
+    start = time.perf_counter()
+    db.executemany("INSERT INTO users (username, email, phone) VALUES (?, ?, ?)",
+                   ((f'user{n}', f'user{n}@example.com', f'{9000000000 + n}')
+                    for n in range(user_count)))
+    print(f"loaded {user_count} users in {time.perf_counter() - start:.1f}s")
+
+    scan_sql = """
+        SELECT COUNT(CASE WHEN username = ? THEN 1 END),
+               COUNT(CASE WHEN email = ? THEN 1 END),
+               COUNT(CASE WHEN phone = ? THEN 1 END)
+        FROM users
+    """
+    exists_sql = """
+        SELECT CASE WHEN EXISTS (SELECT 1 FROM users WHERE username = ?) THEN 1 ELSE 0 END,
+               CASE WHEN EXISTS (SELECT 1 FROM users WHERE email = ?) THEN 1 ELSE 0 END,
+               CASE WHEN EXISTS (SELECT 1 FROM users WHERE phone = ?) THEN 1 ELSE 0 END
+    """
+    probes = [('newuser', 'new@example.com', '8000000000'),
+              ('user500000', 'x@example.com', '8000000001')]
+
+    def timed(sql, runs):
+        begin = time.perf_counter()
+        for _ in range(runs):
+            for probe in probes:
+                db.execute(sql, probe).fetchone()
+        return (time.perf_counter() - begin) / (runs * len(probes)) * 1000
+
+    print(f"COUNT(CASE) scan, no indexes:    {timed(scan_sql, 5):>8.3f} ms per check")
+    for column in ('username', 'email', 'phone'):
+        db.execute(f"CREATE UNIQUE INDEX UX_users_{column} ON users ({column})")
+    print(f"COUNT(CASE) scan, unique indexes: {timed(scan_sql, 5):>8.3f} ms per check")
+    print(f"EXISTS seeks, unique indexes:    {timed(exists_sql, 2000):>8.3f} ms per check")
+    assert db.execute(exists_sql, probes[1]).fetchone() == (1, 0, 0)
+
+    try:
+        db.execute("INSERT INTO users (username, email, phone) VALUES ('user1', 'a@b.c', '1')")
+    except sqlite3.IntegrityError as e:
+        print(f"duplicate INSERT rejected by index: {e}")
+
+
+def bench_password_cost(budget_ms=250, concurrency=16, logins=64):
+    """
+    Login verify latency per KDF cost under concurrent logins
+
+    Reports, per algorithm, the most expensive cost whose p99 stays within
+    `budget_ms` with Config.PASSWORD_HASH_WORKERS hashing processes.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from passwords import PasswordHasher
+
+    candidates = [('scrypt', {'scrypt_n': 2 ** n}) for n in (12, 13, 14, 15)] + \
+                 [('pbkdf2_sha256', {'pbkdf2_iterations': i}) for i in (100000, 300000, 600000)]
+    workers = Config.PASSWORD_HASH_WORKERS
+    print(f"{workers} hashing processes, {concurrency} concurrent logins, budget p99 <= {budget_ms} ms")
+    print(f"{'cost':<28} {'single ms':>10} {'p50 ms':>8} {'p99 ms':>8} {'logins/s':>9}")
+    best = {}
+    for algorithm, cost in candidates:
+        hasher = PasswordHasher(algorithm=algorithm, workers=workers, **cost)
+        stored = hasher.hash('Correct-Horse-9')  # also starts the pool
+        start = time.perf_counter()
+        hasher.verify('Correct-Horse-9', stored)
+        single = time.perf_counter() - start
+
+        def login(_):
+            begin = time.perf_counter()
+            assert hasher.verify('Correct-Horse-9', stored)
+            return time.perf_counter() - begin
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as threads:
+            latencies = sorted(threads.map(login, range(logins)))
+        elapsed = time.perf_counter() - start
+        hasher.close()
+
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        label = f"{algorithm} {list(cost.values())[0]}"
+        print(f"{label:<28} {single * 1000:>10.1f} {p50:>8.1f} {p99:>8.1f} {logins / elapsed:>9.1f}")
+        if p99 <= budget_ms:
+            best[algorithm] = label
+    for algorithm in ('scrypt', 'pbkdf2_sha256'):
+        print(f"highest {algorithm} cost within budget: "
+              f"{best.get(algorithm, 'none - add workers or lower the cost')}")
+
+
+def bench_reference_data():
+    """GET /api/cities over 20k cities: snapshot responses vs one query per request"""
+    from app import app, reference_data
+
+    cities = [(n, f'City {n}', n % 500, f'State {n % 500}', n % 20, f'Country {n % 20}', 1)
+              for n in range(20000)]
+
+    def responder(sql, params):
+        return cities if 'FROM Cities' in sql else []
+
+    connection = FakeConnection(responder, latency=0.002)
+    original = reference_data.connect
+    reference_data.connect = lambda: connection
+    try:
+        client = app.test_client()
+        requests = 500
+        start = time.perf_counter()
+        first = client.get('/api/cities')
+        etag = first.headers['ETag']
+        statuses = {200: 1}
+        for n in range(1, requests):
+            headers = {'If-None-Match': etag} if n % 2 else {}
+            query = f'?state_id={n % 500}' if n % 5 == 0 else ''
+            status = client.get('/api/cities' + query, headers=headers).status_code
+            statuses[status] = statuses.get(status, 0) + 1
+        elapsed = time.perf_counter() - start
+    finally:
+        reference_data.connect = original
+
+    print(f"{requests} GETs in {elapsed * 1000:.0f} ms ({elapsed / requests * 1000:.2f} ms each), "
+          f"{len(connection.queries)} DB queries (was {requests}), statuses {statuses}")
+    print(f"full list {len(first.get_data()) // 1024} KB, served without re-serializing")
+
+
+def bench_autocomplete():
+    """/api/autocomplete/cities over 500k names: latency percentiles and load time"""
+    import random
+    from app import app, autocomplete
+
+    random.seed(5)
+    words = ['new', 'san', 'port', 'saint', 'la', 'north', 'east', 'lake', 'mount', 'fort']
+    cities = [(f'{random.choice(words)} {random.choice(words)}{n}', random.randint(0, 500))
+              for n in range(500000)]
+
+    def responder(sql, params):
+        return cities if 'FROM Cities' in sql else []
+
+    connection = FakeConnection(responder)
+    start = time.perf_counter()
+    autocomplete.load(connection.cursor(), ['cities'])
+    print(f"load: {time.perf_counter() - start:.1f}s for {len(cities)} names")
+
+    client = app.test_client()
+    prefixes = ['', 'n', 'ne', 'new ', 'new n', 'sa', 'x'] + \
+               [name[:random.randint(1, 12)] for name, _ in random.sample(cities, 3000)]
+    direct, endpoint = [], []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        autocomplete.complete('cities', prefix, 10)
+        direct.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        client.get('/api/autocomplete/cities', query_string={'prefix': prefix})
+        endpoint.append(time.perf_counter() - start)
+
+    for label, samples in (('lookup', direct), ('endpoint', endpoint)):
+        samples.sort()
+        print(f"{label}: p50 {samples[len(samples) // 2] * 1000:.3f} ms, "
+              f"p99 {samples[int(len(samples) * 0.99)] * 1000:.3f} ms over {len(samples)} prefixes")
+
+
+def make_master_responder():
+    """Responder keeping master tables in memory and answering the bulk upsert's MERGEs"""
+    import re
+    from cache import MASTER_TABLES, master_key
+
+    tables = {table: {} for table, *_ in MASTER_TABLES.values()}  # key -> output row
+    parents = {table: parent for table, _, _, parent, _ in MASTER_TABLES.values()}
+
+    def responder(sql, params):
+        table = re.search(r'(?:FROM|MERGE) (\w+)', sql).group(1)
+        rows = tables[table]
+        if 'MERGE' not in sql:
+            return [(row[0], row[1], row[2], True) + tuple(row[3:]) for row in rows.values()]
+        width = len(re.search(r'AS s\(([^)]*)\)', sql).group(1).split(','))
+        has_parent = parents[table] is not None
+        output = []
+        for start in range(0, len(params), width):
+            values = params[start:start + width]
+            parent = values[1] if has_parent else None
+            key = master_key(values[0], parent)
+            if key not in rows:
+                extras = values[2 if has_parent else 1:]
+                rows[key] = (len(rows) + 1, values[0], parent) + tuple(v or '' for v in extras)
+                output.append(('INSERT',) + rows[key])
+        return output
+
+    return responder
+
+
+def bench_geo_bulk_upsert():
+    """POST /api/geo/bulk: 150k cities (1 ms RTT), first load then an unchanged re-run"""
+    import csv
+    import io
+    from app import app
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['country', 'country_code', 'state', 'state_code', 'city'])
+    for n in range(150000):
+        country, state = n % 200, n % 4000
+        writer.writerow([f'Country {country}', f'C{country}', f'State {state}', f'S{state}', f'City {n}'])
+    body = out.getvalue().encode()
+
+    client = app.test_client()
+    original = Config.get_db_connection
+    connection = FakeConnection(make_master_responder(), latency=0.001)
+    Config.get_db_connection = staticmethod(lambda: connection)
+    try:
+        for label in ('load', 're-run'):
+            connection.queries.clear()
+            start = time.perf_counter()
+            response = client.post('/api/geo/bulk', data=body, content_type='text/csv')
+            elapsed = time.perf_counter() - start
+            summary = response.get_json()
+            assert response.status_code == 200 and not summary['failed'], summary
+            counts = ', '.join(f"{kind} {c['inserted']}/{c['updated']}/{c['unchanged']}"
+                               for kind, c in summary['counts'].items())
+            print(f"{label:>6}: {summary['rows']} rows in {elapsed:.2f}s, "
+                  f"{len(connection.queries)} statements; inserted/updated/unchanged {counts}")
+    finally:
+        Config.get_db_connection = original
+
+
+def bench_serving_throughput(seconds=5, clients=16):
+    """GET /api/health: app.run(debug=True) vs serve.py (requests/s and p99 over HTTP)"""
+    import http.client
+    import socket
+    import subprocess
+    import threading
+
+    def free_port():
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            return s.getsockname()[1]
+
+    def wait_until_up(port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError(f'server on port {port} did not start')
+
+    def load(port):
+        latencies = []
+        stop = time.monotonic() + seconds
+
+        def client():
+            while time.monotonic() < stop:
+                start = time.perf_counter()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                conn.request('GET', '/api/health')
+                conn.getresponse().read()
+                conn.close()
+                latencies.append(time.perf_counter() - start)
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        latencies.sort()
+        return len(latencies) / seconds, latencies[int(len(latencies) * 0.99)]
+
+    modes = [
+        ('app.run(debug=True)', lambda port: [sys.executable, '-c',
+            f"import app; app.app.run(host='127.0.0.1', port={port}, debug=True, use_reloader=False)"]),
+        ('serve.py 1x8', lambda port: [sys.executable, 'serve.py', '--host', '127.0.0.1',
+                                       '--port', str(port), '--workers', '1', '--threads', '8']),
+        ('serve.py 4x8', lambda port: [sys.executable, 'serve.py', '--host', '127.0.0.1',
+                                       '--port', str(port), '--workers', '4', '--threads', '8']),
+    ]
+    print(f"{clients} concurrent clients, {seconds}s each, {os.cpu_count()} CPUs")
+    for label, command in modes:
+        port = free_port()
+        server = subprocess.Popen(command(port), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_up(port)
+            time.sleep(1)  # let every worker finish warming up
+            rate, p99 = load(port)
+            print(f"{label:>20}: {rate:>7.0f} req/s, p99 {p99 * 1000:>6.1f} ms")
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+
+def bench_json_encoding(repeat=20):
+    """Encoding a 1000-job listing and a 200-resume page: Flask's default provider vs FastJSONProvider"""
+    import serialization
+    from flask.json.provider import DefaultJSONProvider
+    from app import app, job_row_to_dict
+    from model import ResumeBatchLoader
+
+    rows = make_jobs_responder(1000)('SELECT ... FROM Jobs', (1000,))
+    jobs = {'success': True, 'data': [job_row_to_dict(row, [f'Skill{n}' for n in range(5)])
+                                      for row in rows]}
+    connection = FakeConnection(make_resumes_responder(200))
+    cursor = connection.cursor()
+    resume_rows = make_resumes_responder(200)('SELECT ... FROM Resumes', (200,))
+    resumes = {'success': True, 'data': ResumeBatchLoader(cursor).load(resume_rows)}
+
+    backend = 'orjson' if serialization.orjson is not None else 'stdlib'
+    encoders = [
+        ('flask default', DefaultJSONProvider(app).dumps),
+        ('fast, stdlib', serialization._encoder.encode),
+        (f'fast, {backend}', app.json.dumps),
+        ('fast, streamed', lambda obj: b''.join(serialization.iter_json(obj))),
+    ]
+
+    for label, payload in (('jobs', jobs), ('resumes', resumes)):
+        size = len(app.json.dumps(payload).encode())
+        print(f"{label}: {len(payload['data'])} items, {size // 1024} KB")
+        for name, encode in encoders:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                encode(payload)
+            elapsed = (time.perf_counter() - start) / repeat
+            print(f"  {name:>15}: {elapsed * 1000:>7.2f} ms ({size / elapsed / 1e6:>6.0f} MB/s)")
+
+
+BENCHMARKS = {
+    'jobs_query_count': bench_jobs_query_count,
+    'resumes_query_count': bench_resumes_query_count,
+    'search_latency': bench_search_latency,
+    'bulk_import': bench_bulk_import,
+    'resume_write': bench_resume_write,
+    'skill_matching': bench_skill_matching,
+    'counters': bench_counters,
+    'unique_visitors': bench_unique_visitors,
+    'availability': bench_availability,
+    'register_uniqueness': bench_register_uniqueness,
+    'password_cost': bench_password_cost,
+    'reference_data': bench_reference_data,
+    'autocomplete': bench_autocomplete,
+    'geo_bulk_upsert': bench_geo_bulk_upsert,
+    'serving_throughput': bench_serving_throughput,
+    'json_encoding': bench_json_encoding,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print("\n" + "=" * 50)
+        print(f"Benchmark: {name}")
+        print("=" * 50)
+        BENCHMARKS[name]()
@@ -0,0 +1,538 @@
+"""
+Bulk Import
+-----------
+Streaming JSONL/CSV parsing and chunked, set-based inserts for large uploads
+"""
+
+import csv
+import io
+import json
+
+from cache import MASTER_TABLES, MasterDataResolver, master_key
+
+JOB_REQUIRED_FIELDS = ('job_title', 'company_name', 'job_description',
+                       'experience_required', 'package')
+
+# Master name columns on a job record, resolved before the job insert
+JOB_MASTER_FIELDS = {
+    'sector': 'sectors',
+    'course': 'courses',
+    'job_type': 'job_types',
+    'country': 'countries',
+}
+
+
+# ==========================================
+# STREAMING PARSERS
+# ==========================================
+
+def detect_format(content_type, explicit=None):
+    """'csv' or 'jsonl' from ?format= or the request Content-Type"""
+    if explicit:
+        return explicit.lower()
+    if content_type and 'csv' in content_type.lower():
+        return 'csv'
+    return 'jsonl'
+
+
+def iter_records(stream, fmt):
+    """
+    Yield (row number, record dict or None, error message or None)
+
+    Reads the upload line by line so memory stays flat however large it is.
+    Blank JSONL lines are skipped; malformed ones are reported, not fatal.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            yield row_number, {k.strip(): (v.strip() if isinstance(v, str) else v)
+                               for k, v in row.items() if k}, None
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield row_number, None, 'Each line must be a JSON object'
+            continue
+        yield row_number, record, None
+
+
+def iter_chunks(records, size):
+    """Group an iterator into lists of at most `size` items"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def split_skills(value):
+    """Skills as a list from JSON arrays or 'a;b|c' CSV cells"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [s.strip() for s in str(value).replace('|', ';').split(';') if s.strip()]
+
+
+def validate_job(record):
+    """Error message for a job record, or None if it can be imported"""
+    missing = [f for f in JOB_REQUIRED_FIELDS if not str(record.get(f) or '').strip()]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+    return None
+
+
+# ==========================================
+# JOB IMPORT
+# ==========================================
+
+class JobBulkImporter:
+    """
+    Imports job postings in chunked transactions
+
+    Per chunk: master names are resolved in batch, the jobs are staged into
+    a #JobImport temp table with fast_executemany, moved into Jobs with one
+    MERGE that OUTPUTs the new JobID per staged row, and the JobSkills links
+    are written with fast_executemany. A chunk that fails is rolled back and
+    its rows reported as failed; later chunks still run.
+    """
+
+    def __init__(self, conn, master_cache, user_id, chunk_size=500, normalize_skills=None):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.cursor.fast_executemany = True
+        self.master_cache = master_cache
+        self.chunk_size = chunk_size
+        self.user_id = user_id  # Poster of every imported job
+        self.normalize_skills = normalize_skills  # skills_required -> cleaned list
+        self.created = []  # (job_id, record) for index/cache updates
+        self.master_kinds = set()  # master tables that gained rows
+
+    def run(self, records):
+        """
+        Import an iterator of (row number, record, parse error)
+
+        Returns:
+            list: Per-row result dicts in input order
+        """
+        results = []
+        self._create_staging()
+        try:
+            for chunk in iter_chunks(records, self.chunk_size):
+                valid = []
+                for row_number, record, error in chunk:
+                    error = error or validate_job(record)
+                    if not error and self.normalize_skills:
+                        record['skills_required'] = self.normalize_skills(record.get('skills_required'))
+                    if error:
+                        results.append({'row': row_number, 'success': False, 'message': error})
+                    else:
+                        valid.append((row_number, record))
+                if valid:
+                    results.extend(self._import_chunk(valid))
+        finally:
+            self.cursor.execute("DROP TABLE IF EXISTS #JobImport")
+            self.conn.commit()
+        results.sort(key=lambda r: r['row'])
+        return results
+
+    def _create_staging(self):
+        self.cursor.execute("DROP TABLE IF EXISTS #JobImport")
+        self.cursor.execute("""
+            CREATE TABLE #JobImport (
+                RowNum INT PRIMARY KEY,
+                JobTitle NVARCHAR(255),
+                CompanyID INT,
+                JobDescription NVARCHAR(MAX),
+                SectorID INT,
+                CourseID INT,
+                CountryID INT,
+                StateID INT,
+                CityID INT,
+                JobTypeID INT,
+                ExperienceRequired NVARCHAR(100),
+                Package NVARCHAR(100),
+                PostedByUserID INT
+            )
+        """)
+        self.conn.commit()
+
+    def _import_chunk(self, rows):
+        resolver = MasterDataResolver(self.master_cache, self.cursor)
+        try:
+            job_ids = self._insert_chunk(resolver, rows)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            message = f'Chunk failed: {e}'
+            return [{'row': row_number, 'success': False, 'message': message}
+                    for row_number, _ in rows]
+
+        self.master_kinds |= resolver.publish()
+        results = []
+        for row_number, record in rows:
+            job_id = int(job_ids[row_number])
+            self.created.append((job_id, record))
+            results.append({'row': row_number, 'success': True, 'job_id': job_id})
+        return results
+
+    def _insert_chunk(self, resolver, rows):
+        records = [record for _, record in rows]
+
+        # Batch-resolve master names (parents first: country -> state -> city)
+        ids = {kind: resolver.resolve_many(kind, [(r.get(field), None) for r in records])
+               for field, kind in [('company_name', 'companies')] + list(JOB_MASTER_FIELDS.items())}
+        country_of = [ids['countries'].get(_key(r.get('country'))) for r in records]
+        states = resolver.resolve_many(
+            'states', [(r.get('state'), c) for r, c in zip(records, country_of) if c])
+        state_of = [states.get(_key(r.get('state'), c)) if c else None
+                    for r, c in zip(records, country_of)]
+        cities = resolver.resolve_many(
+            'cities', [(r.get('city'), s) for r, s in zip(records, state_of) if s])
+        skills = resolver.resolve_many(
+            'skills', [(name, None) for r in records for name in split_skills(r.get('skills_required'))])
+
+        staged = []
+        for (row_number, record), country_id, state_id in zip(rows, country_of, state_of):
+            staged.append((
+                row_number,
+                record['job_title'],
+                ids['companies'].get(_key(record.get('company_name'))),
+                record['job_description'],
+                ids['sectors'].get(_key(record.get('sector'))),
+                ids['courses'].get(_key(record.get('course'))),
+                country_id,
+                state_id,
+                cities.get(_key(record.get('city'), state_id)) if state_id else None,
+                ids['job_types'].get(_key(record.get('job_type'))),
+                record['experience_required'],
+                record['package'],
+                self.user_id
+            ))
+
+        self.cursor.execute("TRUNCATE TABLE #JobImport")
+        self.cursor.executemany("""
+            INSERT INTO #JobImport (
+                RowNum, JobTitle, CompanyID, JobDescription, SectorID, CourseID,
+                CountryID, StateID, CityID, JobTypeID, ExperienceRequired,
+                Package, PostedByUserID
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, staged)
+
+        # MERGE (unlike INSERT ... SELECT) can OUTPUT source columns,
+        # which maps every staged row to its new JobID
+        self.cursor.execute("""
+            MERGE INTO Jobs AS t
+            USING #JobImport AS s ON 1 = 0
+            WHEN NOT MATCHED THEN INSERT (
+                JobTitle, CompanyID, JobDescription, SectorID, CourseID,
+                CountryID, StateID, CityID, JobTypeID, ExperienceRequired,
+                Package, PostedByUserID, IsActive, CreatedAt
+            )
+            VALUES (
+                s.JobTitle, s.CompanyID, s.JobDescription, s.SectorID, s.CourseID,
+                s.CountryID, s.StateID, s.CityID, s.JobTypeID, s.ExperienceRequired,
+                s.Package, s.PostedByUserID, 1, GETDATE()
+            )
+            OUTPUT s.RowNum, INSERTED.JobID;
+        """)
+        job_ids = {row_number: job_id for row_number, job_id in self.cursor.fetchall()}
+
+        links = []
+        for row_number, record in rows:
+            seen = set()
+            for name in split_skills(record.get('skills_required')):
+                skill_id = skills.get(_key(name))
+                if skill_id is not None and skill_id not in seen:
+                    seen.add(skill_id)
+                    links.append((job_ids[row_number], skill_id))
+        if links:
+            self.cursor.executemany(
+                "INSERT INTO JobSkills (JobID, SkillID, CreatedAt) VALUES (?, ?, GETDATE())",
+                links
+            )
+        return job_ids
+
+
+# ==========================================
+# MASTER DATA UPSERT
+# ==========================================
+
+class UpsertLevel:
+    """
+    One master table in a bulk upsert
+
+    Args:
+        kind: MASTER_TABLES key
+        field: Record field holding the name
+        extras: (record field, column) pairs written alongside the name;
+                a blank value leaves the stored one alone
+    """
+
+    def __init__(self, kind, field, extras=()):
+        self.kind = kind
+        self.field = field
+        self.extras = list(extras)
+        self.table, self.id_column, self.name_column, self.parent_column, _ = MASTER_TABLES[kind]
+
+
+# Parents first: each level's rows hang off the IDs resolved for the level above
+GEO_LEVELS = [
+    UpsertLevel('countries', 'country', [('country_code', 'CountryCode')]),
+    UpsertLevel('states', 'state', [('state_code', 'StateCode')]),
+    UpsertLevel('cities', 'city'),
+]
+
+COURSE_LEVELS = [
+    UpsertLevel('courses', 'course', [('course_type', 'CourseType'), ('description', 'Description')]),
+]
+
+
+class MasterBulkUpserter:
+    """
+    Inserts or updates master rows (and their parents) from a large upload
+
+    Existing rows are loaded once, so parents resolve in memory and rows
+    that would not change never reach the database. The rest are written
+    per chunk with one MERGE per level and at most 1000 rows per statement,
+    in one transaction per chunk. A row counts as updated when it was
+    inactive or a supplied code/description differs; it is reactivated.
+    """
+
+    MAX_ERRORS = 100  # Row errors returned in the response
+
+    def __init__(self, conn, levels, chunk_size=5000):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.levels = levels
+        self.chunk_size = chunk_size
+        self._known = {}  # kind -> {master_key: (ID, extras tuple, is active)}
+        self._seen = {level.kind: set() for level in levels}  # keys already counted
+        self.counts = {level.kind: {'inserted': 0, 'updated': 0, 'unchanged': 0}
+                       for level in levels}
+        self.rows = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, records):
+        """
+        Upsert an iterator of (row number, record, parse error)
+
+        Returns:
+            dict: Per-kind inserted/updated/unchanged counts, failed rows and
+                  the first MAX_ERRORS row errors
+        """
+        for level in self.levels:
+            self._load(level)
+        for chunk in iter_chunks(records, self.chunk_size):
+            rows = []
+            for row_number, record, error in chunk:
+                self.rows += 1
+                if error:
+                    self._fail(row_number, error)
+                else:
+                    rows.append((row_number, record))
+            if rows:
+                self._upsert_chunk(rows)
+        return {'rows': self.rows, 'failed': self.failed, 'counts': self.counts,
+                'errors': self.errors}
+
+    def changed_kinds(self):
+        return {kind for kind, c in self.counts.items() if c['inserted'] or c['updated']}
+
+    def _fail(self, row_number, message):
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({'row': row_number, 'message': message})
+
+    def _load(self, level):
+        parent = f", {level.parent_column}" if level.parent_column else ", NULL"
+        extras = ''.join(f", {column}" for _, column in level.extras)
+        self.cursor.execute(f"""
+            SELECT {level.id_column}, {level.name_column}{parent}, IsActive{extras}
+            FROM {level.table}
+            ORDER BY IsActive DESC, {level.id_column}
+        """)
+        known = {}
+        for row in self.cursor.fetchall():
+            if row[1] is not None:
+                known.setdefault(master_key(row[1], row[2]), (row[0], tuple(row[4:]), bool(row[3])))
+        self._known[level.kind] = known
+
+    def _upsert_chunk(self, rows):
+        parents = [None] * len(rows)  # ID each row resolved at the previous level
+        failed = [None] * len(rows)   # error message per row
+        stopped = [False] * len(rows)  # row ends above this level (a country-only row)
+        learned = {}  # kind -> {key: known entry}, applied after commit
+        touched = {}  # kind -> keys in this chunk
+        counts = {level.kind: {'inserted': 0, 'updated': 0, 'unchanged': 0} for level in self.levels}
+        try:
+            for depth, level in enumerate(self.levels):
+                known = self._known[level.kind]
+                fields = [field for field, _ in level.extras]
+                source = {}    # key -> [name, parent ID, extras, raw extras last merged]
+                resolved = {}  # (name, parent ID) -> key; parents repeat on most rows
+                keys = [None] * len(rows)
+                for i, (row_number, record) in enumerate(rows):
+                    if failed[i] or stopped[i]:
+                        continue
+                    name = str(record.get(level.field) or '').strip()
+                    if not name:
+                        deeper = [lvl.field for lvl in self.levels[depth + 1:] if record.get(lvl.field)]
+                        if depth == 0:
+                            failed[i] = f'{level.field} is required'
+                        elif deeper:
+                            failed[i] = f'{deeper[0]} given without {level.field}'
+                        stopped[i] = True
+                        continue
+                    key = resolved.get((name, parents[i]))
+                    if key is None:
+                        key = resolved[(name, parents[i])] = master_key(name, parents[i])
+                        if key not in source:
+                            source[key] = [name, parents[i], [None] * len(fields), None]
+                    if fields:
+                        entry = source[key]
+                        raw = tuple(record.get(field) for field in fields)
+                        if raw != entry[3]:
+                            # Later rows fill in or override codes; blanks keep the earlier value
+                            entry[2] = [old if new is None else new
+                                        for new, old in zip(map(_blank_to_none, raw), entry[2])]
+                            entry[3] = raw
+                    keys[i] = key
+
+                ids = {}
+                send = []
+                for key, (name, parent_id, extras, _) in source.items():
+                    current = known.get(key)
+                    if current is not None and current[2] and all(
+                            new is None or _same(new, old) for new, old in zip(extras, current[1])):
+                        ids[key] = current[0]
+                    else:
+                        send.append(key)
+                written = self._merge(level, source, send, ids, counts[level.kind],
+                                      learned.setdefault(level.kind, {}))
+                # A parent repeated across chunks is counted once
+                seen = self._seen[level.kind]
+                counts[level.kind]['unchanged'] += sum(
+                    1 for key in source if key not in written and key not in seen)
+                touched[level.kind] = source.keys()
+                parents = [ids.get(key) if key is not None else None for key in keys]
+                for i in range(len(rows)):
+                    if keys[i] is not None and parents[i] is None and not failed[i]:
+                        failed[i] = f'{level.field} could not be resolved'
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            for row_number, _ in rows:
+                self._fail(row_number, f'Chunk failed: {e}')
+            return
+
+        for kind, entries in learned.items():
+            self._known[kind].update(entries)
+        for kind, keys in touched.items():
+            self._seen[kind].update(keys)
+        for kind, c in counts.items():
+            for action, n in c.items():
+                self.counts[kind][action] += n
+        for (row_number, _), error in zip(rows, failed):
+            if error:
+                self._fail(row_number, error)
+
+    def _merge(self, level, source, keys, ids, counts, learned):
+        """
+        MERGE the given source rows, filling `ids` and `learned` from OUTPUT
+
+        Returns:
+            set: Keys of the rows inserted or updated
+        """
+        written = set()
+        if not keys:
+            return written
+        columns = [level.name_column] + ([level.parent_column] if level.parent_column else []) + \
+                  [column for _, column in level.extras]
+        per_statement = min(1000, 2000 // len(columns))
+        on = f"t.{level.name_column} = s.{level.name_column}"
+        if level.parent_column:
+            on += f" AND t.{level.parent_column} = s.{level.parent_column}"
+        differs = ''.join(f" OR (s.{c} IS NOT NULL AND ISNULL(t.{c}, '') <> s.{c})"
+                          for _, c in level.extras)
+        updates = ''.join(f", t.{c} = ISNULL(s.{c}, t.{c})" for _, c in level.extras)
+        extra_columns = {c for _, c in level.extras}
+        inserted = ', '.join(f"ISNULL(s.{c}, '')" if c in extra_columns else f"s.{c}" for c in columns)
+        parent_out = f"INSERTED.{level.parent_column}" if level.parent_column else "NULL"
+        extras_out = ''.join(f", INSERTED.{c}" for _, c in level.extras)
+
+        for start in range(0, len(keys), per_statement):
+            chunk = keys[start:start + per_statement]
+            params = []
+            for key in chunk:
+                name, parent_id, extras, _ = source[key]
+                params.extend([name] + ([parent_id] if level.parent_column else []) + extras)
+            self.cursor.execute(f"""
+                MERGE {level.table} WITH (HOLDLOCK) AS t
+                USING (VALUES {', '.join('(' + ', '.join('?' for _ in columns) + ')' for _ in chunk)})
+                    AS s({', '.join(columns)})
+                ON {on}
+                WHEN MATCHED AND (t.IsActive = 0{differs}) THEN
+                    UPDATE SET t.IsActive = 1{updates}, t.UpdatedDate = GETDATE()
+                WHEN NOT MATCHED THEN
+                    INSERT ({', '.join(columns)}, IsActive, CreatedAt)
+                    VALUES ({inserted}, 1, GETDATE())
+                OUTPUT $action, INSERTED.{level.id_column}, INSERTED.{level.name_column}, {parent_out}{extras_out};
+            """, params)
+            for row in self.cursor.fetchall():
+                action, row_id, name, parent_id = row[:4]
+                key = master_key(name, parent_id)
+                ids[key] = row_id
+                learned[key] = (row_id, tuple(row[4:]), True)
+                written.add(key)
+                counts['inserted' if action == 'INSERT' else 'updated'] += 1
+
+        # Matched but already up to date (another writer got there first)
+        missing = [key for key in keys if key not in ids]
+        for start in range(0, len(missing), 1000):
+            names = list({source[key][0] for key in missing[start:start + 1000]})
+            parent = f", {level.parent_column}" if level.parent_column else ", NULL"
+            extras = ''.join(f", {c}" for _, c in level.extras)
+            self.cursor.execute(f"""
+                SELECT {level.id_column}, {level.name_column}{parent}{extras}
+                FROM {level.table}
+                WHERE IsActive = 1 AND {level.name_column} IN ({', '.join('?' for _ in names)})
+            """, names)
+            for row in self.cursor.fetchall():
+                key = master_key(row[1], row[2])
+                if key in source and key not in ids:
+                    ids[key] = row[0]
+                    learned[key] = (row[0], tuple(row[3:]), True)
+        return written
+
+
+def _blank_to_none(value):
+    if value is None or not str(value).strip():
+        return None
+    return str(value).strip()
+
+
+def _same(a, b):
+    """Equal under SQL Server's default comparison (case-insensitive, trailing spaces ignored)"""
+    return str(a or '').rstrip().lower() == str(b or '').rstrip().lower()
+
+
+def _key(name, parent=None):
+    """master_key for a record value, None for blanks (which never resolve)"""
+    if name is None or not str(name).strip():
+        return None
+    return master_key(str(name).strip(), parent)
@@ -0,0 +1,358 @@
+"""
+In-Memory Caches
+----------------
+Process-local caches for read-heavy API responses and master-data lookups
+
+Response caches follow a shared data version, so a write made by another
+worker process invalidates them too.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, request
+
+
+class ResponseCache:
+    """
+    Versioned LRU cache of serialized responses
+
+    Every entry is tagged with the data version that was current when the
+    request started. Writers call bump_version(), after which older entries
+    are never served again - they are dropped on their next lookup or pushed
+    out by LRU. Entries also expire after `ttl` seconds, and the cache keeps
+    under both `max_entries` and `max_bytes`.
+
+    With `versions` (a versions.DataVersions), bump_version() also bumps the
+    shared `dataset` version, another process's bump invalidates this cache,
+    and nothing is served while the shared versions cannot be read.
+    """
+
+    def __init__(self, ttl=30, max_entries=1000, max_bytes=32 * 1024 * 1024,
+                 versions=None, dataset=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (version, expires_at, body, status)
+        self._bytes = 0
+        self._version = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'expired': 0,
+                       'evictions': 0, 'stores': 0, 'unsynced': 0}
+        self.versions = versions
+        self.dataset = dataset
+        if versions is not None:
+            versions.on_change(dataset, lambda: self.bump_version(shared=False))
+
+    @property
+    def version(self):
+        return self._version
+
+    def bump_version(self, shared=True):
+        """Invalidate everything cached so far; call after every data write (once committed)"""
+        with self._lock:
+            self._version += 1
+            version = self._version
+        if shared and self.versions is not None:
+            self.versions.bump(self.dataset)
+        return version
+
+    def get(self, key):
+        """Returns (body, status) or None"""
+        now = time.monotonic()
+        if self.versions is not None and not self.versions.synced:
+            with self._lock:
+                self._stats['unsynced'] += 1
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            version, expires_at, body, status = entry
+            if version != self._version or expires_at <= now:
+                self._stats['stale' if version != self._version else 'expired'] += 1
+                self._stats['misses'] += 1
+                self._drop_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return body, status
+
+    def put(self, key, body, status, version):
+        """Store a body computed from data at `version` (skipped if already stale)"""
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                return
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = (version, time.monotonic() + self.ttl, body, status)
+            self._bytes += size
+            self._stats['stores'] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop_locked(oldest)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            lookups = snapshot['hits'] + snapshot['misses']
+            snapshot.update({
+                'version': self._version,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hit_rate': round(snapshot['hits'] / lookups, 4) if lookups else 0.0,
+            })
+        return snapshot
+
+    def _drop_locked(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry[2])
+
+
+def request_cache_key():
+    """Normalized key for the current request: path plus sorted query args"""
+    args = sorted((name, value) for name, values in request.args.lists() for value in values)
+    return request.path + '?' + '&'.join(f'{name}={value}' for name, value in args)
+
+
+def cached_response(cache):
+    """
+    Decorator serving a GET view from `cache`
+
+    Only 200 responses are stored. The data version is read before the view
+    runs, so a write that lands mid-request leaves the result uncached.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request_cache_key()
+            hit = cache.get(key)
+            if hit is not None:
+                body, status = hit
+                response = Response(body, status=status, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            version = cache.version
+            response = view(*args, **kwargs)
+            if isinstance(response, tuple):
+                return response
+            if response.status_code == 200:
+                cache.put(key, response.get_data(), response.status_code, version)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+# kind -> (table, id column, name column, parent column, has IsActive)
+MASTER_TABLES = {
+    'companies': ('Companies', 'CompanyID', 'CompanyName', None, False),
+    'sectors': ('Sectors', 'SectorID', 'SectorName', None, True),
+    'courses': ('Courses', 'CourseID', 'CourseName', None, True),
+    'countries': ('Countries', 'CountryID', 'CountryName', None, True),
+    'states': ('States', 'StateID', 'StateName', 'CountryID', True),
+    'cities': ('Cities', 'CityID', 'CityName', 'StateID', True),
+    'job_types': ('JobTypes', 'JobTypeID', 'JobTypeName', None, True),
+    'skills': ('JobSkillsMaster', 'SkillID', 'SkillName', None, True),
+}
+
+
+def master_key(name, parent=None):
+    """
+    Cache key for a master name
+
+    Mirrors SQL Server's default case-insensitive comparison, which also
+    ignores trailing spaces.
+    """
+    return (name.rstrip().lower(), parent)
+
+
+class MasterDataCache:
+    """
+    Process-wide name -> ID map for the reference tables create_job links to
+
+    Each table is loaded whole on first use (or by warm()) and reloaded after
+    `ttl` seconds or invalidate(kind). Lookups match inactive rows too, like
+    the SELECT ... WHERE Name = ? probes they replace.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._maps = {}       # kind -> {master_key: id}
+        self._loaded_at = {}  # kind -> monotonic time
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'loads': 0, 'invalidations': 0}
+
+    def warm(self, cursor, kinds=None):
+        """Load every (or the given) master table"""
+        for kind in kinds or MASTER_TABLES:
+            self._load(cursor, kind)
+
+    def lookup(self, cursor, kind, name, parent=None):
+        """ID for `name` from the cache, loading the table if needed; None if unknown"""
+        with self._lock:
+            loaded_at = self._loaded_at.get(kind)
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self._load(cursor, kind)
+        with self._lock:
+            found = self._maps.get(kind, {}).get(master_key(name, parent))
+            self._stats['hits' if found is not None else 'misses'] += 1
+            return found
+
+    def put(self, kind, name, row_id, parent=None):
+        with self._lock:
+            if kind in self._maps:
+                self._maps[kind][master_key(name, parent)] = row_id
+
+    def invalidate(self, kind):
+        """Forget a table; call after any write to it outside create_job"""
+        with self._lock:
+            self._maps.pop(kind, None)
+            self._loaded_at.pop(kind, None)
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['entries'] = {kind: len(m) for kind, m in self._maps.items()}
+        return snapshot
+
+    def _load(self, cursor, kind):
+        table, id_column, name_column, parent_column, has_is_active = MASTER_TABLES[kind]
+        parent_select = f", {parent_column}" if parent_column else ", NULL"
+        # Active rows first, so a name shared with a merged-away row maps to the live one
+        order = f" ORDER BY IsActive DESC, {id_column}" if has_is_active else ""
+        cursor.execute(f"SELECT {id_column}, {name_column}{parent_select} FROM {table}{order}")
+        mapping = {}
+        for row_id, name, parent in cursor.fetchall():
+            if name is not None:
+                # First row wins, matching fetchone() on the old probe
+                mapping.setdefault(master_key(name, parent), row_id)
+        with self._lock:
+            self._maps[kind] = mapping
+            self._loaded_at[kind] = time.monotonic()
+            self._stats['loads'] += 1
+
+
+class MasterDataResolver:
+    """
+    Get-or-create of master rows inside the caller's transaction
+
+    New rows are inserted with OUTPUT INSERTED but not committed; call
+    publish() after the caller commits so a rolled-back ID never reaches
+    the shared cache.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, cache, cursor):
+        self.cache = cache
+        self.cursor = cursor
+        self._created = {}  # (kind, master_key) -> (name, id, parent)
+
+    def resolve(self, kind, name, parent=None):
+        """ID for `name`, inserting the master row if it does not exist; None for blank names"""
+        if not name or not str(name).strip():
+            return None
+        name = str(name).strip()
+        return self.resolve_many(kind, [(name, parent)])[master_key(name, parent)]
+
+    def resolve_many(self, kind, pairs):
+        """
+        Batch get-or-create for (name, parent) pairs; blank names are skipped
+
+        Names missing from the cache are re-checked with one SELECT and then
+        inserted with one multi-row INSERT per BATCH_SIZE names.
+
+        Returns:
+            dict: master_key(name, parent) -> ID
+        """
+        wanted = {}
+        for name, parent in pairs:
+            if name and str(name).strip():
+                name = str(name).strip()
+                wanted.setdefault(master_key(name, parent), (name, parent))
+
+        found = {}
+        missing = []
+        for key, (name, parent) in wanted.items():
+            created = self._created.get((kind, key))
+            row_id = created[1] if created else self.cache.lookup(self.cursor, kind, name, parent)
+            if row_id is None:
+                missing.append(key)
+            else:
+                found[key] = row_id
+        if not missing:
+            return found
+
+        table, id_column, name_column, parent_column, has_is_active = MASTER_TABLES[kind]
+        parent_select = f", {parent_column}" if parent_column else ", NULL"
+
+        # Another worker may have added some since our cache was loaded
+        for batch in _batches(missing, self.BATCH_SIZE):
+            names = [wanted[key][0] for key in batch]
+            self.cursor.execute(
+                f"SELECT {id_column}, {name_column}{parent_select} FROM {table} "
+                f"WHERE {name_column} IN ({', '.join('?' for _ in names)})", names)
+            for row_id, name, parent in self.cursor.fetchall():
+                key = master_key(name, parent)
+                if key in wanted and key not in found:
+                    found[key] = row_id
+                    self.cache.put(kind, name, row_id, parent)
+
+        columns = [name_column] + ([parent_column] if parent_column else [])
+        if has_is_active:
+            columns.append('IsActive')
+        row_sql = '(?' + (', ?' if parent_column else '') + (', 1' if has_is_active else '') + ', GETDATE())'
+        output = f"INSERTED.{id_column}, INSERTED.{name_column}" + \
+                 (f", INSERTED.{parent_column}" if parent_column else ", NULL")
+
+        for batch in _batches([key for key in missing if key not in found], self.BATCH_SIZE):
+            params = []
+            for key in batch:
+                name, parent = wanted[key]
+                params.extend([name, parent] if parent_column else [name])
+            self.cursor.execute(f"""
+                INSERT INTO {table} ({', '.join(columns)}, CreatedAt)
+                OUTPUT {output}
+                VALUES {', '.join(row_sql for _ in batch)}
+            """, params)
+            for row_id, name, parent in self.cursor.fetchall():
+                key = master_key(name, parent)
+                found[key] = row_id
+                self._created[(kind, key)] = (name, row_id, parent)
+        return found
+
+    def publish(self):
+        """
+        Share rows created by this resolver once their transaction committed
+
+        Returns:
+            set: Kinds that gained rows
+        """
+        kinds = set()
+        for (kind, _), (name, row_id, parent) in self._created.items():
+            self.cache.put(kind, name, row_id, parent)
+            kinds.add(kind)
+        self._created = {}
+        return kinds
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -3,8 +3,250 @@ Database Configuration - Complete Version
 ----------------------------
 Manages database connection using Windows Authentication
 """
+import os
+import threading
+import time
+from collections import deque
+
 import pyodbc
 
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+
+
+class PooledConnection:
+    """
+    Lease on a pooled pyodbc connection
+
+    Behaves like the underlying connection; close() hands the connection
+    back to the pool instead of tearing down the ODBC session.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self):
+        return self._raw.cursor()
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        """Return the connection to the pool (safe to call twice)"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            try:
+                self._raw.rollback()
+            except pyodbc.Error:
+                pass
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections
+
+    Idle connections are kept LIFO so hot connections get reused and cold
+    ones age out. A connection idle longer than probe_after is checked with
+    SELECT 1 before being handed out; one idle longer than max_idle is
+    closed instead of reused.
+    """
+
+    def __init__(self, connect, max_size=10, max_idle=300, probe_after=30, timeout=10):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.probe_after = probe_after
+        self.timeout = timeout
+
+        self._idle = deque()  # (raw connection, last returned at)
+        self._open = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {
+            'created': 0,
+            'reused': 0,
+            'evicted': 0,
+            'probe_failures': 0,
+            'discarded': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+
+    # ---------- lease / return ----------
+
+    def acquire(self):
+        """Lease a connection, waiting up to self.timeout if the pool is full"""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            raw, idle_for = None, 0.0
+            with self._cond:
+                self._evict_idle_locked()
+                if self._idle:
+                    raw, returned_at = self._idle.pop()
+                    idle_for = time.monotonic() - returned_at
+                elif self._open < self.max_size:
+                    self._open += 1
+                else:
+                    if not waited:
+                        waited = True
+                        self._stats['waits'] += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f'No database connection available after {self.timeout}s '
+                            f'(pool size {self.max_size})'
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            if raw is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self._forget()
+                    raise
+                with self._cond:
+                    self._stats['created'] += 1
+            elif idle_for > self.probe_after and not self._is_alive(raw):
+                with self._cond:
+                    self._stats['probe_failures'] += 1
+                self._discard(raw)
+                continue
+            else:
+                with self._cond:
+                    self._stats['reused'] += 1
+
+            lease = PooledConnection(self, raw)
+            self._leases().append(lease)
+            return lease
+
+    def release(self, lease):
+        """Return a leased connection; uncommitted work is rolled back"""
+        leases = self._leases()
+        if lease in leases:
+            leases.remove(lease)
+        raw = lease._raw
+        try:
+            raw.rollback()
+        except Exception:
+            self._discard(raw)
+            return
+        with self._cond:
+            self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    def prewarm(self, count):
+        """
+        Open connections up front so the first requests do not pay for the handshake
+
+        Returns:
+            int: Idle connections in the pool afterwards
+        """
+        leases = []
+        try:
+            for _ in range(min(count, self.max_size)):
+                leases.append(self.acquire())
+        finally:
+            for lease in leases:
+                lease.close()
+        with self._cond:
+            return len(self._idle)
+
+    def release_thread_leases(self):
+        """Return every connection still leased by the current thread"""
+        for lease in list(self._leases()):
+            lease.close()
+
+    # ---------- maintenance ----------
+
+    def stats(self):
+        """Snapshot of pool counters"""
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                'max_size': self.max_size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+            })
+        return snapshot
+
+    def close_all(self):
+        """Close every idle connection (leased ones are closed on return)"""
+        with self._cond:
+            idle = [raw for raw, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for raw in idle:
+            self._close_quietly(raw)
+
+    # ---------- internals ----------
+
+    def _leases(self):
+        leases = getattr(self._local, 'leases', None)
+        if leases is None:
+            leases = self._local.leases = []
+        return leases
+
+    def _evict_idle_locked(self):
+        # Oldest connections sit at the left end of the deque
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            raw, _ = self._idle.popleft()
+            self._open -= 1
+            self._stats['evicted'] += 1
+            self._close_quietly(raw)
+
+    def _is_alive(self, raw):
+        try:
+            cursor = raw.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, raw):
+        self._close_quietly(raw)
+        with self._cond:
+            self._stats['discarded'] += 1
+        self._forget()
+
+    def _forget(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
 class Config:
     """Configuration class for database connection"""
     
@@ -20,18 +262,142 @@ class Config:
         f'Trusted_Connection=yes;'
     )
     
+    # Connection pool settings
+    POOL_MAX_SIZE = 10            # Hard cap on open connections per process
+    POOL_MAX_IDLE_SECONDS = 300   # Close connections idle longer than this
+    POOL_PROBE_AFTER_SECONDS = 30 # Run SELECT 1 on checkout after this much idle time
+    POOL_TIMEOUT_SECONDS = 10     # How long a request waits for a free connection
+    
+    # Production server (python serve.py); each worker has its own pool, so the
+    # database sees up to SERVER_WORKERS * POOL_MAX_SIZE connections. More than
+    # one worker needs migrations 003 and 004 (see serve.py for what is shared)
+    SERVER_HOST = os.environ.get('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.environ.get('SERVER_PORT', 5000))
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 2))    # Processes (1 on Windows)
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 8))    # Request threads per worker
+    SERVER_DRAIN_SECONDS = 30     # In-flight requests get this long to finish on shutdown/reload
+    
+    # List endpoint page sizes (?limit= is capped at PAGE_SIZE_MAX)
+    PAGE_SIZE_DEFAULT = 50
+    PAGE_SIZE_MAX = 200
+    
+    # Shared data versions (migrations/003_data_versions.sql). 0 reads them on
+    # every request, so no worker serves data another worker has changed;
+    # N saves that round trip at the cost of up to N seconds of staleness
+    DATA_VERSION_CHECK_SECONDS = 0
+    
+    # Job listing response cache
+    JOB_CACHE_TTL_SECONDS = 30
+    JOB_CACHE_MAX_ENTRIES = 1000
+    JOB_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    
+    # Responses with at least this many list items are streamed (GET /api/resumes)
+    JSON_STREAM_MIN_ITEMS = 100
+    
+    # In-memory job search index and skill matcher: rebuilt in the background
+    # when another worker writes jobs/resumes, and after this long regardless
+    # (to pick up edits made outside the API)
+    JOB_INDEX_RELOAD_SECONDS = 600
+    SKILL_MATCHER_RELOAD_SECONDS = 600
+    
+    # Master-data name -> ID cache used by create_job
+    MASTER_CACHE_TTL_SECONDS = 300
+    
+    # Master-table list snapshots; rebuilt after local writes, and after this
+    # long to pick up other workers' writes
+    REFERENCE_TTL_SECONDS = 300
+    
+    # /api/autocomplete/<kind>
+    AUTOCOMPLETE_RELOAD_SECONDS = 300   # Rebuild from the database in the background after this
+    AUTOCOMPLETE_LIMIT_DEFAULT = 10
+    AUTOCOMPLETE_LIMIT_MAX = 50
+    
+    # Rows per transaction for bulk import endpoints
+    BULK_CHUNK_SIZE = 500
+    MASTER_BULK_CHUNK_SIZE = 5000   # /api/geo/bulk and /api/courses/bulk (one MERGE per level per 1000 rows)
+    
+    # Write-behind visitor/download counters
+    COUNTER_SHARDS = 8
+    COUNTER_FLUSH_INTERVAL_SECONDS = 5   # Flush at least this often
+    COUNTER_FLUSH_THRESHOLD = 1000       # ...or as soon as this many hits are pending
+    
+    # Unique-visitor HyperLogLog sketches (error ~1.04 / sqrt(2 ** precision))
+    HLL_GLOBAL_PRECISION = 14    # lifetime and per-day sketches, 16 KB each
+    HLL_RESUME_PRECISION = 10    # per-resume sketches, 1 KB each
+    HLL_MAX_SKETCHES = 10000     # clean sketches kept in memory per process
+    
+    # Bloom filters answering check-availability without the database
+    BLOOM_ERROR_RATE = 0.01          # Target false-positive rate
+    BLOOM_MIN_CAPACITY = 10000       # Users per filter before it counts as full
+    BLOOM_RELOAD_SECONDS = 300       # Rebuild to pick up registrations made outside the API
+    
+    # Password hashing (pick costs with: python benchmark.py password_cost).
+    # The default cost assumes one free core per hashing process and a burst of
+    # 16 simultaneous logins within a 250 ms p99: scrypt 2 ** 14 measured 72 ms
+    # per hash on one core of the benchmark host, so that burst needs about
+    # 16 * 72 / 250 = 5 processes on 5 cores. With fewer cores, lower the cost
+    # (2 ** 12 measured 19 ms); stored hashes move to the new cost at each
+    # user's next login.
+    PASSWORD_HASH_ALGORITHM = 'scrypt'   # 'scrypt' or 'pbkdf2_sha256'
+    PASSWORD_SCRYPT_N = 2 ** 14          # CPU/memory cost; 16 MB per hash at r=8
+    PASSWORD_SCRYPT_R = 8
+    PASSWORD_SCRYPT_P = 1
+    PASSWORD_PBKDF2_ITERATIONS = 600000
+    PASSWORD_HASH_WORKERS = 2            # Hashing processes; 0 hashes in the request thread
+
+    # Signed session tokens issued at login. Set TOKEN_SECRET in the environment;
+    # without it serve.py generates one for its workers and app.py signs with a
+    # random per-process key, and either way tokens stop working after a restart.
+    TOKEN_SECRET = os.environ.get('TOKEN_SECRET')
+    TOKEN_TTL_SECONDS = 8 * 3600
+    TOKEN_CACHE_SIZE = 10000   # Verified tokens remembered per process
+
+    _pool = None
+    _pool_lock = threading.Lock()
+    
+    @staticmethod
+    def get_pool():
+        """Returns the process-wide connection pool, creating it on first use"""
+        if Config._pool is None:
+            with Config._pool_lock:
+                if Config._pool is None:
+                    Config._pool = ConnectionPool(
+                        Config._connect,
+                        max_size=Config.POOL_MAX_SIZE,
+                        max_idle=Config.POOL_MAX_IDLE_SECONDS,
+                        probe_after=Config.POOL_PROBE_AFTER_SECONDS,
+                        timeout=Config.POOL_TIMEOUT_SECONDS
+                    )
+        return Config._pool
+    
     @staticmethod
     def get_db_connection():
         """
-        Creates and returns a database connection
+        Leases a database connection from the pool
+        
+        Call close() on the result to hand it back to the pool.
         
         Returns:
-            pyodbc.Connection: Active database connection
+            PooledConnection: Active database connection
         """
+        return Config.get_pool().acquire()
+    
+    @staticmethod
+    def release_thread_connections():
+        """Returns any connections the current thread forgot to close"""
+        if Config._pool is not None:
+            Config._pool.release_thread_leases()
+    
+    @staticmethod
+    def pool_stats():
+        """Returns connection pool statistics"""
+        return Config.get_pool().stats()
+    
+    @staticmethod
+    def _connect():
+        """Opens a new raw ODBC connection"""
         try:
-            connection = pyodbc.connect(Config.CONNECTION_STRING)
-            print("✓ Database connected successfully")
-            return connection
+            return pyodbc.connect(Config.CONNECTION_STRING)
         except pyodbc.Error as e:
             print(f"❌ Database connection error: {str(e)}")
             print("\nTroubleshooting tips:")
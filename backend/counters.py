@@ -0,0 +1,309 @@
+"""
+Write-Behind Counters
+---------------------
+Buffers visitor/download increments in memory and flushes them to Resumes
+as atomic `SET x = x + ?` updates, plus per-minute analytics events
+"""
+
+import atexit
+import itertools
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+# Counter columns that may be incremented
+COUNTER_COLUMNS = ('VisitorCount', 'DownloadCount')
+
+# SQL Server accepts at most 1000 rows in one VALUES list
+FLUSH_ROWS_PER_STATEMENT = 1000
+
+
+class CounterShard:
+    """One lock and one pending-delta map; each thread sticks to one shard"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deltas = Counter()  # (column, ResumeID or None, epoch minute) -> delta
+        self.hits = 0
+
+
+class CounterAggregator:
+    """
+    Sharded in-memory counters with a background flusher
+
+    increment() only touches the calling thread's shard, so requests never
+    wait on the database or on each other. Deltas are written every
+    `interval` seconds, or sooner once `threshold` hits are pending, and on
+    interpreter exit. A failed flush puts its deltas back for the next one.
+
+    A ResumeID of None means "the most recently updated resume", resolved
+    at flush time like the old increment_visitor lookup.
+
+    Hits are kept per minute; with an `events` store each flush also
+    appends them as events in the same transaction. A `sketches` tracker
+    is persisted in that transaction too.
+    """
+
+    def __init__(self, connect, shards=8, interval=5.0, threshold=1000, events=None,
+                 sketches=None):
+        self.connect = connect
+        self.events = events
+        self.sketches = sketches
+        self.interval = interval
+        self.threshold = threshold
+        self._shards = [CounterShard() for _ in range(shards)]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._known = {}  # (column, ResumeID or None) -> last count read back
+        self._latest_resume_id = None
+        self._lookup_attempted = False
+        self._stats = {'increments': 0, 'flushes': 0, 'rows_written': 0,
+                       'failures': 0, 'last_flush': None, 'last_error': None}
+
+    # ---------- writers ----------
+
+    def increment(self, column, resume_id=None, amount=1):
+        """Queue `amount` for Resumes.<column>; returns immediately"""
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f'Unknown counter column: {column}')
+        minute = int(time.time() // 60)
+        shard = self._shard()
+        with shard.lock:
+            shard.deltas[(column, resume_id, minute)] += amount
+            shard.hits += 1
+            full = shard.hits * len(self._shards) >= self.threshold
+        if full:
+            self._wake.set()
+        self._ensure_started()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._shards[next(self._next_shard) % len(self._shards)]
+            self._local.shard = shard
+        return shard
+
+    # ---------- readers ----------
+
+    def pending(self, column, resume_id=None):
+        """Delta not yet written for one counter"""
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += sum(d for (c, r, _), d in shard.deltas.items()
+                             if c == column and r == resume_id)
+        return total
+
+    def pending_total(self, column):
+        """Delta not yet written for a column across all resumes"""
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += sum(d for (c, _, _), d in shard.deltas.items() if c == column)
+        return total
+
+    def pending_events(self):
+        """
+        Hits not yet written, per minute
+
+        Returns:
+            list: (column, minute start datetime, count)
+        """
+        per_minute = Counter()
+        for shard in self._shards:
+            with shard.lock:
+                for (column, _, minute), delta in shard.deltas.items():
+                    per_minute[(column, minute)] += delta
+        return [(column, datetime.fromtimestamp(minute * 60), count)
+                for (column, minute), count in per_minute.items()]
+
+    def estimate(self, column, resume_id=None):
+        """
+        Last count read back from the database plus pending increments
+
+        Approximate: a counter that has never been flushed starts from 0.
+        """
+        return self._known.get((column, resume_id), 0) + self.pending(column, resume_id)
+
+    @property
+    def latest_resume_id(self):
+        """ResumeID the last "most recent resume" flush landed on"""
+        return self._latest_resume_id
+
+    def resolve_latest_resume_id(self):
+        """
+        latest_resume_id, looked up once per process if no flush has set it yet
+
+        Only the first caller queries (one SELECT, no flush); if that fails
+        or finds no resume, the ID arrives with the next background flush.
+        """
+        if self._latest_resume_id is not None or self._lookup_attempted:
+            return self._latest_resume_id
+        with self._start_lock:
+            if self._lookup_attempted:
+                return self._latest_resume_id
+            self._lookup_attempted = True
+        try:
+            conn = self.connect()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT TOP 1 ResumeID FROM Resumes ORDER BY UpdatedDate DESC")
+                row = cursor.fetchone()
+                cursor.close()
+            finally:
+                conn.close()
+            if row is not None and self._latest_resume_id is None:
+                self._latest_resume_id = int(row[0])
+        except Exception as e:
+            print(f"❌ ERROR looking up the latest resume (the flusher will set it): {str(e)}")
+        return self._latest_resume_id
+
+    def stats(self):
+        snapshot = dict(self._stats)
+        snapshot['pending'] = {column: self.pending_total(column) for column in COUNTER_COLUMNS}
+        return snapshot
+
+    # ---------- flushing ----------
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(target=self._run, name='counter-flusher',
+                                                daemon=True)
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self):
+        """Stop the flusher and write everything still pending"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval + 5)
+        self.flush()
+
+    def flush(self):
+        """
+        Write all pending deltas in one transaction
+
+        Returns:
+            int: Number of counters written
+        """
+        with self._flush_lock:
+            deltas = self._drain()
+            if not deltas:
+                return 0
+            try:
+                written = self._write(deltas)
+            except Exception as e:
+                self._restore(deltas)
+                self._stats['failures'] += 1
+                self._stats['last_error'] = str(e)
+                print(f"❌ ERROR flushing counters (will retry): {str(e)}")
+                return 0
+            self._stats['flushes'] += 1
+            self._stats['rows_written'] += written
+            self._stats['last_flush'] = time.time()
+            return written
+
+    def _drain(self):
+        deltas = Counter()
+        for shard in self._shards:
+            with shard.lock:
+                if shard.deltas:
+                    deltas.update(shard.deltas)
+                    self._stats['increments'] += shard.hits
+                    shard.deltas = Counter()
+                    shard.hits = 0
+        return +deltas  # drops zero entries
+
+    def _restore(self, deltas):
+        shard = self._shards[0]
+        with shard.lock:
+            shard.deltas.update(deltas)
+
+    def _write(self, deltas):
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            totals = Counter()
+            for (column, resume_id, _), delta in deltas.items():
+                totals[(column, resume_id)] += delta
+            known = {}
+            latest_resume_id = None
+            for column in COUNTER_COLUMNS:
+                latest = totals.get((column, None))
+                if latest:
+                    latest_resume_id, count = self._write_latest(cursor, column, latest)
+                    known[(column, None)] = known[(column, latest_resume_id)] = count
+                by_resume = [(resume_id, delta) for (c, resume_id), delta in totals.items()
+                             if c == column and resume_id is not None]
+                for start in range(0, len(by_resume), FLUSH_ROWS_PER_STATEMENT):
+                    chunk = by_resume[start:start + FLUSH_ROWS_PER_STATEMENT]
+                    cursor.execute(f"""
+                        UPDATE r
+                        SET r.{column} = ISNULL(r.{column}, 0) + d.Delta,
+                            r.UpdatedDate = GETDATE()
+                        OUTPUT INSERTED.ResumeID, INSERTED.{column}
+                        FROM Resumes r
+                        JOIN (VALUES {', '.join('(?, ?)' for _ in chunk)}) AS d(ResumeID, Delta)
+                            ON r.ResumeID = d.ResumeID
+                    """, [value for row in chunk for value in row])
+                    known.update({(column, resume_id): count
+                                  for resume_id, count in cursor.fetchall()})
+            if self.events is not None:
+                self.events.append(cursor, [
+                    (column, latest_resume_id if resume_id is None else resume_id,
+                     datetime.fromtimestamp(minute * 60), delta)
+                    for (column, resume_id, minute), delta in deltas.items()
+                ])
+            if self.sketches is not None:
+                self.sketches.persist(cursor)
+            conn.commit()
+            cursor.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self._known.update(known)
+        if latest_resume_id is not None:
+            self._latest_resume_id = latest_resume_id
+        return len(totals)
+
+    def _write_latest(self, cursor, column, delta):
+        """
+        Add `delta` to the most recently updated resume, creating one if none exist
+
+        Returns:
+            tuple: (ResumeID, new count)
+        """
+        cursor.execute(f"""
+            UPDATE Resumes
+            SET {column} = ISNULL({column}, 0) + ?, UpdatedDate = GETDATE()
+            OUTPUT INSERTED.ResumeID, INSERTED.{column}
+            WHERE ResumeID = (SELECT TOP 1 ResumeID FROM Resumes ORDER BY UpdatedDate DESC)
+        """, (delta,))
+        row = cursor.fetchone()
+        if row is None:
+            visitors, downloads = (delta, 0) if column == 'VisitorCount' else (0, delta)
+            cursor.execute(f"""
+                INSERT INTO Resumes (ResumeTitle, Status, VisitorCount, DownloadCount, CreatedDate, UpdatedDate)
+                OUTPUT INSERTED.ResumeID, INSERTED.{column}
+                VALUES (?, ?, ?, ?, GETDATE(), GETDATE())
+            """, ('Untitled Resume', 'Draft', visitors, downloads))
+            row = cursor.fetchone()
+        return int(row[0]), row[1]
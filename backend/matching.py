@@ -0,0 +1,359 @@
+"""
+Skill Matching
+--------------
+Ranks resumes for a job and jobs for a resume by weighted skill overlap
+
+Skill names from resumes (Skills.SkillName) and jobs (JobSkillsMaster via
+JobSkills) share one vocabulary of integer IDs. Each side is held as a
+sparse entity x skill matrix with its transpose, so scoring one query is
+a single NumPy bincount over the postings of the query's skills.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+# Pending writes are merged into the arrays once there are this many
+COMPACT_AFTER = 1000
+
+# Rows fetched per round trip while loading
+LOAD_BATCH_SIZE = 50000
+
+
+def skill_key(name):
+    """Vocabulary key for a skill name: lowercased, whitespace collapsed"""
+    return ' '.join(str(name).lower().split())
+
+
+class SkillMatrix:
+    """
+    Immutable CSR matrix of entities x skill IDs, plus its postings
+
+    Rows are entities (sorted by ID), each with a sorted array of skill IDs.
+    weights holds an IDF per skill so rare skills count for more than common
+    ones; norms holds each row's total weight.
+    """
+
+    def __init__(self, entities, skills):
+        entities = np.asarray(entities, dtype=np.int64)
+        skills = np.asarray(skills, dtype=np.int64)
+        self.ids, rows = np.unique(entities, return_inverse=True)
+        self.row_of = {int(entity_id): row for row, entity_id in enumerate(self.ids)}
+        self.vocab_size = int(skills.max()) + 1 if skills.size else 0
+
+        # Sorted unique (row, skill) keys give CSR order and drop duplicates
+        if skills.size:
+            keys = np.unique(rows.astype(np.int64) * self.vocab_size + skills)
+            rows, skills = keys // self.vocab_size, keys % self.vocab_size
+        n_rows = len(self.ids)
+        self.indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=self.indptr[1:])
+        self.indices = skills.astype(np.int32)
+
+        df = np.bincount(skills, minlength=self.vocab_size)
+        self.post_indptr = np.zeros(self.vocab_size + 1, dtype=np.int64)
+        np.cumsum(df, out=self.post_indptr[1:])
+        self.post_rows = rows[np.argsort(skills, kind='stable')].astype(np.int32)
+
+        # Smoothed so weights stay positive even for an empty matrix
+        self.unseen_weight = float(np.log1p(n_rows + 1.0))
+        self.weights = np.log1p((n_rows + 1.0) / (1.0 + df))
+        self.norms = np.bincount(rows, weights=self.weights[skills], minlength=n_rows)
+
+    @property
+    def n_rows(self):
+        return len(self.ids)
+
+    def row_skills(self, row):
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def weight(self, skill_ids):
+        """IDF of each skill; skills no row has get the maximum"""
+        weights = np.full(len(skill_ids), self.unseen_weight)
+        known = skill_ids < self.vocab_size
+        weights[known] = self.weights[skill_ids[known]]
+        return weights
+
+    def overlap(self, skill_ids, weights):
+        """Per-row sum of `weights` over the rows' skills found in `skill_ids`"""
+        known = skill_ids < self.vocab_size
+        skill_ids, weights = skill_ids[known], weights[known]
+        if not skill_ids.size:
+            return np.zeros(self.n_rows)
+        starts = self.post_indptr[skill_ids]
+        lengths = self.post_indptr[skill_ids + 1] - starts
+        rows = np.concatenate([self.post_rows[s:s + n] for s, n in zip(starts, lengths)])
+        return np.bincount(rows, weights=np.repeat(weights, lengths), minlength=self.n_rows)
+
+
+class SkillIndex:
+    """
+    One side of the matcher (resumes or jobs), updatable in place
+
+    Writes land in a small pending map and hide the entity's old row; they
+    are merged into a fresh SkillMatrix every COMPACT_AFTER writes.
+    """
+
+    def __init__(self):
+        self.matrix = SkillMatrix([], [])
+        self._alive = np.ones(0, dtype=bool)
+        self._pending = {}  # entity ID -> sorted skill IDs (empty = removed)
+
+    def rebuild(self, entities, skills):
+        self.matrix = SkillMatrix(entities, skills)
+        self._alive = np.ones(self.matrix.n_rows, dtype=bool)
+        self._pending = {}
+
+    def set(self, entity_id, skill_ids):
+        row = self.matrix.row_of.get(entity_id)
+        if row is not None:
+            self._alive[row] = False
+        self._pending[entity_id] = np.unique(np.asarray(skill_ids, dtype=np.int64))
+        if len(self._pending) >= COMPACT_AFTER:
+            self.compact()
+
+    def remove(self, entity_id):
+        self.set(entity_id, [])
+
+    def compact(self):
+        """Merge pending writes into a new matrix"""
+        matrix = self.matrix
+        row_per_entry = np.repeat(np.arange(matrix.n_rows), np.diff(matrix.indptr))
+        keep = self._alive[row_per_entry]
+        entities = [matrix.ids[row_per_entry[keep]]]
+        skills = [matrix.indices[keep].astype(np.int64)]
+        for entity_id, skill_ids in self._pending.items():
+            entities.append(np.full(skill_ids.size, entity_id, dtype=np.int64))
+            skills.append(skill_ids)
+        self.rebuild(np.concatenate(entities), np.concatenate(skills))
+
+    def top_k(self, query, k, normalize='query'):
+        """
+        Best k entities for a set of query skill IDs
+
+        Scores are the weighted share of the query's skills an entity has
+        (normalize='query') or of the entity's skills the query has
+        (normalize='entity').
+
+        Returns:
+            list: (entity ID, score, matched skill IDs), best first
+        """
+        query = np.unique(np.asarray(query, dtype=np.int64))
+        matrix = self.matrix
+        if not query.size:
+            return []
+        weights = matrix.weight(query)
+        scores = matrix.overlap(query, weights)
+        if normalize == 'entity':
+            np.divide(scores, matrix.norms, out=scores, where=matrix.norms > 0)
+        else:
+            scores /= weights.sum()
+        scores[~self._alive] = 0
+
+        rows = np.flatnonzero(scores)
+        if rows.size > k:
+            rows = rows[np.argpartition(scores[rows], -k)[-k:]]
+        results = [(int(matrix.ids[row]), float(scores[row]), matrix.row_skills(row))
+                   for row in rows]
+
+        total = weights.sum()
+        for entity_id, skill_ids in self._pending.items():
+            matched = np.intersect1d(query, skill_ids, assume_unique=True)
+            if matched.size:
+                score = matrix.weight(matched).sum()
+                score /= matrix.weight(skill_ids).sum() if normalize == 'entity' else total
+                results.append((entity_id, float(score), skill_ids))
+
+        results.sort(key=lambda r: (-r[1], r[0]))
+        return [(entity_id, score, np.intersect1d(query, skill_ids, assume_unique=True))
+                for entity_id, score, skill_ids in results[:k]]
+
+
+class SkillMatcher:
+    """
+    Resume <-> job matching over a shared skill vocabulary
+
+    Loaded from the database and kept current by this process's resume and
+    job write endpoints. All reads and writes take one lock.
+
+    load() builds the new matrices beside the current ones and swaps them
+    in, replaying writes made meanwhile, so queries keep working during a
+    rebuild. reload_in_background() does that from `connect` in one thread,
+    after `reload_after` seconds (see needs_reload) or when another worker
+    has changed resumes or jobs.
+    """
+
+    RETRY_AFTER = 30  # Seconds before a failed background rebuild is retried
+
+    def __init__(self, connect=None, reload_after=600):
+        self.connect = connect
+        self.reload_after = reload_after
+        self.vocabulary = {}  # skill_key -> ID
+        self.names = []       # ID -> display name (first spelling seen)
+        self.resumes = SkillIndex()
+        self.jobs = SkillIndex()
+        self.loaded = False
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._replay = None  # writes made while a load runs, as (method, args)
+        self._reloading = False
+        self._retry_at = 0.0
+
+    def skill_ids(self, names, add=False):
+        """IDs for skill names; unknown names are added only if `add`"""
+        ids = []
+        for name in names or []:
+            if name is None or not str(name).strip():
+                continue
+            key = skill_key(name)
+            skill_id = self.vocabulary.get(key)
+            if skill_id is None and add:
+                skill_id = self.vocabulary[key] = len(self.names)
+                self.names.append(str(name).strip())
+            if skill_id is not None:
+                ids.append(skill_id)
+        return ids
+
+    # ---------- building ----------
+
+    def load(self, cursor):
+        """(Re)build both sides from Skills and the active jobs' JobSkills"""
+        with self._lock:
+            self._replay = []
+        fresh = SkillMatcher()
+        try:
+            cursor.execute("SELECT ResumeID, SkillName FROM Skills WHERE SkillName IS NOT NULL")
+            fresh.resumes.rebuild(*fresh._read_pairs(cursor))
+            cursor.execute("""
+                SELECT js.JobID, jsm.SkillName
+                FROM JobSkills js
+                JOIN JobSkillsMaster jsm ON js.SkillID = jsm.SkillID
+                JOIN Jobs j ON js.JobID = j.JobID
+                WHERE j.IsActive = 1
+            """)
+            fresh.jobs.rebuild(*fresh._read_pairs(cursor))
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            self.vocabulary = fresh.vocabulary
+            self.names = fresh.names
+            self.resumes = fresh.resumes
+            self.jobs = fresh.jobs
+            self.loaded = True
+            self._loaded_at = time.monotonic()
+            for method, args in self._replay:
+                method(*args)
+            self._replay = None
+        print(f"✓ Skill matcher built: {fresh.resumes.matrix.n_rows} resumes, "
+              f"{fresh.jobs.matrix.n_rows} jobs, {len(fresh.names)} skills")
+
+    def needs_reload(self):
+        """True once the matrices are older than reload_after seconds"""
+        with self._lock:
+            return (self.loaded and self.reload_after is not None
+                    and time.monotonic() - self._loaded_at > self.reload_after)
+
+    def reload_in_background(self):
+        """Rebuild from the database in a background thread unless one is already running"""
+        with self._lock:
+            if self._reloading or time.monotonic() < self._retry_at:
+                return
+            self._reloading = True
+
+        def run():
+            try:
+                conn = self.connect()
+                try:
+                    cursor = conn.cursor()
+                    self.load(cursor)
+                    cursor.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                with self._lock:
+                    self._retry_at = time.monotonic() + self.RETRY_AFTER
+                print(f"❌ ERROR rebuilding skill matcher: {str(e)}")
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=run, name='skill-matcher-reload', daemon=True).start()
+
+    def _read_pairs(self, cursor):
+        entities, skills = [], []
+        while True:
+            rows = cursor.fetchmany(LOAD_BATCH_SIZE)
+            if not rows:
+                break
+            for entity_id, name in rows:
+                ids = self.skill_ids([name], add=True)
+                if ids:
+                    entities.append(entity_id)
+                    skills.append(ids[0])
+        return np.array(entities, dtype=np.int64), np.array(skills, dtype=np.int64)
+
+    def set_resume(self, resume_id, skill_names):
+        self._write(self._set_resume_locked, resume_id, skill_names)
+
+    def set_job(self, job_id, skill_names):
+        self._write(self._set_job_locked, job_id, skill_names)
+
+    def remove_job(self, job_id):
+        self._write(self._remove_job_locked, job_id)
+
+    def _write(self, method, *args):
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((method, args))
+            if self.loaded:
+                method(*args)
+
+    def _set_resume_locked(self, resume_id, skill_names):
+        self.resumes.set(resume_id, self.skill_ids(skill_names, add=True))
+
+    def _set_job_locked(self, job_id, skill_names):
+        self.jobs.set(job_id, self.skill_ids(skill_names, add=True))
+
+    def _remove_job_locked(self, job_id):
+        self.jobs.remove(job_id)
+
+    # ---------- querying ----------
+
+    def match_resumes(self, skill_names, k=20):
+        """
+        Resumes holding the largest (IDF-weighted) share of a job's skills
+
+        Returns:
+            list: (ResumeID, score 0..1, matched skill names), best first
+        """
+        with self._lock:
+            hits = self.resumes.top_k(self.skill_ids(skill_names), k, normalize='query')
+            return self._named(hits)
+
+    def match_jobs(self, skill_names, k=20):
+        """
+        Jobs whose required skills a resume covers best
+
+        Returns:
+            list: (JobID, score 0..1, matched skill names), best first
+        """
+        with self._lock:
+            hits = self.jobs.top_k(self.skill_ids(skill_names), k, normalize='entity')
+            return self._named(hits)
+
+    def _named(self, hits):
+        return [(entity_id, score, [self.names[s] for s in matched])
+                for entity_id, score, matched in hits]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': self.loaded,
+                'skills': len(self.names),
+                'resumes': self.resumes.matrix.n_rows,
+                'jobs': self.jobs.matrix.n_rows,
+                'pending_writes': len(self.resumes._pending) + len(self.jobs._pending),
+            }
@@ -79,6 +79,220 @@ class ResumeSchema(Schema):
     signature = fields.Str(required=True)
 
 
+# ==========================================
+# BATCH LOADING
+# ==========================================
+
+RESUME_SELECT_SQL = """
+    SELECT ResumeID, ResumeTitle, Status, CreatedDate, 
+           VisitorCount, DownloadCount 
+    FROM Resumes 
+"""
+
+
+def _personal_info(p):
+    return {
+        'full_name': p[0] if p[0] else 'Unknown',
+        'email': p[1] if p[1] else 'No email',
+        'phone_number': p[2] if p[2] else None,
+        'date_of_birth': p[3],
+        'location': p[4] if p[4] else 'N/A',
+        'linkedin_url': p[5] if p[5] else None,
+        'github_url': p[6] if p[6] else None,
+        'career_objective': p[7] if p[7] else None,
+        'photo_path': p[8] if p[8] else None
+    }
+
+
+def _work_experience(w):
+    return {
+        'company_name': w[0],
+        'job_role': w[1],
+        'date_of_join': w[2],
+        'last_working_date': w[3],
+        'experience': w[4]
+    }
+
+
+def _education(e):
+    return {
+        'institution_name': e[0],
+        'university_name': e[1],
+        'course_name': e[2],
+        'year_of_completion': e[3],
+        'cgpa': e[4]
+    }
+
+
+def _project(p):
+    return {
+        'project_title': p[0],
+        'project_link': p[1],
+        'organization': p[2],
+        'description': p[3]
+    }
+
+
+def _skill(s):
+    return {'skill_type': s[0], 'skill_name': s[1]}
+
+
+def _certification(c):
+    return {'certification_name': c[0]}
+
+
+def _interest(i):
+    return {'interest_name': i[0]}
+
+
+class ResumeBatchLoader:
+    """
+    Loads complete resumes for a page of ResumeIDs
+    
+    Each child table is read once for the whole page (the IDs are passed as
+    one STRING_SPLIT parameter) and rows are grouped by ResumeID in memory,
+    so a page costs 1 + len(CHILD_TABLES) queries however many resumes it has.
+    """
+    
+    # key -> (table, selected columns, order column, row mapper)
+    CHILD_TABLES = {
+        'personal_info': ('PersonalInformation',
+                          'FullName, Email, PhoneNumber, DateOfBirth, Location, '
+                          'LinkedInURL, GitHubURL, CareerObjective, PhotoPath',
+                          'PersonalInfoID', _personal_info),
+        'work_experience': ('WorkExperience',
+                            'CompanyName, JobRole, DateOfJoin, LastWorkingDate, Experience',
+                            'ExperienceID', _work_experience),
+        'education': ('Education', 'College, University, Course, Year, CGPA',
+                      'EducationID', _education),
+        'projects': ('Projects', 'ProjectTitle, ProjectLink, Organization, Description',
+                     'ProjectID', _project),
+        'skills': ('Skills', 'SkillType, SkillName', 'SkillID', _skill),
+        'certifications': ('Certifications', 'CertificationName',
+                           'CertificationID', _certification),
+        'interests': ('Interests', 'InterestName', 'InterestID', _interest),
+    }
+    
+    def __init__(self, cursor):
+        self.cursor = cursor
+    
+    def fetch_children(self, key, resume_ids):
+        """Returns {ResumeID: [mapped rows]} for one child table"""
+        table, columns, order_column, mapper = self.CHILD_TABLES[key]
+        grouped = {resume_id: [] for resume_id in resume_ids}
+        if not grouped:
+            return grouped
+        
+        self.cursor.execute(f"""
+            SELECT t.ResumeID, {columns}
+            FROM {table} t
+            JOIN STRING_SPLIT(?, ',') ids ON t.ResumeID = CAST(ids.value AS INT)
+            ORDER BY t.ResumeID, t.{order_column}
+        """, (','.join(str(int(resume_id)) for resume_id in grouped),))
+        
+        for row in self.cursor.fetchall():
+            grouped[row[0]].append(mapper(row[1:]))
+        return grouped
+    
+    def load(self, resume_rows):
+        """
+        Builds full resume dicts from RESUME_SELECT_SQL rows, keeping their order
+        
+        Args:
+            resume_rows: Rows of (ResumeID, ResumeTitle, Status, CreatedDate,
+                         VisitorCount, DownloadCount)
+        """
+        resume_ids = [row[0] for row in resume_rows]
+        children = {key: self.fetch_children(key, resume_ids) for key in self.CHILD_TABLES}
+        
+        resumes = []
+        for row in resume_rows:
+            resume_id = row[0]
+            personal = children['personal_info'][resume_id]
+            resume = {
+                'resume_id': resume_id,
+                'resume_title': row[1] if row[1] else 'Untitled Resume',
+                'status': row[2],
+                'created_at': row[3],
+                'visitor_count': row[4],
+                'download_count': row[5],
+                'personal_info': personal[0] if personal else
+                    {'full_name': 'Unknown', 'email': 'No email', 'location': 'N/A'}
+            }
+            for key in self.CHILD_TABLES:
+                if key != 'personal_info':
+                    resume[key] = children[key][resume_id]
+            resumes.append(resume)
+        return resumes
+
+
+# ==========================================
+# BATCHED WRITES
+# ==========================================
+
+# key -> (table, columns, resume data fields), in insert order
+RESUME_CHILD_INSERTS = {
+    'work_experience': ('WorkExperience',
+                        ('CompanyName', 'JobRole', 'DateOfJoin', 'LastWorkingDate', 'Experience'),
+                        ('company_name', 'job_role', 'date_of_join', 'last_working_date', 'experience')),
+    'education': ('Education',
+                  ('College', 'University', 'Course', 'Year', 'CGPA'),
+                  ('college', 'university', 'course', 'year', 'cgpa')),
+    'projects': ('Projects',
+                 ('ProjectTitle', 'ProjectLink', 'Organization', 'Description'),
+                 ('project_title', 'project_link', 'organization', 'description')),
+    'skills': ('Skills', ('SkillType', 'SkillName'), ('skill_type', 'skill_name')),
+    'certifications': ('Certifications', ('CertificationName',), ('certification_name',)),
+    'interests': ('Interests', ('InterestName',), ('interest_name',)),
+}
+
+# SQL Server allows 2100 parameters and 1000 VALUES rows per statement
+MAX_PARAMS_PER_STATEMENT = 2000
+MAX_ROWS_PER_STATEMENT = 1000
+
+
+def insert_multi_row(cursor, table, columns, rows):
+    """
+    INSERT rows with multi-row VALUES, as few statements as the limits allow
+    
+    Each row gets CreatedDate = GETDATE(). Unlike fast_executemany this binds
+    every parameter with its own type, so a column mixing None with values
+    is safe.
+    """
+    if not rows:
+        return
+    per_row = len(columns)
+    batch = max(1, min(MAX_ROWS_PER_STATEMENT, MAX_PARAMS_PER_STATEMENT // per_row))
+    row_sql = '(' + ', '.join('?' for _ in columns) + ', GETDATE())'
+    for start in range(0, len(rows), batch):
+        chunk = rows[start:start + batch]
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}, CreatedDate) VALUES "
+            + ', '.join(row_sql for _ in chunk),
+            [value for row in chunk for value in row]
+        )
+
+
+def insert_resume_children(cursor, resume_id, sections):
+    """
+    Write every child section of a resume, one statement per table
+    
+    Args:
+        sections: dict with any of the RESUME_CHILD_INSERTS keys, each a list
+                  of dicts in the resume payload shape
+    
+    Returns:
+        dict: key -> number of rows inserted
+    """
+    counts = {}
+    for key, (table, columns, fields) in RESUME_CHILD_INSERTS.items():
+        rows = [(resume_id,) + tuple(item.get(f) for f in fields)
+                for item in sections.get(key) or []]
+        insert_multi_row(cursor, table, ('ResumeID',) + columns, rows)
+        counts[key] = len(rows)
+    return counts
+
+
 # ==========================================
 # DATABASE OPERATIONS
 # ==========================================
@@ -156,106 +370,20 @@ class ResumeModel:
             ))
             print("✓ Personal info saved")
             
-            # Insert Work Experience
-            work_count = 0
-            for work in validated_data.get('work_experience', []):
-                if work.get('company_name') or work.get('job_role'):
-                    self.cursor.execute("""
-                        INSERT INTO WorkExperience 
-                        (ResumeID, CompanyName, JobRole, DateOfJoin, 
-                         LastWorkingDate, Experience, CreatedDate)
-                        VALUES (?, ?, ?, ?, ?, ?, GETDATE())
-                    """, (
-                        resume_id,
-                        work.get('company_name'),
-                        work.get('job_role'),
-                        work.get('date_of_join'),
-                        work.get('last_working_date'),
-                        work.get('experience')
-                    ))
-                    work_count += 1
-            print(f"✓ Saved {work_count} work experiences")
-            
-            # Insert Education
-            edu_count = 0
-            for edu in validated_data.get('education', []):
-                if edu.get('college') or edu.get('course'):
-                    self.cursor.execute("""
-                        INSERT INTO Education 
-                        (ResumeID, College, University, Course, Year, CGPA, CreatedDate)
-                        VALUES (?, ?, ?, ?, ?, ?, GETDATE())
-                    """, (
-                        resume_id,
-                        edu.get('college'),
-                        edu.get('university'),
-                        edu.get('course'),
-                        edu.get('year'),
-                        edu.get('cgpa')
-                    ))
-                    edu_count += 1
-            print(f"✓ Saved {edu_count} education entries")
-            
-            # Insert Projects
-            proj_count = 0
-            for project in validated_data.get('projects', []):
-                if project.get('project_title'):
-                    self.cursor.execute("""
-                        INSERT INTO Projects 
-                        (ResumeID, ProjectTitle, ProjectLink, Organization, 
-                         Description, CreatedDate)
-                        VALUES (?, ?, ?, ?, ?, GETDATE())
-                    """, (
-                        resume_id,
-                        project.get('project_title'),
-                        project.get('project_link'),
-                        project.get('organization'),
-                        project.get('description')
-                    ))
-                    proj_count += 1
-            print(f"✓ Saved {proj_count} projects")
-            
-            # Insert Skills
-            skill_count = 0
-            for skill in validated_data.get('skills', []):
-                self.cursor.execute("""
-                    INSERT INTO Skills 
-                    (ResumeID, SkillType, SkillName, CreatedDate)
-                    VALUES (?, ?, ?, GETDATE())
-                """, (
-                    resume_id,
-                    skill['skill_type'],
-                    skill['skill_name']
-                ))
-                skill_count += 1
-            print(f"✓ Saved {skill_count} skills")
-            
-            # Insert Certifications
-            cert_count = 0
-            for cert in validated_data.get('certifications', []):
-                self.cursor.execute("""
-                    INSERT INTO Certifications 
-                    (ResumeID, CertificationName, CreatedDate)
-                    VALUES (?, ?, GETDATE())
-                """, (
-                    resume_id,
-                    cert['certification_name']
-                ))
-                cert_count += 1
-            print(f"✓ Saved {cert_count} certifications")
-            
-            # Insert Interests
-            interest_count = 0
-            for interest in validated_data.get('interests', []):
-                self.cursor.execute("""
-                    INSERT INTO Interests 
-                    (ResumeID, InterestName, CreatedDate)
-                    VALUES (?, ?, GETDATE())
-                """, (
-                    resume_id,
-                    interest['interest_name']
-                ))
-                interest_count += 1
-            print(f"✓ Saved {interest_count} interests")
+            # Insert child sections, skipping entries the form left blank
+            sections = {
+                'work_experience': [w for w in validated_data['work_experience']
+                                    if w.get('company_name') or w.get('job_role')],
+                'education': [e for e in validated_data['education']
+                              if e.get('college') or e.get('course')],
+                'projects': [p for p in validated_data['projects'] if p.get('project_title')],
+                'skills': validated_data['skills'],
+                'certifications': validated_data['certifications'],
+                'interests': validated_data['interests'],
+            }
+            counts = insert_resume_children(self.cursor, resume_id, sections)
+            print("✓ Saved " + ", ".join(f"{count} {key.replace('_', ' ')}"
+                                         for key, count in counts.items()))
             
             # Commit all changes
             self.conn.commit()
@@ -288,51 +416,16 @@ class ResumeModel:
     def get_resume(self, resume_id):
         """Retrieves complete resume from database"""
         try:
-            # Get resume info
-            self.cursor.execute("""
-                SELECT ResumeID, ResumeTitle, Status, CreatedDate
-                FROM Resumes
-                WHERE ResumeID = ?
-            """, (resume_id,))
+            self.cursor.execute(RESUME_SELECT_SQL + "WHERE ResumeID = ?", (resume_id,))
             
             resume = self.cursor.fetchone()
             if not resume:
                 return {'success': False, 'message': 'Resume not found'}
             
-            # Get all related data
-            self.cursor.execute("SELECT * FROM PersonalInformation WHERE ResumeID = ?", (resume_id,))
-            personal_info = self.cursor.fetchone()
-            
-            self.cursor.execute("SELECT * FROM WorkExperience WHERE ResumeID = ?", (resume_id,))
-            work_experience = self.cursor.fetchall()
-            
-            self.cursor.execute("SELECT * FROM Education WHERE ResumeID = ?", (resume_id,))
-            education = self.cursor.fetchall()
-            
-            self.cursor.execute("SELECT * FROM Projects WHERE ResumeID = ?", (resume_id,))
-            projects = self.cursor.fetchall()
-            
-            self.cursor.execute("SELECT * FROM Skills WHERE ResumeID = ?", (resume_id,))
-            skills = self.cursor.fetchall()
-            
-            self.cursor.execute("SELECT * FROM Certifications WHERE ResumeID = ?", (resume_id,))
-            certifications = self.cursor.fetchall()
-            
-            self.cursor.execute("SELECT * FROM Interests WHERE ResumeID = ?", (resume_id,))
-            interests = self.cursor.fetchall()
-            
+            # Same batched loader as the resume list, with a page of one
             return {
                 'success': True,
-                'data': {
-                    'resume': resume,
-                    'personal_info': personal_info,
-                    'work_experience': work_experience,
-                    'education': education,
-                    'projects': projects,
-                    'skills': skills,
-                    'certifications': certifications,
-                    'interests': interests
-                }
+                'data': ResumeBatchLoader(self.cursor).load([resume])[0]
             }
             
         except Exception as e:
@@ -0,0 +1,309 @@
+"""
+Skill Name Normalization
+------------------------
+Maps skill strings onto existing JobSkillsMaster names before they are
+resolved, so "python ", "PYTHON" and "Node.js"/"NodeJS" become one name,
+and merges the duplicates already in the table
+
+Only names equal after folding case, whitespace and separators are ever
+rewritten or merged. Near-duplicates ("Pyhton") are found with a trigram
+index plus a small edit distance, but one edit also turns distinct skills
+into each other ("MSSQL"/"MySQL", "Spring"/"String"), so they are only
+reported as suggestions on the merge plan.
+"""
+
+import re
+import threading
+from collections import Counter
+
+from bulk import split_skills
+
+# Active skills with the number of jobs linked to each
+SKILL_USAGE_SQL = """
+    SELECT m.SkillID, m.SkillName, COUNT(js.JobID)
+    FROM JobSkillsMaster m
+    LEFT JOIN JobSkills js ON js.SkillID = m.SkillID
+    WHERE m.IsActive = 1
+    GROUP BY m.SkillID, m.SkillName
+"""
+
+# Dropped by name_key: "Node.js", "node js" and "NodeJS" are one skill, while
+# symbols that carry meaning ("C", "C++", "C#") are kept
+SEPARATORS = re.compile(r'[\s._/-]+')
+
+# Merge pairs per statement: 2 parameters each, under SQL Server's 2100 limit
+MERGE_ROWS_PER_STATEMENT = 500
+
+
+def clean_name(name):
+    """Display form: trimmed, inner whitespace collapsed"""
+    return ' '.join(str(name).split())
+
+
+def name_key(name):
+    """Exact-match key: lowercased, whitespace and separators removed"""
+    return SEPARATORS.sub('', str(name)).lower()
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance (adjacent transpositions cost 1)
+
+    Returns limit + 1 as soon as the distance is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # A transposition can reach back two rows, so both must be over the limit
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SkillNormalizer:
+    """
+    In-memory index of canonical skill names
+
+    normalize() and plan_merges() only use name_key matches. suggest() and
+    plan_suggestions() look for near-duplicates: both names start with the
+    same character, contain the same digits ("Python 2" is not "Python 3")
+    and are within max_edits() of each other; names shorter than
+    MIN_FUZZY_LENGTH are never suggested ("C", "R", "Go" and "C#").
+    """
+
+    MIN_FUZZY_LENGTH = 5
+    MIN_SIMILARITY = 0.3  # Dice coefficient on trigrams to be a candidate
+
+    def __init__(self):
+        self._names = {}     # key -> (display name, SkillID or None, usage)
+        self._postings = {}  # trigram -> set of keys
+        self._rows = []      # (SkillID, name, usage) as loaded, duplicates included
+        self._lock = threading.Lock()
+        self.loaded = False
+        self._stats = {'exact': 0, 'new': 0}
+
+    @classmethod
+    def max_edits(cls, key):
+        if len(key) < cls.MIN_FUZZY_LENGTH:
+            return 0
+        return 1 if len(key) < 9 else 2
+
+    def load(self, cursor):
+        """Index every active JobSkillsMaster name"""
+        cursor.execute(SKILL_USAGE_SQL)
+        rows = [(skill_id, name, usage) for skill_id, name, usage in cursor.fetchall()
+                if name and name.strip()]
+        # Most-used first, so the most-used spelling of a key is the one kept
+        rows.sort(key=lambda row: (-row[2], row[0]))
+        with self._lock:
+            self._names = {}
+            self._postings = {}
+            self._rows = rows
+            for skill_id, name, usage in rows:
+                self._add_locked(name, skill_id, usage)
+            self.loaded = True
+
+    def add(self, name, skill_id=None, usage=0):
+        """Make `name` a known spelling (no-op if its key is already known)"""
+        with self._lock:
+            self._add_locked(name, skill_id, usage)
+
+    def match(self, name):
+        """
+        Known skill with the same name_key as `name`
+
+        Returns:
+            tuple: (display name, SkillID or None), or None
+        """
+        with self._lock:
+            known = self._names.get(name_key(name))
+        return None if known is None else (known[0], known[1])
+
+    def suggest(self, name):
+        """
+        Closest known skill with a different name_key (never applied automatically)
+
+        Returns:
+            tuple: (display name, SkillID or None, edit distance), or None
+        """
+        key = name_key(name)
+        with self._lock:
+            if key in self._names:
+                return None
+            return self._fuzzy_locked(key)
+
+    def normalize(self, name):
+        """
+        Name to store for `name`: the known spelling with the same key, or its
+        cleaned form, which is remembered for later spellings of it
+        """
+        if not name or not str(name).strip():
+            return None
+        found = self.match(name)
+        if found is None:
+            self._stats['new'] += 1
+            cleaned = clean_name(name)
+            self.add(cleaned)
+            return cleaned
+        self._stats['exact'] += 1
+        return found[0]
+
+    def normalize_skills(self, value):
+        """Normalized, de-duplicated skill list from a JSON list or 'a;b|c' string"""
+        skills = []
+        for name in split_skills(value):
+            normalized = self.normalize(name)
+            if normalized and normalized not in skills:
+                skills.append(normalized)
+        return skills
+
+    def plan_merges(self):
+        """
+        Groups of active skills with the same name_key; the most-used one survives
+
+        Returns:
+            list: {'survivor': (SkillID, name), 'duplicates': [(SkillID, name), ...]}
+        """
+        with self._lock:
+            rows = list(self._rows)
+        groups = {}  # name_key -> group
+        for skill_id, name, usage in rows:
+            group = groups.get(name_key(name))
+            if group is None:
+                groups[name_key(name)] = {'survivor': (skill_id, str(name).strip()),
+                                          'duplicates': []}
+            else:
+                group['duplicates'].append((skill_id, name))
+        return [group for group in groups.values() if group['duplicates']]
+
+    def plan_suggestions(self):
+        """
+        Near-duplicate skills for a person to review; never merged by plan_merges()
+
+        Survivors are taken most-used first and each is compared with the
+        more-used ones before it, so a suggestion always points at the more
+        common spelling.
+
+        Returns:
+            list: {'skill': (SkillID, name), 'similar_to': (SkillID, name), 'distance': int}
+        """
+        with self._lock:
+            rows = list(self._rows)
+        survivors = SkillNormalizer()
+        suggestions = []
+        for skill_id, name, usage in rows:
+            if survivors.match(name) is not None:
+                continue  # a name_key duplicate, already in plan_merges()
+            found = survivors.suggest(name)
+            if found is not None:
+                suggestions.append({'skill': (skill_id, str(name).strip()),
+                                    'similar_to': (found[1], found[0]),
+                                    'distance': found[2]})
+            survivors.add(name, skill_id, usage)
+        return suggestions
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update({'names': len(self._names), 'trigrams': len(self._postings)})
+        return snapshot
+
+    def _add_locked(self, name, skill_id, usage):
+        key = name_key(name)
+        if key in self._names:
+            return
+        # Keep the stored spelling so it still resolves to the same master row
+        self._names[key] = (str(name).strip(), skill_id, usage)
+        for gram in trigrams(key):
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _fuzzy_locked(self, key):
+        limit = self.max_edits(key)
+        if not limit:
+            return None
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        digits = [c for c in key if c.isdigit()]
+
+        best = None
+        for other, count in shared.items():
+            if 2 * count / (len(grams) + len(other) + 1) < self.MIN_SIMILARITY:
+                continue  # len(other) + 1 == len(trigrams(other))
+            if other[0] != key[0] or [c for c in other if c.isdigit()] != digits:
+                continue
+            distance = edit_distance(key, other, min(limit, self.max_edits(other)))
+            if distance > min(limit, self.max_edits(other)):
+                continue
+            name, skill_id, usage = self._names[other]
+            rank = (distance, -usage, other)
+            if best is None or rank < best[0]:
+                best = (rank, (name, skill_id, distance))
+        return best[1] if best else None
+
+
+def merge_duplicate_skills(conn, groups):
+    """
+    Fold duplicate skills into their survivors
+
+    Per chunk of groups, in one transaction: link each job to the survivor
+    of any duplicate it has (unless it already has the survivor), remove
+    the duplicate links, and deactivate the duplicate master rows.
+
+    Returns:
+        dict: Counts of links added, links removed and skills deactivated
+    """
+    pairs = [(duplicate_id, group['survivor'][0])
+             for group in groups for duplicate_id, _ in group['duplicates']]
+    totals = {'skills_merged': len(pairs), 'links_added': 0, 'links_removed': 0,
+              'skills_deactivated': 0}
+    cursor = conn.cursor()
+    for start in range(0, len(pairs), MERGE_ROWS_PER_STATEMENT):
+        chunk = pairs[start:start + MERGE_ROWS_PER_STATEMENT]
+        merge = (f"(VALUES {', '.join('(?, ?)' for _ in chunk)}) AS m(DuplicateID, SurvivorID)")
+        params = [value for pair in chunk for value in pair]
+        try:
+            cursor.execute(f"""
+                INSERT INTO JobSkills (JobID, SkillID, CreatedAt)
+                SELECT DISTINCT js.JobID, m.SurvivorID, GETDATE()
+                FROM JobSkills js
+                JOIN {merge} ON js.SkillID = m.DuplicateID
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM JobSkills k WHERE k.JobID = js.JobID AND k.SkillID = m.SurvivorID
+                )
+            """, params)
+            totals['links_added'] += max(cursor.rowcount, 0)
+            cursor.execute(f"""
+                DELETE js
+                FROM JobSkills js
+                JOIN {merge} ON js.SkillID = m.DuplicateID
+            """, params)
+            totals['links_removed'] += max(cursor.rowcount, 0)
+            cursor.execute(f"""
+                UPDATE s
+                SET s.IsActive = 0
+                FROM JobSkillsMaster s
+                JOIN {merge} ON s.SkillID = m.DuplicateID
+            """, params)
+            totals['skills_deactivated'] += max(cursor.rowcount, 0)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    cursor.close()
+    return totals
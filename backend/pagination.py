@@ -0,0 +1,88 @@
+"""
+Keyset Pagination
+-----------------
+Opaque cursors for list endpoints ordered by (created date DESC, id DESC)
+
+A cursor remembers the last row of the previous page, so the next page is
+an index seek past that row instead of an OFFSET scan over every earlier one.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from config import Config
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor we did not issue"""
+
+
+def parse_page_size(value):
+    """Reads the ?limit= argument, falling back to the default and capping it"""
+    if value in (None, ''):
+        return Config.PAGE_SIZE_DEFAULT
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return Config.PAGE_SIZE_DEFAULT
+    return max(1, min(size, Config.PAGE_SIZE_MAX))
+
+
+def encode_cursor(created_at, row_id):
+    """Packs (created_at, id) of the last row on a page into an opaque token"""
+    payload = json.dumps([created_at.isoformat() if created_at else None, int(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; returns (created_at or None, id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(created_at) if created_at else None
+        return created_at, int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError('Invalid pagination cursor')
+
+
+def keyset_clause(created_column, id_column, position):
+    """
+    SQL predicate selecting rows after `position` in (created DESC, id DESC) order
+    
+    NULL created dates sort last under DESC, so they follow every dated row.
+    The cursor value is cast back to DATETIME so it compares exactly with the
+    column it was read from.
+    
+    Returns:
+        tuple: (sql fragment, params)
+    """
+    created_at, row_id = position
+    if created_at is None:
+        return f"({created_column} IS NULL AND {id_column} < ?)", [row_id]
+    return (
+        f"({created_column} < CAST(? AS DATETIME)"
+        f" OR ({created_column} = CAST(? AS DATETIME) AND {id_column} < ?)"
+        f" OR {created_column} IS NULL)",
+        [created_at, created_at, row_id]
+    )
+
+
+def order_and_limit(created_column, id_column):
+    """ORDER BY / FETCH tail matching keyset_clause; takes one (limit) param"""
+    return (f" ORDER BY {created_column} DESC, {id_column} DESC"
+            f" OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY")
+
+
+def split_page(rows, page_size, created_index, id_index):
+    """
+    Trims a result fetched with page_size + 1 rows
+    
+    Returns:
+        tuple: (rows for this page, next cursor or None on the last page)
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last[created_index], last[id_index])
@@ -0,0 +1,157 @@
+"""
+Password Hashing
+----------------
+Salted scrypt/PBKDF2 hashes computed in a process pool, with transparent
+upgrade of legacy unsalted SHA-256 hashes
+
+Stored formats:
+    scrypt$n=16384,r=8,p=1$<salt>$<hash>      (base64 salt/hash)
+    pbkdf2_sha256$600000$<salt>$<hash>
+    <64 hex chars>                            (legacy SHA-256, verify only)
+"""
+
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+LEGACY_SHA256 = re.compile(r'^[0-9a-f]{64}$')
+
+# Hashing processes are never forked from the threaded server itself: a
+# fork copies locks other threads hold, which can deadlock the child
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _unb64(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+def _derive(algorithm, params, password, salt):
+    """Run the KDF; module-level so worker processes can import it"""
+    password = password.encode('utf-8')
+    if algorithm == 'scrypt':
+        n, r, p = params['n'], params['r'], params['p']
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES,
+                              maxmem=256 * r * (n + p))
+    return hashlib.pbkdf2_hmac('sha256', password, salt, params['iterations'], dklen=KEY_BYTES)
+
+
+def parse_hash(stored):
+    """
+    (algorithm, params, salt, key) for a stored hash
+
+    Legacy SHA-256 hex digests come back as ('sha256', {}, b'', digest).
+    Raises ValueError for anything else.
+    """
+    if LEGACY_SHA256.match(stored):
+        return 'sha256', {}, b'', bytes.fromhex(stored)
+    parts = stored.split('$')
+    if len(parts) == 4 and parts[0] == 'scrypt':
+        params = dict(item.split('=') for item in parts[1].split(','))
+        if set(params) != {'n', 'r', 'p'}:
+            raise ValueError('scrypt hash needs n, r and p')
+        return 'scrypt', {k: int(v) for k, v in params.items()}, _unb64(parts[2]), _unb64(parts[3])
+    if len(parts) == 4 and parts[0] == 'pbkdf2_sha256':
+        return 'pbkdf2_sha256', {'iterations': int(parts[1])}, _unb64(parts[2]), _unb64(parts[3])
+    raise ValueError('Unrecognized password hash format')
+
+
+def format_hash(algorithm, params, salt, key):
+    if algorithm == 'scrypt':
+        cost = f"n={params['n']},r={params['r']},p={params['p']}"
+        return f"scrypt${cost}${_b64(salt)}${_b64(key)}"
+    return f"pbkdf2_sha256${params['iterations']}${_b64(salt)}${_b64(key)}"
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords off the request threads
+
+    KDF work runs in a pool of `workers` processes, which also caps how many
+    cores hashing can take from request handling; workers=0 hashes inline.
+    The request thread waits for its result but never competes for the
+    GIL or CPU while the KDF runs. Call start() at startup; otherwise the
+    pool starts with the first hash.
+    """
+
+    def __init__(self, algorithm='scrypt', scrypt_n=16384, scrypt_r=8, scrypt_p=1,
+                 pbkdf2_iterations=600000, workers=2, timeout=10):
+        if algorithm not in ('scrypt', 'pbkdf2_sha256'):
+            raise ValueError(f'Unsupported algorithm: {algorithm}')
+        self.algorithm = algorithm
+        if algorithm == 'scrypt':
+            self.params = {'n': scrypt_n, 'r': scrypt_r, 'p': scrypt_p}
+        else:
+            self.params = {'iterations': pbkdf2_iterations}
+        self.workers = workers
+        self.timeout = timeout
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # Verified against for unknown usernames so they take as long as known ones
+        self._dummy_hash = None
+
+    def start(self):
+        """Start the hashing processes (no-op if running or workers=0)"""
+        if not self.workers or self._pool is not None:
+            return
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(START_METHOD))
+
+    def _run(self, algorithm, params, password, salt):
+        if not self.workers:
+            return _derive(algorithm, params, password, salt)
+        self.start()
+        future = self._pool.submit(_derive, algorithm, params, password, salt)
+        return future.result(timeout=self.timeout)
+
+    def hash(self, password):
+        """New salted hash with the configured algorithm and cost"""
+        salt = os.urandom(SALT_BYTES)
+        key = self._run(self.algorithm, self.params, password, salt)
+        return format_hash(self.algorithm, self.params, salt, key)
+
+    def verify(self, password, stored):
+        """True if `password` matches `stored` (any supported format)"""
+        try:
+            algorithm, params, salt, expected = parse_hash(stored or '')
+        except ValueError:
+            return False
+        if algorithm == 'sha256':
+            actual = hashlib.sha256(password.encode('utf-8')).digest()
+        else:
+            actual = self._run(algorithm, params, password, salt)
+        return hmac.compare_digest(actual, expected)
+
+    def verify_dummy(self, password):
+        """Spend a verify's worth of time for a login with an unknown username"""
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash('dummy-password')
+        self.verify(password, self._dummy_hash)
+
+    def needs_rehash(self, stored):
+        """True for legacy hashes and hashes made with another algorithm or cost"""
+        try:
+            algorithm, params, _, _ = parse_hash(stored or '')
+        except ValueError:
+            return False
+        return algorithm != self.algorithm or params != self.params
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
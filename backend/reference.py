@@ -0,0 +1,597 @@
+"""
+Reference Data
+--------------
+Table-driven CRUD for the master tables, with GETs served from immutable
+in-memory snapshots
+
+Each table is described once by a ReferenceTable. The store keeps one
+ReferenceSnapshot per table; a write builds a new snapshot and swaps it in,
+so readers never see a half-built list and never take a lock. GeoTree
+assembles the Country -> State -> City hierarchy from the same snapshots.
+"""
+
+import hashlib
+import threading
+import time
+
+from flask import Response, jsonify, request
+
+from cache import MASTER_TABLES
+
+
+class ReferenceTable:
+    """
+    How one master table is listed and written
+
+    Args:
+        kind: MASTER_TABLES key, shared with MasterDataCache
+        route: URL segment under /api
+        label: Name used in messages ("Sector created successfully")
+        select: SELECT producing one row per item, in `columns` order and
+                already sorted for the unfiltered list
+        columns: Response keys for the selected columns
+        fields: (column, default) written by POST/PUT; a default of None
+                marks the field as required
+        required_message: 400 message when a required field is missing
+        filters: query arg -> response key, e.g. {'country_id': 'CountryID'}
+        writable: Methods to expose besides GET
+        soft_delete: DELETE sets IsActive = 0 instead of removing the row
+        tracks_updates: Table has an UpdatedDate column
+        depends_on: Kinds whose names appear in this table's rows
+        formatters: response key -> function applied to the raw value
+    """
+
+    def __init__(self, kind, route, label, select, columns, fields=(), required_message=None,
+                 filters=None, writable=('POST', 'PUT', 'DELETE'), soft_delete=True,
+                 tracks_updates=True, depends_on=(), formatters=None):
+        self.kind = kind
+        self.route = route
+        self.label = label
+        self.select = select
+        self.columns = columns
+        self.fields = fields
+        self.required_message = required_message
+        self.filters = filters or {}
+        self.writable = writable
+        self.soft_delete = soft_delete
+        self.tracks_updates = tracks_updates
+        self.depends_on = depends_on
+        self.formatters = formatters or {}
+        self.table, self.id_column = MASTER_TABLES[kind][:2]
+
+    def build_row(self, row):
+        item = dict(zip(self.columns, row))
+        for key, formatter in self.formatters.items():
+            item[key] = formatter(item[key])
+        return item
+
+
+REFERENCE_TABLES = [
+    ReferenceTable(
+        'sectors', 'sectors', 'Sector',
+        """
+            SELECT SectorID, SectorName, IsActive
+            FROM Sectors
+            WHERE IsActive = 1
+            ORDER BY SectorName
+        """,
+        ['SectorID', 'SectorName', 'IsActive'],
+        fields=[('SectorName', None)],
+        required_message='Sector name is required',
+    ),
+    ReferenceTable(
+        'countries', 'countries', 'Country',
+        """
+            SELECT CountryID, CountryName, CountryCode, IsActive
+            FROM Countries
+            WHERE IsActive = 1
+            ORDER BY CountryName
+        """,
+        ['CountryID', 'CountryName', 'CountryCode', 'IsActive'],
+        fields=[('CountryName', None), ('CountryCode', '')],
+        required_message='Country name is required',
+    ),
+    ReferenceTable(
+        'states', 'states', 'State',
+        """
+            SELECT s.StateID, s.StateName, s.StateCode, s.CountryID, c.CountryName, s.IsActive
+            FROM States s
+            JOIN Countries c ON s.CountryID = c.CountryID
+            WHERE s.IsActive = 1
+            ORDER BY c.CountryName, s.StateName
+        """,
+        ['StateID', 'StateName', 'StateCode', 'CountryID', 'CountryName', 'IsActive'],
+        fields=[('CountryID', None), ('StateName', None), ('StateCode', '')],
+        required_message='State name and country are required',
+        filters={'country_id': 'CountryID'},
+        depends_on=('countries',),
+    ),
+    ReferenceTable(
+        'cities', 'cities', 'City',
+        """
+            SELECT c.CityID, c.CityName, c.StateID, s.StateName, co.CountryID, co.CountryName, c.IsActive
+            FROM Cities c
+            JOIN States s ON c.StateID = s.StateID
+            JOIN Countries co ON s.CountryID = co.CountryID
+            WHERE c.IsActive = 1
+            ORDER BY co.CountryName, s.StateName, c.CityName
+        """,
+        ['CityID', 'CityName', 'StateID', 'StateName', 'CountryID', 'CountryName', 'IsActive'],
+        fields=[('StateID', None), ('CityName', None)],
+        required_message='City name and state are required',
+        filters={'state_id': 'StateID'},
+        depends_on=('states', 'countries'),
+    ),
+    ReferenceTable(
+        'courses', 'courses', 'Course',
+        """
+            SELECT CourseID, CourseName, CourseType, Description, IsActive
+            FROM Courses
+            WHERE IsActive = 1
+            ORDER BY CourseName
+        """,
+        ['CourseID', 'CourseName', 'CourseType', 'Description', 'IsActive'],
+        fields=[('CourseName', None), ('CourseType', ''), ('Description', '')],
+        required_message='Course name is required',
+    ),
+    ReferenceTable(
+        'skills', 'job-skills-master', 'Skill',
+        """
+            SELECT SkillID, SkillName, Category, IsActive
+            FROM JobSkillsMaster
+            WHERE IsActive = 1
+            ORDER BY SkillName
+        """,
+        ['SkillID', 'SkillName', 'Category', 'IsActive'],
+        fields=[('SkillName', None), ('Category', '')],
+        required_message='Skill name is required',
+        tracks_updates=False,
+    ),
+    ReferenceTable(
+        'companies', 'companies', 'Company',
+        """
+            SELECT CompanyID, CompanyName, CreatedAt
+            FROM Companies
+            ORDER BY CompanyName
+        """,
+        ['CompanyID', 'CompanyName', 'CreatedAt'],
+        fields=[('CompanyName', None)],
+        required_message='Company name is required',
+        writable=('POST',),
+        soft_delete=False,
+    ),
+    ReferenceTable(
+        'job_types', 'job-types', 'Job type',
+        """
+            SELECT JobTypeID, JobTypeName, IsActive
+            FROM JobTypes
+            WHERE IsActive = 1
+            ORDER BY JobTypeName
+        """,
+        ['JobTypeID', 'JobTypeName', 'IsActive'],
+        writable=(),
+    ),
+]
+
+
+def conditional_json(body, etag, version):
+    """JSON response that clients revalidate; 304 when If-None-Match matches"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Data-Version'] = str(version)
+    return response.make_conditional(request)
+
+
+def _serialize(dumps, payload):
+    body = dumps(payload).encode('utf-8')
+    return body, hashlib.sha1(body).hexdigest()[:20]
+
+
+class ReferenceSnapshot:
+    """
+    One immutable version of a table
+
+    The full list response is serialized once at build time; filtered
+    responses are serialized on first request and memoized. The ETag is a
+    hash of the body, so every worker holding the same data hands out the
+    same tag.
+    """
+
+    def __init__(self, spec, version, rows, dumps):
+        self.spec = spec
+        self.version = version
+        self.rows = tuple(rows)
+        self.loaded_at = time.monotonic()
+        self._dumps = dumps
+        self._groups = {}
+        for arg, key in spec.filters.items():
+            groups = {}
+            for item in self.rows:
+                groups.setdefault(item[key], []).append(item)
+            self._groups[arg] = {value: tuple(items) for value, items in groups.items()}
+        self.body, self.etag = self._serialize(self.rows)
+        self._filtered = {}  # (arg, value) -> (body, etag)
+
+    def _serialize(self, rows):
+        return _serialize(self._dumps, {'success': True, 'data': list(rows)})
+
+    def response_body(self, arg=None, value=None):
+        """(body, etag) for the whole table or the rows where `arg` = value"""
+        if arg is None:
+            return self.body, self.etag
+        cached = self._filtered.get((arg, value))
+        if cached is None:
+            cached = self._serialize(self._groups[arg].get(value, ()))
+            self._filtered[(arg, value)] = cached
+        return cached
+
+
+class ReferenceDataStore:
+    """
+    Current snapshot per table, rebuilt after writes
+
+    Snapshots older than `ttl` seconds are rebuilt on the next GET so that
+    writes made by other worker processes show up. Rebuilds of one table
+    are serialized; readers keep using the previous snapshot until the new
+    one is swapped in.
+    """
+
+    def __init__(self, tables, connect, dumps, ttl=300):
+        self.tables = {spec.kind: spec for spec in tables}
+        self.connect = connect
+        self.dumps = dumps
+        self.ttl = ttl
+        self._snapshots = {}  # kind -> ReferenceSnapshot
+        self._stale = set()
+        self._versions = {kind: 0 for kind in self.tables}
+        self._locks = {kind: threading.Lock() for kind in self.tables}
+        self._stats = {'hits': 0, 'not_modified': 0, 'rebuilds': 0}
+
+    def warm(self, cursor):
+        for kind in self.tables:
+            self.rebuild(kind, cursor)
+
+    def snapshot(self, kind):
+        """Current snapshot, loading it first if missing, stale or expired"""
+        current = self._snapshots.get(kind)
+        if current is None or kind in self._stale or time.monotonic() - current.loaded_at > self.ttl:
+            conn = self.connect()
+            try:
+                cursor = conn.cursor()
+                current = self.rebuild(kind, cursor, if_older_than=current)
+                cursor.close()
+            finally:
+                conn.close()
+        return current
+
+    def rebuild(self, kind, cursor, if_older_than=None):
+        """Read the table and swap in a new snapshot"""
+        with self._locks[kind]:
+            current = self._snapshots.get(kind)
+            if if_older_than is not None and current is not if_older_than:
+                return current  # another thread rebuilt it while we waited
+            self._stale.discard(kind)
+            spec = self.tables[kind]
+            cursor.execute(spec.select)
+            rows = [spec.build_row(row) for row in cursor.fetchall()]
+            self._versions[kind] += 1
+            current = ReferenceSnapshot(spec, self._versions[kind], rows, self.dumps)
+            self._snapshots[kind] = current
+            self._stats['rebuilds'] += 1
+            return current
+
+    def refresh(self, kind, cursor):
+        """Rebuild a table and every table that shows its names"""
+        self.rebuild(kind, cursor)
+        for other, spec in self.tables.items():
+            if kind in spec.depends_on:
+                self.rebuild(other, cursor)
+
+    def invalidate(self, *kinds):
+        """Rebuild these tables (and dependents) on their next GET"""
+        for kind in kinds:
+            self._stale.add(kind)
+            self._stale.update(other for other, spec in self.tables.items()
+                               if kind in spec.depends_on)
+
+    def stats(self):
+        snapshot = dict(self._stats)
+        snapshot['tables'] = {
+            kind: {'version': s.version, 'rows': len(s.rows), 'bytes': len(s.body),
+                   'age_seconds': round(time.monotonic() - s.loaded_at, 1)}
+            for kind, s in list(self._snapshots.items())
+        }
+        return snapshot
+
+    # ---------- HTTP ----------
+
+    def serve(self, kind):
+        """GET handler body: the snapshot as JSON, or 304 for a matching If-None-Match"""
+        spec = self.tables[kind]
+        arg = value = None
+        for name in spec.filters:
+            raw = request.args.get(name)
+            if raw:
+                try:
+                    arg, value = name, int(raw)
+                except ValueError:
+                    return jsonify({'success': False, 'message': f'{name} must be an integer'}), 400
+                break
+
+        snapshot = self.snapshot(kind)
+        body, etag = snapshot.response_body(arg, value)
+        response = conditional_json(body, etag, snapshot.version)
+        self._stats['not_modified' if response.status_code == 304 else 'hits'] += 1
+        return response
+
+    def create(self, kind, cursor, data):
+        """
+        INSERT one row from a request body
+
+        Returns:
+            int or None: new ID, or None when a required field is missing
+        """
+        spec = self.tables[kind]
+        values = self._values(spec, data)
+        if values is None:
+            return None
+        columns = [column for column, _ in spec.fields]
+        placeholders = ['?'] * len(columns)
+        if spec.soft_delete:
+            columns.append('IsActive')
+            placeholders.append('1')
+        cursor.execute(f"""
+            INSERT INTO {spec.table} ({', '.join(columns)}, CreatedAt)
+            OUTPUT INSERTED.{spec.id_column}
+            VALUES ({', '.join(placeholders)}, GETDATE())
+        """, values)
+        return int(cursor.fetchone()[0])
+
+    def update(self, kind, cursor, row_id, data):
+        """UPDATE one row from a request body; False when a required field is missing"""
+        spec = self.tables[kind]
+        values = self._values(spec, data)
+        if values is None:
+            return False
+        assignments = [f'{column} = ?' for column, _ in spec.fields]
+        if spec.tracks_updates:
+            assignments.append('UpdatedDate = GETDATE()')
+        cursor.execute(f"""
+            UPDATE {spec.table}
+            SET {', '.join(assignments)}
+            WHERE {spec.id_column} = ?
+        """, values + [row_id])
+        return True
+
+    def delete(self, kind, cursor, row_id):
+        """Soft delete one row"""
+        spec = self.tables[kind]
+        updated = ', UpdatedDate = GETDATE()' if spec.tracks_updates else ''
+        cursor.execute(f"""
+            UPDATE {spec.table}
+            SET IsActive = 0{updated}
+            WHERE {spec.id_column} = ?
+        """, (row_id,))
+
+    @staticmethod
+    def _values(spec, data):
+        values = []
+        for column, default in spec.fields:
+            value = data.get(column, default)
+            if default is None and not value:
+                return None
+            values.append(value)
+        return values
+
+
+# ---------- Geography tree ----------
+
+GEO_KINDS = ('countries', 'states', 'cities')
+GEO_DEPTHS = ('country', 'state', 'city')
+
+
+class GeoTree:
+    """
+    Country -> State -> City hierarchy assembled from the reference snapshots
+
+    The tree is rebuilt only when one of the three snapshots is replaced;
+    each distinct subtree/depth response is serialized once per tree.
+    Nodes are {id, name, code, states}, {id, name, code, cities} and
+    {id, name}, in name order. Only active rows under active parents appear.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._tree = None
+        self._lock = threading.Lock()
+        self._stats = {'builds': 0, 'hits': 0, 'not_modified': 0}
+
+    def current(self):
+        """Tree for the current snapshots, rebuilding it if any of them changed"""
+        sources = tuple(self.store.snapshot(kind) for kind in GEO_KINDS)
+        tree = self._tree
+        if tree is None or any(a is not b for a, b in zip(tree.sources, sources)):
+            with self._lock:
+                tree = self._tree
+                if tree is None or any(a is not b for a, b in zip(tree.sources, sources)):
+                    tree = _GeoSnapshot(sources, self.store.dumps)
+                    self._tree = tree
+                    self._stats['builds'] += 1
+        return tree
+
+    def serve(self):
+        """
+        GET handler body for ?country_id=, ?state_id= and ?depth=country|state|city
+        """
+        depth = (request.args.get('depth') or 'city').lower()
+        if depth not in GEO_DEPTHS:
+            return jsonify({'success': False,
+                            'message': f"depth must be one of: {', '.join(GEO_DEPTHS)}"}), 400
+        scope = node_id = None
+        for name in ('state_id', 'country_id'):
+            raw = request.args.get(name)
+            if raw:
+                try:
+                    scope, node_id = name, int(raw)
+                except ValueError:
+                    return jsonify({'success': False, 'message': f'{name} must be an integer'}), 400
+                break
+
+        tree = self.current()
+        found = tree.response_body(scope, node_id, depth)
+        if found is None:
+            return jsonify({'success': False, 'message': 'Not found'}), 404
+        body, etag = found
+        response = conditional_json(body, etag, tree.version)
+        self._stats['not_modified' if response.status_code == 304 else 'hits'] += 1
+        return response
+
+    def stats(self):
+        snapshot = dict(self._stats)
+        tree = self._tree
+        if tree is not None:
+            snapshot.update({'version': tree.version, 'countries': len(tree.countries),
+                             'states': len(tree.states), 'cities': tree.city_count,
+                             'bytes': len(tree.body)})
+        return snapshot
+
+
+class _GeoSnapshot:
+    """One immutable tree built from a (countries, states, cities) snapshot triple"""
+
+    def __init__(self, sources, dumps):
+        self.sources = sources
+        self.version = '.'.join(str(s.version) for s in sources)
+        self._dumps = dumps
+        countries, states, cities = sources
+
+        self.countries = {}
+        self.roots = []
+        for row in countries.rows:
+            node = {'id': row['CountryID'], 'name': row['CountryName'],
+                    'code': row['CountryCode'], 'states': []}
+            self.countries[node['id']] = node
+            self.roots.append(node)
+
+        # States and cities snapshots are sorted by parent name, then name
+        self.states = {}
+        for row in states.rows:
+            parent = self.countries.get(row['CountryID'])
+            if parent is not None:
+                node = {'id': row['StateID'], 'name': row['StateName'],
+                        'code': row['StateCode'], 'cities': []}
+                parent['states'].append(node)
+                self.states[node['id']] = node
+
+        self.city_count = 0
+        for row in cities.rows:
+            parent = self.states.get(row['StateID'])
+            if parent is not None:
+                parent['cities'].append({'id': row['CityID'], 'name': row['CityName']})
+                self.city_count += 1
+
+        self._bodies = {}  # (scope, id, depth) -> (body, etag)
+        self.body, _ = self.response_body(None, None, 'city')
+
+    def response_body(self, scope, node_id, depth):
+        """(body, etag) for the whole tree or one subtree; None if the node is unknown"""
+        key = (scope, node_id, depth)
+        cached = self._bodies.get(key)
+        if cached is not None:
+            return cached
+        if scope is None:
+            nodes = self.roots
+        else:
+            node = (self.states if scope == 'state_id' else self.countries).get(node_id)
+            if node is None:
+                return None
+            nodes = [node]
+        cached = _serialize(self._dumps, {'success': True,
+                                          'data': [_prune(node, depth) for node in nodes]})
+        self._bodies[key] = cached
+        return cached
+
+
+def _prune(node, depth):
+    """Copy of `node` without levels below `depth` (the full tree is shared, not copied)"""
+    if depth == 'city':
+        return node
+    if 'states' in node:
+        if depth == 'country':
+            return {k: v for k, v in node.items() if k != 'states'}
+        return dict(node, states=[_prune(child, depth) for child in node['states']])
+    return {k: v for k, v in node.items() if k != 'cities'}
+
+
+def register_reference_routes(app, store, on_change):
+    """
+    Add GET/POST/PUT/DELETE endpoints for every table in `store`
+
+    `on_change(kind, action, data)` runs after each committed write, with
+    action 'create', 'update' or 'delete' and the request body (None for
+    deletes).
+    """
+    for spec in store.tables.values():
+        _register_table(app, store, spec, on_change)
+
+
+def _register_table(app, store, spec, on_change):
+    kind, label = spec.kind, spec.label
+    endpoint = spec.route.replace('-', '_')
+
+    def write(action, row_id=None):
+        try:
+            data = request.get_json() if action != 'delete' else None
+            conn = store.connect()
+            cursor = conn.cursor()
+
+            if action == 'create':
+                row_id = store.create(kind, cursor, data or {})
+                ok = row_id is not None
+            elif action == 'update':
+                ok = store.update(kind, cursor, row_id, data or {})
+            else:
+                store.delete(kind, cursor, row_id)
+                ok = True
+            if not ok:
+                cursor.close()
+                conn.close()
+                return jsonify({'success': False, 'message': spec.required_message}), 400
+
+            conn.commit()
+            # Rebuild before answering so the caller's next GET sees the write
+            store.refresh(kind, cursor)
+            cursor.close()
+            conn.close()
+
+            on_change(kind, action, data)
+
+            past = {'create': 'created', 'update': 'updated', 'delete': 'deleted'}[action]
+            body = {'success': True, 'message': f'{label} {past} successfully'}
+            if action == 'create':
+                body['id'] = row_id
+                return jsonify(body), 201
+            return jsonify(body)
+
+        except Exception as e:
+            print(f"❌ ERROR in {action}_{endpoint}: {str(e)}")
+            return jsonify({'success': False, 'message': str(e)}), 500
+
+    def get_all():
+        try:
+            return store.serve(kind)
+        except Exception as e:
+            print(f"❌ ERROR in get_{endpoint}: {str(e)}")
+            return jsonify({'success': False, 'message': str(e)}), 500
+
+    base = f'/api/{spec.route}'
+    app.add_url_rule(base, f'get_{endpoint}', get_all, methods=['GET'])
+    if 'POST' in spec.writable:
+        app.add_url_rule(base, f'create_{endpoint}', lambda: write('create'), methods=['POST'])
+    if 'PUT' in spec.writable:
+        app.add_url_rule(f'{base}/<int:row_id>', f'update_{endpoint}',
+                         lambda row_id: write('update', row_id), methods=['PUT'])
+    if 'DELETE' in spec.writable:
+        app.add_url_rule(f'{base}/<int:row_id>', f'delete_{endpoint}',
+                         lambda row_id: write('delete', row_id), methods=['DELETE'])
@@ -0,0 +1,318 @@
+"""
+Job Search Index
+----------------
+In-process inverted index with BM25 ranking over job title, description,
+company name and skill names
+
+Built from the Jobs/JobSkills tables and kept current by this process's
+job write endpoints, so keyword search never scans the Jobs table. Other
+workers' writes arrive through a background rebuild.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'our', 'the', 'to', 'we', 'will', 'with', 'you', 'your'
+})
+
+# Terms in at least this many jobs are pre-scored after a full load
+WARM_MIN_DF = 1000
+
+# Field boosts are applied as term-frequency multipliers
+FIELD_WEIGHTS = {
+    'title': 3,
+    'company': 2,
+    'skills': 2,
+    'description': 1,
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens, keeping things like c++, c# and node.js intact"""
+    if not text:
+        return []
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+class JobSearchIndex:
+    """
+    Inverted index of active jobs
+
+    postings maps term -> {JobID: weighted term frequency}. All reads and
+    writes take one lock; a query only touches the postings of its own terms.
+
+    load() builds a new index beside the current one and swaps it in, so
+    searches keep working during a rebuild; writes made meanwhile are
+    replayed onto the new index. reload_in_background() does that from
+    `connect` in one thread, after `reload_after` seconds (see needs_reload)
+    or when another worker has changed the jobs.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    RETRY_AFTER = 30  # Seconds before a failed background rebuild is retried
+
+    def __init__(self, connect=None, reload_after=600):
+        self.connect = connect
+        self.reload_after = reload_after
+        self.postings = {}
+        self.doc_lengths = {}
+        self.doc_fields = {}
+        self.total_length = 0
+        self.loaded = False
+        self._lock = threading.RLock()
+        # term -> {JobID: BM25 contribution}, valid for the stats in _scored_at
+        self._impacts = {}
+        self._scored_at = (0, 0.0)
+        self._loaded_at = None
+        self._replay = None  # writes made while a load runs, as (method, args)
+        self._reloading = False
+        self._retry_at = 0.0
+
+    # ---------- building ----------
+
+    def load(self, cursor):
+        """(Re)build the index from every active job"""
+        with self._lock:
+            self._replay = []
+        try:
+            jobs = self._read_jobs(cursor)
+        except Exception:
+            with self._lock:
+                self._replay = None
+            raise
+
+        fresh = JobSearchIndex()
+        for job_id, fields in jobs.items():
+            fresh._add_locked(job_id, fields)
+        with self._lock:
+            self.postings = fresh.postings
+            self.doc_lengths = fresh.doc_lengths
+            self.doc_fields = fresh.doc_fields
+            self.total_length = fresh.total_length
+            self._impacts = {}
+            self._scored_at = (0, 0.0)
+            self.loaded = True
+            self._loaded_at = time.monotonic()
+            for method, args in self._replay:
+                method(*args)
+            self._replay = None
+        self.warm()
+        print(f"✓ Job search index built: {len(jobs)} jobs, {len(self.postings)} terms")
+
+    def _read_jobs(self, cursor):
+        cursor.execute("""
+            SELECT j.JobID, j.JobTitle, j.JobDescription, c.CompanyName
+            FROM Jobs j
+            LEFT JOIN Companies c ON j.CompanyID = c.CompanyID
+            WHERE j.IsActive = 1
+        """)
+        jobs = {row[0]: {'title': row[1], 'description': row[2], 'company': row[3], 'skills': []}
+                for row in cursor.fetchall()}
+
+        cursor.execute("""
+            SELECT js.JobID, jsm.SkillName
+            FROM JobSkills js
+            JOIN JobSkillsMaster jsm ON js.SkillID = jsm.SkillID
+            JOIN Jobs j ON js.JobID = j.JobID
+            WHERE j.IsActive = 1
+        """)
+        for job_id, skill_name in cursor.fetchall():
+            if job_id in jobs:
+                jobs[job_id]['skills'].append(skill_name)
+        return jobs
+
+    def needs_reload(self):
+        """True once the index is older than reload_after seconds"""
+        with self._lock:
+            return (self.loaded and self.reload_after is not None
+                    and time.monotonic() - self._loaded_at > self.reload_after)
+
+    def reload_in_background(self):
+        """Rebuild from the database in a background thread unless one is already running"""
+        with self._lock:
+            if self._reloading or time.monotonic() < self._retry_at:
+                return
+            self._reloading = True
+
+        def run():
+            try:
+                conn = self.connect()
+                try:
+                    cursor = conn.cursor()
+                    self.load(cursor)
+                    cursor.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                with self._lock:
+                    self._retry_at = time.monotonic() + self.RETRY_AFTER
+                print(f"❌ ERROR rebuilding job search index: {str(e)}")
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=run, name='job-index-reload', daemon=True).start()
+
+    def add(self, job_id, title=None, description=None, company=None, skills=None):
+        """Index a new job (replacing any previous version of it)"""
+        fields = {'title': title, 'description': description,
+                  'company': company, 'skills': list(skills or [])}
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((self._replace_locked, (job_id, fields)))
+            if self.loaded:
+                self._replace_locked(job_id, fields)
+
+    def update(self, job_id, **changes):
+        """Re-index a job with some fields changed (e.g. title=..., description=...)"""
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((self._update_locked, (job_id, changes)))
+            if self.loaded:
+                self._update_locked(job_id, changes)
+
+    def remove(self, job_id):
+        """Drop a job from the index"""
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((self._remove_locked, (job_id,)))
+            self._remove_locked(job_id)
+
+    def _replace_locked(self, job_id, fields):
+        self._remove_locked(job_id)
+        self._add_locked(job_id, fields)
+
+    def _update_locked(self, job_id, changes):
+        if job_id not in self.doc_fields:
+            return
+        fields = dict(self.doc_fields[job_id])
+        fields.update({k: v for k, v in changes.items() if k in FIELD_WEIGHTS})
+        self._replace_locked(job_id, fields)
+
+    def _add_locked(self, job_id, fields):
+        terms = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = fields.get(field)
+            text = ' '.join(value) if isinstance(value, list) else value
+            for token in tokenize(text):
+                terms[token] += weight
+
+        length = sum(terms.values())
+        self.doc_lengths[job_id] = length
+        self.doc_fields[job_id] = fields
+        self.total_length += length
+
+        for term, frequency in terms.items():
+            postings = self.postings.setdefault(term, {})
+            postings[job_id] = frequency
+            # Patch cached scores in place so a write does not force a rescore
+            cached = self._impacts.get(term)
+            if cached is not None:
+                cached[job_id] = self._impact(frequency, length, len(postings))
+
+    def _remove_locked(self, job_id):
+        fields = self.doc_fields.pop(job_id, None)
+        if fields is None:
+            return
+        self.total_length -= self.doc_lengths.pop(job_id, 0)
+        for field in FIELD_WEIGHTS:
+            value = fields.get(field)
+            text = ' '.join(value) if isinstance(value, list) else value
+            for token in set(tokenize(text)):
+                postings = self.postings.get(token)
+                if postings is not None:
+                    postings.pop(job_id, None)
+                    self._impacts.get(token, {}).pop(job_id, None)
+                    if not postings:
+                        del self.postings[token]
+                        self._impacts.pop(token, None)
+
+    # ---------- querying ----------
+
+    def search(self, query, limit=20):
+        """
+        Rank jobs against a free-text query with BM25
+
+        Returns:
+            list: (JobID, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            if not terms or not self.doc_lengths:
+                return []
+            self._check_drift()
+            impacts = [self._term_impacts(term) for term in terms if term in self.postings]
+            if not impacts:
+                return []
+
+            # Start from the longest postings list so the copy is done in C
+            impacts.sort(key=len, reverse=True)
+            scores = dict(impacts[0])
+            for term_impacts in impacts[1:]:
+                for job_id, impact in term_impacts.items():
+                    scores[job_id] = scores.get(job_id, 0.0) + impact
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _check_drift(self):
+        """
+        Drop cached scores once the collection size or average document
+        length has drifted more than 1% from the values they were scored with
+        """
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count
+        scored_count, scored_avg = self._scored_at
+        if (abs(doc_count - scored_count) > 0.01 * scored_count
+                or abs(avg_length - scored_avg) > 0.01 * scored_avg):
+            self._impacts = {}
+            self._scored_at = (doc_count, avg_length)
+
+    def _impact(self, tf, length, df):
+        doc_count, avg_length = self._scored_at
+        idf = math.log(1 + max(doc_count - df + 0.5, 0.5) / (df + 0.5))
+        k1, b = self.K1, self.B
+        return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avg_length))
+
+    def _term_impacts(self, term):
+        """Per-document BM25 contribution of one term, cached between queries"""
+        cached = self._impacts.get(term)
+        if cached is None:
+            postings = self.postings[term]
+            doc_count, avg_length = self._scored_at
+            df = len(postings)
+            idf = math.log(1 + max(doc_count - df + 0.5, 0.5) / (df + 0.5))
+            k1, b, lengths = self.K1, self.B, self.doc_lengths
+            scale = idf * (k1 + 1)
+            base = k1 * (1 - b)
+            per_length = k1 * b / avg_length
+            cached = {job_id: scale * tf / (tf + base + per_length * lengths[job_id])
+                      for job_id, tf in postings.items()}
+            self._impacts[term] = cached
+        return cached
+
+    def warm(self, min_df=WARM_MIN_DF):
+        """Pre-score common terms, whose first query would otherwise be the slowest"""
+        with self._lock:
+            if not self.doc_lengths:
+                return
+            self._check_drift()
+            for term, postings in self.postings.items():
+                if len(postings) >= min_df:
+                    self._term_impacts(term)
+
+    def stats(self):
+        """Index size counters"""
+        with self._lock:
+            return {
+                'loaded': self.loaded,
+                'documents': len(self.doc_lengths),
+                'terms': len(self.postings),
+            }
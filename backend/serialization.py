@@ -0,0 +1,109 @@
+"""
+JSON Serialization
+------------------
+Flask JSON provider used for every API response
+
+Encodes with orjson when it is installed and falls back to the standard
+library otherwise; both produce the same JSON for the values the views
+return. Values straight from pyodbc rows need no conversion in the views:
+datetime/date/time become ISO 8601 strings and Decimal becomes a number.
+
+Large payloads can be sent with FastJSONProvider.stream(), which encodes list
+items in batches as the response is written instead of building one big
+string first.
+"""
+
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the standard library is used instead
+    orjson = None
+
+
+def _default(value):
+    """Types neither encoder handles natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(',', ':'))
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj):
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps_bytes(obj):
+        return _encoder.encode(obj).encode('utf-8')
+
+
+def iter_json(obj, batch=200):
+    """
+    Yield the encoding of `obj` in pieces
+
+    A list, or a dict holding lists, is split so that each piece holds at
+    most `batch` list items; anything else is one piece. Joined, the pieces
+    equal dumps_bytes(obj).
+    """
+    if isinstance(obj, list):
+        yield from _iter_list(obj, batch)
+        return
+    if not isinstance(obj, dict) or not any(isinstance(v, list) for v in obj.values()):
+        yield dumps_bytes(obj)
+        return
+    yield b'{'
+    for i, (key, value) in enumerate(obj.items()):
+        yield (b',' if i else b'') + dumps_bytes(str(key)) + b':'
+        if isinstance(value, list):
+            yield from _iter_list(value, batch)
+        else:
+            yield dumps_bytes(value)
+    yield b'}'
+
+
+def _iter_list(items, batch):
+    if not items:
+        yield b'[]'
+        return
+    for start in range(0, len(items), batch):
+        piece = dumps_bytes(items[start:start + batch])  # "[a,b,...]"
+        yield (b'[' if start == 0 else b',') + piece[1:-1]
+    yield b']'
+
+
+class FastJSONProvider(JSONProvider):
+    """orjson-backed (when available) replacement for Flask's DefaultJSONProvider"""
+
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+    def stream(self, obj, batch=200):
+        """Chunked response encoding `obj` with iter_json as it is sent"""
+        return self._app.response_class(iter_json(obj, batch), mimetype=self.mimetype)
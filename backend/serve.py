@@ -0,0 +1,332 @@
+"""
+Production Server
+-----------------
+Pre-fork, multi-threaded WSGI server for the API; use this instead of
+`python app.py`, which runs Flask's single-process debug server
+
+The supervisor binds the listening socket once and forks the workers. Each
+worker imports the app itself (database connections, caches and the
+password hashing pool are never shared across a fork), pre-warms its
+connection pool and caches, and then serves the shared socket with a fixed
+pool of request threads. Dead workers are replaced.
+
+Signals (POSIX):
+    SIGTERM / SIGINT  graceful shutdown: workers stop accepting, let in-flight
+                      requests finish (up to SERVER_DRAIN_SECONDS), flush
+                      counters and exit
+    SIGHUP            graceful reload: a new set of workers (with freshly
+                      imported code) is started, then the old set is drained
+
+Windows has no fork: one process serves with SERVER_THREADS threads and
+CTRL+C drains it.
+
+Usage:
+    python serve.py [--host H] [--port P] [--workers N] [--threads N]
+
+Throughput (python benchmark.py serving_throughput: GET /api/health, 16
+clients, measured on a single CPU shared with the load generator):
+    app.run(debug=True)   645 req/s   p99 42.6 ms
+    serve.py 1x8          888 req/s   p99 28.2 ms
+    serve.py 4x8          968 req/s   p99 53.6 ms
+Workers scale with cores, so on a multi-core host the 4-worker figure
+grows roughly with the core count while the debug server stays on one.
+
+Per-worker state. Every worker keeps its own in-memory copies; run the
+migrations (003 and 004 in particular) before starting more than one.
+    Shared through DataVersions, read before each request: job response
+    cache, token revocations (logout), job search index and skill matcher
+    (rebuilt in the background, so they lag another worker's write by one
+    rebuild), availability Bloom filters (checks go to the database until
+    the rebuild lands). Workers share the token signing key, from
+    TOKEN_SECRET or generated here before the fork.
+    Refreshed on a timer only: master-data ID cache (create_job re-checks
+    the database before inserting), reference snapshots and the geo tree,
+    autocomplete frequencies.
+    Loaded at startup: skill normalizer spellings (a skill another worker
+    added is still matched case-insensitively to its master row).
+    Local to the worker: buffered visitor/download counters and unique
+    visitor sketches (written every COUNTER_FLUSH_INTERVAL_SECONDS; counts
+    in responses include only this worker's pending hits), password
+    hashing processes, database connection pool.
+"""
+
+import argparse
+import importlib
+import os
+import secrets
+import select
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from config import Config
+
+
+class RequestHandler(WSGIRequestHandler):
+    """One request per connection, so a pooled thread is never parked on an idle keep-alive"""
+
+    protocol_version = 'HTTP/1.0'
+
+    def log_request(self, code='-', size='-'):
+        pass  # No per-request access log; errors are still logged
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    WSGI server handing each accepted connection to a fixed pool of threads
+
+    When every thread is busy the accept loop waits for one to free up, so
+    excess connections queue in the kernel backlog (where another worker
+    can pick them up) instead of piling up as threads.
+    """
+
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd=None):
+        super().__init__(host, port, app, handler=RequestHandler, fd=fd)
+        self.threads = threads
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix='http')
+        self._slots = threading.BoundedSemaphore(threads)
+        self._idle = threading.Condition()
+        self._in_flight = 0
+
+    def process_request(self, request, client_address):
+        self._slots.acquire()
+        with self._idle:
+            self._in_flight += 1
+        self._executor.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+            self._slots.release()
+
+    def drain(self, timeout):
+        """
+        Wait for in-flight requests (call after serve_forever has returned)
+
+        Returns:
+            int: Requests still running when the timeout expired
+        """
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight and time.monotonic() < deadline:
+                self._idle.wait(deadline - time.monotonic())
+            remaining = self._in_flight
+        self._executor.shutdown(wait=not remaining, cancel_futures=True)
+        return remaining
+
+
+# ==========================================
+# WORKER
+# ==========================================
+
+def run_worker(host, port, threads, drain, fd=None, on_ready=None):
+    """Import the app, warm it up and serve until SIGTERM/SIGINT; returns when drained"""
+    import config
+    importlib.reload(config)  # a reload picks up edited settings as well as code
+    import app as api
+
+    try:
+        opened = api.Config.get_pool().prewarm(threads)
+    except Exception as e:
+        opened = 0
+        print(f"⚠️  Warning: Connection pool not pre-warmed, connections will open on demand: {e}")
+    api.warm_caches()
+    server = PooledWSGIServer(host, port, api.app, threads, fd=fd)
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so not from this thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)  # reloads are the supervisor's job
+
+    print(f"✓ Worker {os.getpid()} serving on {host}:{server.port} "
+          f"with {threads} threads ({opened} pooled connections)")
+    if on_ready is not None:
+        on_ready()
+    server.serve_forever()
+
+    # Stop accepting first so the other workers get the new connections
+    server.socket.close()
+    unfinished = server.drain(drain)
+    if unfinished:
+        print(f"⚠️  Worker {os.getpid()}: {unfinished} requests still running after {drain}s")
+    api.shutdown_services()
+    print(f"✓ Worker {os.getpid()} stopped")
+
+
+# ==========================================
+# SUPERVISOR
+# ==========================================
+
+class Supervisor:
+    """Forks and replaces workers; SIGHUP swaps in a new generation of them"""
+
+    READY_TIMEOUT = 120  # Longest a reload waits for new workers to warm up
+
+    def __init__(self, host, port, workers, threads, drain):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.drain = drain
+        self.generation = 0
+        self._children = {}  # pid -> generation
+        self._stopping = False
+        self._reload = False
+
+    def run(self):
+        listener = socket.create_server((self.host, self.port), backlog=2048)
+        listener.set_inheritable(True)
+        self.port = listener.getsockname()[1]
+        self._listener = listener
+
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+
+        print(f"✓ Supervisor {os.getpid()}: {self.workers} workers x {self.threads} threads "
+              f"on http://{self.host}:{self.port}")
+        self._spawn_generation()
+        # Handlers only set flags; the loop polls them (and reaps dead workers)
+        while not self._stopping:
+            time.sleep(0.2)
+            if self._reload:
+                self._reload = False
+                self._do_reload()
+            self._reap(respawn=True)
+        self._shutdown()
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def _on_reload(self, signum, frame):
+        self._reload = True
+
+    def _spawn_generation(self, wait_ready=False):
+        """Start a full set of workers; with wait_ready, return once they are serving"""
+        pipes = [self._spawn(ready_pipe=wait_ready) for _ in range(self.workers)]
+        if not wait_ready:
+            return
+        deadline = time.monotonic() + self.READY_TIMEOUT
+        pending = list(pipes)
+        while pending and time.monotonic() < deadline:
+            readable, _, _ = select.select(pending, [], [], deadline - time.monotonic())
+            for fd in readable:
+                os.read(fd, 1)  # b'' if the worker died first; stop waiting for it either way
+                pending.remove(fd)
+        for fd in pipes:
+            os.close(fd)
+
+    def _spawn(self, ready_pipe=False):
+        read_fd, write_fd = os.pipe() if ready_pipe else (None, None)
+        pid = os.fork()
+        if pid == 0:
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(signum, signal.SIG_DFL)
+            if read_fd is not None:
+                os.close(read_fd)
+            code = 0
+            try:
+                run_worker(self.host, self.port, self.threads, self.drain,
+                           fd=self._listener.fileno(),
+                           on_ready=(lambda: os.write(write_fd, b'1')) if write_fd else None)
+            except BaseException as e:
+                print(f"❌ ERROR in worker {os.getpid()}: {str(e)}")
+                code = 1
+            finally:
+                sys.stdout.flush()
+                os._exit(code)
+        self._children[pid] = self.generation
+        if write_fd is not None:
+            os.close(write_fd)
+        return read_fd
+
+    def _do_reload(self):
+        old = [pid for pid, generation in self._children.items() if generation == self.generation]
+        self.generation += 1
+        print(f"✓ Reloading: starting generation {self.generation}, draining {len(old)} workers")
+        # The old workers keep serving until the new ones have warmed up
+        self._spawn_generation(wait_ready=True)
+        self._signal(old, signal.SIGTERM)
+
+    def _reap(self, respawn):
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation = self._children.pop(pid, None)
+            if respawn and generation == self.generation and not self._stopping:
+                print(f"⚠️  Worker {pid} exited ({status}); starting a replacement")
+                time.sleep(0.5)  # don't spin if workers die on startup
+                self._spawn()
+
+    def _shutdown(self):
+        print(f"✓ Shutting down {len(self._children)} workers "
+              f"(up to {self.drain}s for in-flight requests)")
+        self._listener.close()
+        self._signal(list(self._children), signal.SIGTERM)
+        deadline = time.monotonic() + self.drain + 5
+        while self._children and time.monotonic() < deadline:
+            self._reap(respawn=False)
+            time.sleep(0.1)
+        self._signal(list(self._children), signal.SIGKILL)
+        self._reap(respawn=False)
+
+    @staticmethod
+    def _signal(pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Resume Builder API production server')
+    parser.add_argument('--host', default=Config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS)
+    parser.add_argument('--threads', type=int, default=Config.SERVER_THREADS)
+    parser.add_argument('--drain', type=float, default=Config.SERVER_DRAIN_SECONDS)
+    args = parser.parse_args(argv)
+
+    if not Config.TOKEN_SECRET:
+        # Every worker (and every reload) must sign with the same key
+        os.environ['TOKEN_SECRET'] = secrets.token_hex(32)
+        print("⚠️  Warning: TOKEN_SECRET is not set; generated one for this server, "
+              "so logins end when it stops")
+
+    if args.threads > Config.POOL_MAX_SIZE:
+        print(f"⚠️  Warning: {args.threads} threads share {Config.POOL_MAX_SIZE} pooled "
+              f"connections per worker; raise POOL_MAX_SIZE to match")
+
+    if not hasattr(os, 'fork'):
+        if args.workers > 1:
+            print("⚠️  Warning: no fork on this platform; serving with 1 worker")
+        run_worker(args.host, args.port, args.threads, args.drain)
+        return
+    Supervisor(args.host, args.port, args.workers, args.threads, args.drain).run()
+
+
+if __name__ == '__main__':
+    main()
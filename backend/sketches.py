@@ -0,0 +1,456 @@
+"""
+Probabilistic Sketches
+----------------------
+Fixed-size summaries for counting and membership at traffic scale
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+
+def hash64(value):
+    """Stable 64-bit hash of a string or bytes (the same in every process)"""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big')
+
+
+# ==========================================
+# HYPERLOGLOG
+# ==========================================
+
+class HyperLogLog:
+    """
+    Cardinality estimator with 2**precision one-byte registers
+
+    Standard error is about 1.04 / sqrt(2**precision): 1.6% at 12, 0.8%
+    at 14. Sketches of equal precision merge by register-wise max, so
+    workers and time buckets can be combined without double counting.
+    """
+
+    def __init__(self, precision=14, registers=None):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18')
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self.registers = np.zeros(self.size, dtype=np.uint8)
+        else:
+            self.registers = np.frombuffer(bytes(registers), dtype=np.uint8).copy()
+            if self.registers.size != self.size:
+                raise ValueError('register count does not match precision')
+
+    def add(self, value):
+        self.add_hash(hash64(value))
+
+    def add_hash(self, hashed):
+        """Add a value already hashed with hash64; returns True if the sketch changed"""
+        rest_bits = 64 - self.precision
+        index = hashed >> rest_bits
+        rank = rest_bits - (hashed & ((1 << rest_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other):
+        """Union `other` into this sketch (in place)"""
+        if other.precision != self.precision:
+            raise ValueError('cannot merge sketches of different precision')
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self):
+        return HyperLogLog(self.precision, self.registers.tobytes())
+
+    def estimate(self):
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.ldexp(1.0, -self.registers.astype(np.int32)).sum())
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))  # linear counting for small sets
+        return int(round(raw))
+
+    def to_bytes(self):
+        return self.registers.tobytes()
+
+
+class UniqueVisitorTracker:
+    """
+    HyperLogLog sketches of visitor IDs: lifetime, per day and per resume
+
+    Sketch keys are 'global', 'day:YYYY-MM-DD' and 'resume:<ResumeID>'.
+    Sketches that changed are merged into VisitorSketches by persist(),
+    which the counter flusher calls in its transaction. Every process
+    folds the stored sketch into its own, so estimates cover all workers.
+    Clean per-day/per-resume sketches beyond `max_sketches` are dropped
+    from memory; they are reloaded from the table when needed.
+    """
+
+    def __init__(self, global_precision=14, resume_precision=10, max_sketches=10000):
+        self.global_precision = global_precision
+        self.resume_precision = resume_precision
+        self.max_sketches = max_sketches
+        self._sketches = OrderedDict()  # key -> HyperLogLog
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def precision_for(self, key):
+        return self.resume_precision if key.startswith('resume:') else self.global_precision
+
+    def add(self, visitor_id, resume_id=None, day=None):
+        """Record one visit by `visitor_id` (to a resume, if given)"""
+        hashed = hash64(visitor_id)
+        keys = ['global', f'day:{(day or date.today()).isoformat()}']
+        if resume_id is not None:
+            keys.append(f'resume:{resume_id}')
+        with self._lock:
+            for key in keys:
+                if self._sketch_locked(key).add_hash(hashed):
+                    self._dirty.add(key)
+            self._evict_locked()
+
+    def _sketch_locked(self, key):
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = HyperLogLog(self.precision_for(key))
+        else:
+            self._sketches.move_to_end(key)
+        return sketch
+
+    def _evict_locked(self):
+        if len(self._sketches) <= self.max_sketches:
+            return
+        for key in list(self._sketches):
+            if len(self._sketches) <= self.max_sketches:
+                break
+            if key != 'global' and key not in self._dirty:
+                del self._sketches[key]
+
+    # ---------- persistence ----------
+
+    def persist(self, cursor):
+        """Merge changed sketches into VisitorSketches (caller commits)"""
+        with self._lock:
+            dirty = {key: self._sketches[key].copy() for key in self._dirty}
+            self._dirty = set()
+        if not dirty:
+            return 0
+        try:
+            stored = self._fetch(cursor, list(dirty), lock=True)
+            for key, sketch in dirty.items():
+                if key in stored:
+                    sketch.merge(stored[key])
+            for key, sketch in dirty.items():
+                cursor.execute("""
+                    MERGE VisitorSketches WITH (HOLDLOCK) AS t
+                    USING (VALUES (?, ?, ?)) AS s(SketchKey, Precision, Registers)
+                    ON t.SketchKey = s.SketchKey
+                    WHEN MATCHED THEN UPDATE SET t.Precision = s.Precision,
+                        t.Registers = s.Registers, t.UpdatedAt = SYSDATETIME()
+                    WHEN NOT MATCHED THEN INSERT (SketchKey, Precision, Registers, UpdatedAt)
+                        VALUES (s.SketchKey, s.Precision, s.Registers, SYSDATETIME());
+                """, (key, sketch.precision, sketch.to_bytes()))
+        except Exception:
+            with self._lock:
+                self._dirty.update(dirty)
+            raise
+        self._fold(dirty)
+        return len(dirty)
+
+    def _fetch(self, cursor, keys, lock=False):
+        """Stored sketches for `keys`; ones with a different precision are ignored"""
+        hint = " WITH (UPDLOCK, HOLDLOCK)" if lock else ""
+        stored = {}
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            cursor.execute(f"""
+                SELECT SketchKey, Precision, Registers
+                FROM VisitorSketches{hint}
+                WHERE SketchKey IN ({', '.join('?' for _ in batch)})
+            """, batch)
+            for key, precision, registers in cursor.fetchall():
+                if precision == self.precision_for(key):
+                    stored[key] = HyperLogLog(precision, registers)
+        return stored
+
+    def _fold(self, sketches):
+        with self._lock:
+            for key, sketch in sketches.items():
+                self._sketch_locked(key).merge(sketch)
+            self._evict_locked()
+
+    # ---------- estimates ----------
+
+    def estimate(self, cursor, key='global'):
+        """Unique visitors for one sketch key, including other workers' persisted visits"""
+        return self.estimate_union(cursor, [key])
+
+    def estimate_union(self, cursor, keys):
+        """
+        Unique visitors across several keys of one precision (e.g. a range of days)
+
+        Each visitor is counted once however many of the keys saw them.
+        """
+        if not keys:
+            return 0
+        self._fold(self._fetch(cursor, keys))
+        with self._lock:
+            union = HyperLogLog(self.precision_for(keys[0]))
+            for key in keys:
+                sketch = self._sketches.get(key)
+                if sketch is not None:
+                    union.merge(sketch)
+        return union.estimate()
+
+    def stats(self):
+        with self._lock:
+            return {'sketches': len(self._sketches), 'dirty': len(self._dirty)}
+
+
+# ==========================================
+# BLOOM FILTERS
+# ==========================================
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and a tunable false-positive rate
+
+    Sized for `capacity` items at `error_rate`; past capacity it still never
+    misses a member, but false positives climb (see expected_error_rate()).
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.bit_count = max(64, int(math.ceil(
+            -self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.bit_count / self.capacity * math.log(2))))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def _digest(value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+
+    def _positions(self, value):
+        # Double hashing with 64-bit wraparound, matching add_many's uint64 math
+        h1, h2 = self._digest(value)
+        return [((h1 + i * h2) & 0xFFFFFFFFFFFFFFFF) % self.bit_count
+                for i in range(self.hash_count)]
+
+    def add(self, value):
+        added = False
+        for position in self._positions(value):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def add_many(self, values):
+        """Bulk add with the position math vectorized in NumPy"""
+        digests = [self._digest(value) for value in values]
+        if not digests:
+            return
+        h1, h2 = (np.array(column, dtype=np.uint64) for column in zip(*digests))
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            positions = (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.bit_count)
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        np.bitwise_or.at(bits, (positions >> np.uint64(3)).ravel(),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)).ravel())
+        self.count += len(digests)
+
+    def __contains__(self, value):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+    def fill_ratio(self):
+        return bin(int.from_bytes(self.bits, 'big')).count('1') / self.bit_count
+
+    def expected_error_rate(self):
+        """False-positive probability for the items added so far"""
+        k, m = self.hash_count, self.bit_count
+        return (1 - math.exp(-k * self.count / m)) ** k
+
+
+# Fields check-availability answers, matching users columns
+AVAILABILITY_FIELDS = ('username', 'email', 'phone')
+
+
+def availability_key(value):
+    """
+    Normalized filter key
+
+    SQL Server's default collation compares case-insensitively and ignores
+    trailing spaces, so the filter must be at least that coarse or it would
+    answer "available" for a value the database considers taken.
+    """
+    return str(value).rstrip().lower()
+
+
+class AvailabilityFilters:
+    """
+    One Bloom filter per users column for the check-availability fast path
+
+    A miss means the value is definitely not registered (as of the last
+    load plus this process's registrations). Hits must be confirmed in the
+    database and reported back with record_confirmation(), which feeds the
+    observed false-positive rate. Filters are rebuilt every `reload_after`
+    seconds, and sooner once they outgrow their capacity;
+    reload_in_background() does that in one thread while the current
+    filters keep answering. After invalidate() (another worker registered
+    someone) every check goes to the database until a rebuild started
+    after it has landed.
+    """
+
+    RETRY_AFTER = 30  # Seconds before a failed background rebuild is retried
+
+    def __init__(self, connect, error_rate=0.01, min_capacity=10000, reload_after=300):
+        self.connect = connect
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self.reload_after = reload_after
+        self._filters = None
+        self._loaded_at = None
+        self._loading_adds = None  # registrations made while a load runs
+        self._reloading = False
+        self._retry_at = 0.0
+        self._invalidated_at = None  # filters miss registrations made elsewhere since then
+        self._lock = threading.Lock()
+        self._stats = {field: {'checks': 0, 'definitely_available': 0,
+                               'confirmed_taken': 0, 'false_positives': 0}
+                       for field in AVAILABILITY_FIELDS}
+
+    @property
+    def loaded(self):
+        return self._filters is not None
+
+    def needs_reload(self):
+        with self._lock:
+            if self._filters is None or self._invalidated_at is not None:
+                return True
+            if time.monotonic() - self._loaded_at > self.reload_after:
+                return True
+            return any(f.count > f.capacity for f in self._filters.values())
+
+    def load(self, cursor):
+        """Rebuild every filter from one scan of users"""
+        started = time.monotonic()
+        with self._lock:
+            self._loading_adds = []
+        try:
+            cursor.execute("SELECT COUNT(*) FROM users")
+            user_count = cursor.fetchone()[0]
+            capacity = max(self.min_capacity, 2 * user_count)
+            filters = {field: BloomFilter(capacity, self.error_rate) for field in AVAILABILITY_FIELDS}
+            cursor.execute("SELECT username, email, phone FROM users")
+            while True:
+                rows = cursor.fetchmany(10000)
+                if not rows:
+                    break
+                for field, values in zip(AVAILABILITY_FIELDS, zip(*rows)):
+                    filters[field].add_many([availability_key(v) for v in values if v is not None])
+        except Exception:
+            with self._lock:
+                self._loading_adds = None
+            raise
+        with self._lock:
+            for field, value in self._loading_adds:
+                filters[field].add(value)
+            self._loading_adds = None
+            self._filters = filters
+            self._loaded_at = time.monotonic()
+            if self._invalidated_at is not None and self._invalidated_at <= started:
+                self._invalidated_at = None
+        print(f"✓ Availability filters built: {user_count} users")
+
+    def reload_in_background(self):
+        """Rebuild from the database in a background thread unless one is already running"""
+        with self._lock:
+            if self._reloading or time.monotonic() < self._retry_at:
+                return
+            self._reloading = True
+
+        def run():
+            try:
+                conn = self.connect()
+                try:
+                    cursor = conn.cursor()
+                    self.load(cursor)
+                    cursor.close()
+                finally:
+                    conn.close()
+            except Exception as e:
+                with self._lock:
+                    self._retry_at = time.monotonic() + self.RETRY_AFTER
+                print(f"❌ ERROR rebuilding availability filters: {str(e)}")
+            finally:
+                with self._lock:
+                    self._reloading = False
+
+        threading.Thread(target=run, name='availability-reload', daemon=True).start()
+
+    def invalidate(self):
+        """Another process registered users: stop trusting misses until rebuilt"""
+        with self._lock:
+            self._invalidated_at = time.monotonic()
+        self.reload_in_background()
+
+    def add(self, **values):
+        """Record a registration, e.g. add(username=..., email=..., phone=...)"""
+        with self._lock:
+            for field, value in values.items():
+                if value is None:
+                    continue
+                key = availability_key(value)
+                if self._filters is not None:
+                    self._filters[field].add(key)
+                if self._loading_adds is not None:
+                    self._loading_adds.append((field, key))
+
+    def might_exist(self, field, value):
+        """False only if `value` is certainly not registered in `field`"""
+        with self._lock:
+            stats = self._stats[field]
+            stats['checks'] += 1
+            if (self._filters is None or self._invalidated_at is not None
+                    or availability_key(value) in self._filters[field]):
+                return True
+            stats['definitely_available'] += 1
+            return False
+
+    def record_confirmation(self, field, exists):
+        """Outcome of the database lookup that followed a filter hit"""
+        with self._lock:
+            self._stats[field]['confirmed_taken' if exists else 'false_positives'] += 1
+
+    def stats(self):
+        with self._lock:
+            snapshot = {}
+            for field, counts in self._stats.items():
+                field_stats = dict(counts)
+                absent = counts['definitely_available'] + counts['false_positives']
+                field_stats['observed_false_positive_rate'] = \
+                    round(counts['false_positives'] / absent, 4) if absent else 0.0
+                bloom = self._filters.get(field) if self._filters else None
+                if bloom is not None:
+                    field_stats.update({
+                        'items': bloom.count,
+                        'capacity': bloom.capacity,
+                        'bits': bloom.bit_count,
+                        'hashes': bloom.hash_count,
+                        'expected_false_positive_rate': round(bloom.expected_error_rate(), 6),
+                    })
+                snapshot[field] = field_stats
+            return snapshot
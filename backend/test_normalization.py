@@ -0,0 +1,91 @@
+"""
+Tests for skill name normalization
+
+Run from backend/: python -m pytest -q test_normalization.py
+"""
+
+import pytest
+
+from normalization import SkillNormalizer, name_key
+
+
+class FakeCursor:
+    """Returns `rows` for SKILL_USAGE_SQL: (SkillID, SkillName, usage)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+def loaded(*rows):
+    normalizer = SkillNormalizer()
+    normalizer.load(FakeCursor(rows))
+    return normalizer
+
+
+@pytest.mark.parametrize('known, incoming', [
+    ('MySQL', 'MSSQL'),
+    ('Spring', 'String'),
+    ('Spring', 'Sprint'),
+    ('Swift', 'Shift'),
+    ('Python 3', 'Python 2'),
+    ('C', 'C++'),
+    ('C', 'C#'),
+])
+def test_distinct_skills_are_not_rewritten(known, incoming):
+    normalizer = loaded((1, known, 10))
+    assert normalizer.match(incoming) is None
+    assert normalizer.normalize(incoming) == incoming
+
+
+@pytest.mark.parametrize('known, incoming', [
+    ('Python', 'python '),
+    ('Python', 'PYTHON'),
+    ('Node.js', 'NodeJS'),
+    ('Node.js', 'node js'),
+    ('CI/CD', 'CI-CD'),
+    ('Machine Learning', 'machine  learning'),
+])
+def test_case_and_punctuation_variants_are_rewritten(known, incoming):
+    normalizer = loaded((1, known, 10))
+    assert normalizer.match(incoming) == (known, 1)
+    assert normalizer.normalize(incoming) == known
+
+
+def test_typo_is_only_suggested():
+    normalizer = loaded((1, 'Python', 10))
+    assert normalizer.suggest('Pyhton') == ('Python', 1, 1)
+    assert normalizer.normalize('Pyhton') == 'Pyhton'
+
+
+def test_new_names_are_remembered_by_key():
+    normalizer = loaded()
+    assert normalizer.normalize_skills(['Docker ', 'docker', 'Kubernetes']) == ['Docker', 'Kubernetes']
+    stats = normalizer.stats()
+    assert (stats['exact'], stats['new']) == (1, 2)
+
+
+def test_plan_merges_only_groups_identical_keys():
+    normalizer = loaded((1, 'MySQL', 50), (2, 'mysql', 3), (3, 'MSSQL', 20),
+                        (4, 'Spring', 40), (5, 'String', 5))
+    groups = normalizer.plan_merges()
+    assert groups == [{'survivor': (1, 'MySQL'), 'duplicates': [(2, 'mysql')]}]
+
+
+def test_near_duplicates_are_suggestions():
+    normalizer = loaded((1, 'JavaScript', 50), (2, 'Javascirpt', 2), (3, 'javascript', 1))
+    assert normalizer.plan_merges() == [{'survivor': (1, 'JavaScript'),
+                                         'duplicates': [(3, 'javascript')]}]
+    assert normalizer.plan_suggestions() == [{'skill': (2, 'Javascirpt'),
+                                              'similar_to': (1, 'JavaScript'),
+                                              'distance': 1}]
+
+
+def test_name_key_keeps_meaningful_symbols():
+    assert len({name_key(name) for name in ('C', 'C++', 'C#', 'F#')}) == 4
+    assert name_key(' Node.JS ') == name_key('node js') == 'nodejs'
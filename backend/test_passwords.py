@@ -0,0 +1,97 @@
+"""
+Tests for password hashing
+
+Run from backend/: python -m pytest -q test_passwords.py
+"""
+
+import hashlib
+
+import pytest
+
+from passwords import PasswordHasher, format_hash, parse_hash
+
+# Cheap costs keep the tests fast; the format and checks are the same
+FAST = {'scrypt_n': 1024, 'pbkdf2_iterations': 1000, 'workers': 0}
+
+
+@pytest.fixture
+def hasher():
+    return PasswordHasher(**FAST)
+
+
+def legacy(password):
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+def test_hash_and_verify(hasher):
+    stored = hasher.hash('Correct-Horse-9')
+    assert stored.startswith('scrypt$n=1024,r=8,p=1$')
+    assert hasher.verify('Correct-Horse-9', stored)
+    assert not hasher.verify('correct-horse-9', stored)
+
+
+def test_hashes_are_salted(hasher):
+    assert hasher.hash('Correct-Horse-9') != hasher.hash('Correct-Horse-9')
+
+
+def test_pbkdf2(hasher):
+    pbkdf2 = PasswordHasher(algorithm='pbkdf2_sha256', **FAST)
+    stored = pbkdf2.hash('Correct-Horse-9')
+    assert stored.startswith('pbkdf2_sha256$1000$')
+    assert pbkdf2.verify('Correct-Horse-9', stored)
+    # Any supported format verifies, whatever the configured algorithm
+    assert hasher.verify('Correct-Horse-9', stored)
+
+
+def test_legacy_sha256_verifies_and_needs_rehash(hasher):
+    stored = legacy('Correct-Horse-9')
+    assert hasher.verify('Correct-Horse-9', stored)
+    assert not hasher.verify('Wrong-Horse-9', stored)
+    assert hasher.needs_rehash(stored)
+
+    upgraded = hasher.hash('Correct-Horse-9')
+    assert hasher.verify('Correct-Horse-9', upgraded)
+    assert not hasher.needs_rehash(upgraded)
+
+
+def test_other_cost_or_algorithm_needs_rehash(hasher):
+    cheaper = PasswordHasher(**dict(FAST, scrypt_n=512)).hash('Correct-Horse-9')
+    pbkdf2 = PasswordHasher(algorithm='pbkdf2_sha256', **FAST).hash('Correct-Horse-9')
+    assert hasher.needs_rehash(cheaper)
+    assert hasher.needs_rehash(pbkdf2)
+
+
+@pytest.mark.parametrize('stored', [
+    'scrypt$n=16384,r=8,p=1$c2FsdHNhbHRzYWx0c2FsdA$a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2U',
+    'pbkdf2_sha256$600000$c2FsdHNhbHRzYWx0c2FsdA$a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2U',
+])
+def test_parse_and_format_round_trip(stored):
+    assert format_hash(*parse_hash(stored)) == stored
+
+
+def test_parse_legacy():
+    digest = legacy('x')
+    assert parse_hash(digest) == ('sha256', {}, b'', bytes.fromhex(digest))
+
+
+@pytest.mark.parametrize('stored', [
+    None, '', 'plaintext', '$2b$12$abcdefghijklmnopqrstuuJ9V0rYQ1pR3dK1aQ6VJb2m9qFJ1eYxC',
+    legacy('x').upper(), legacy('x')[:-1], 'argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA',
+    'scrypt$n=16384$c2FsdA$aGFzaA',
+])
+def test_unknown_formats_are_rejected(hasher, stored):
+    assert hasher.verify('x', stored) is False
+    assert hasher.needs_rehash(stored) is False
+    if stored:
+        with pytest.raises(ValueError):
+            parse_hash(stored)
+
+
+def test_process_pool():
+    pooled = PasswordHasher(**dict(FAST, workers=1))
+    try:
+        pooled.start()
+        stored = pooled.hash('Correct-Horse-9')
+        assert pooled.verify('Correct-Horse-9', stored)
+    finally:
+        pooled.close()
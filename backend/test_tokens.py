@@ -0,0 +1,100 @@
+"""
+Tests for session tokens
+
+Run from backend/: python -m pytest -q test_tokens.py
+"""
+
+import json
+
+import pytest
+
+import tokens
+from tokens import InvalidTokenError, TokenService, _b64encode
+
+
+@pytest.fixture
+def service():
+    return TokenService(b'test-secret', ttl=60)
+
+
+def issue(service):
+    return service.issue(7, 'alice', 'recruiter')
+
+
+def test_round_trip(service):
+    token, claims = issue(service)
+    assert service.verify(token) == claims
+    assert (claims['sub'], claims['username'], claims['type']) == (7, 'alice', 'recruiter')
+
+
+def test_token_signed_with_another_secret_is_rejected(service):
+    token, _ = TokenService(b'other-secret').issue(7, 'alice', 'admin')
+    with pytest.raises(InvalidTokenError, match='signature'):
+        service.verify(token)
+
+
+def test_tampered_claims_are_rejected(service):
+    token, claims = issue(service)
+    signature = token.split('.')[1]
+    forged = dict(claims, type='admin')
+    forged_payload = _b64encode(json.dumps(forged, separators=(',', ':')).encode())
+    with pytest.raises(InvalidTokenError, match='signature'):
+        service.verify(f'{forged_payload}.{signature}')
+
+
+def test_tampered_signature_is_rejected(service):
+    token, _ = issue(service)
+    flipped = token[:-1] + ('A' if token[-1] != 'A' else 'B')
+    with pytest.raises(InvalidTokenError):
+        service.verify(flipped)
+
+
+@pytest.mark.parametrize('token', [
+    '', 'no-dot', 'a.b.c', 'é.é', 'payload.sïgnature', None, 12345,
+])
+def test_malformed_and_non_ascii_tokens_are_rejected(service, token):
+    with pytest.raises(InvalidTokenError):
+        service.verify(token)
+    assert service.stats()['rejected'] == 1
+
+
+def test_expired_token_is_rejected(service, monkeypatch):
+    token, claims = issue(service)
+    monkeypatch.setattr(tokens.time, 'time', lambda: claims['exp'] + 1)
+    with pytest.raises(InvalidTokenError, match='expired'):
+        service.verify(token)
+
+
+def test_expiry_is_checked_on_cache_hits(service, monkeypatch):
+    token, claims = issue(service)
+    service.verify(token)
+    monkeypatch.setattr(tokens.time, 'time', lambda: claims['exp'])
+    with pytest.raises(InvalidTokenError, match='expired'):
+        service.verify(token)
+    assert service.stats()['cache_hits'] == 1
+
+
+def test_revoked_token_is_rejected_from_the_verify_cache(service):
+    token, claims = issue(service)
+    service.verify(token)
+    service.revoke(claims)
+    with pytest.raises(InvalidTokenError, match='revoked'):
+        service.verify(token)
+    stats = service.stats()
+    assert (stats['cache_hits'], stats['cached']) == (1, 1)
+
+
+def test_revocations_from_other_processes_apply_to_cached_tokens(service):
+    token, claims = issue(service)
+    other, other_claims = issue(service)
+    service.verify(token)
+    service.load_revocations([(claims['jti'], claims['exp'])])
+    with pytest.raises(InvalidTokenError, match='revoked'):
+        service.verify(token)
+    assert service.verify(other) == other_claims
+
+
+def test_expired_revocations_are_not_loaded(service):
+    _, claims = issue(service)
+    service.load_revocations([(claims['jti'], 0)])
+    assert service.stats()['revocation_list'] == 0
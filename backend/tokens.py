@@ -0,0 +1,143 @@
+"""
+Session Tokens
+--------------
+Stateless HMAC-signed expiring tokens, verified without database access
+
+Format: base64url(JSON claims) "." base64url(HMAC-SHA256(secret, claims part))
+Claims: sub (user ID), username, type, iat, exp, jti (token ID)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class InvalidTokenError(Exception):
+    """Token is malformed, forged, expired or revoked"""
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class TokenService:
+    """
+    Issues and verifies session tokens
+
+    Verified tokens are kept in an LRU so repeat requests skip the HMAC and
+    JSON work; expiry and revocation are still checked on every hit.
+    Revocations live in memory until the token would have expired anyway.
+    revoke() covers this process; revocations made by other processes
+    arrive through load_revocations().
+    """
+
+    def __init__(self, secret, ttl=8 * 3600, cache_size=10000):
+        if isinstance(secret, str):
+            secret = secret.encode('utf-8')
+        self.secret = secret
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._verified = OrderedDict()  # token -> claims
+        self._revoked = {}              # jti -> exp
+        self._lock = threading.Lock()
+        self._stats = {'issued': 0, 'cache_hits': 0, 'verified': 0, 'rejected': 0, 'revoked': 0}
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self.secret, payload.encode('ascii'), hashlib.sha256).digest())
+
+    def issue(self, user_id, username, user_type):
+        """
+        Returns:
+            tuple: (token, claims)
+        """
+        now = int(time.time())
+        claims = {
+            'sub': user_id,
+            'username': username,
+            'type': user_type,
+            'iat': now,
+            'exp': now + self.ttl,
+            'jti': _b64encode(os.urandom(12)),
+        }
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))
+        with self._lock:
+            self._stats['issued'] += 1
+        return f'{payload}.{self._sign(payload)}', claims
+
+    def verify(self, token):
+        """Claims of a valid token; raises InvalidTokenError otherwise"""
+        now = time.time()
+        with self._lock:
+            claims = self._verified.get(token)
+            if claims is not None:
+                self._verified.move_to_end(token)
+                self._stats['cache_hits'] += 1
+                self._check_locked(claims, now)
+                return claims
+
+        try:
+            payload, signature = token.split('.')
+            valid = hmac.compare_digest(signature.encode('ascii'), self._sign(payload).encode('ascii'))
+        except (AttributeError, ValueError):  # includes non-ASCII input
+            self._reject('Malformed token')
+        if not valid:
+            self._reject('Invalid token signature')
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            self._reject('Malformed token')
+
+        with self._lock:
+            self._check_locked(claims, now)
+            self._stats['verified'] += 1
+            self._verified[token] = claims
+            if len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+        return claims
+
+    def _check_locked(self, claims, now):
+        if claims.get('exp', 0) <= now:
+            self._stats['rejected'] += 1
+            raise InvalidTokenError('Token expired')
+        if claims.get('jti') in self._revoked:
+            self._stats['rejected'] += 1
+            raise InvalidTokenError('Token revoked')
+
+    def _reject(self, message):
+        with self._lock:
+            self._stats['rejected'] += 1
+        raise InvalidTokenError(message)
+
+    def revoke(self, claims):
+        """Reject this token from now until it expires"""
+        now = time.time()
+        with self._lock:
+            self._revoked[claims['jti']] = claims['exp']
+            self._stats['revoked'] += 1
+            # Expired entries can go: the exp check rejects those tokens anyway
+            for jti in [j for j, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[jti]
+
+    def load_revocations(self, revocations):
+        """Add revocations made elsewhere: an iterable of (jti, exp)"""
+        now = time.time()
+        with self._lock:
+            for jti, exp in revocations:
+                if exp > now:
+                    self._revoked[jti] = exp
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['cached'] = len(self._verified)
+            snapshot['revocation_list'] = len(self._revoked)
+        return snapshot
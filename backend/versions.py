@@ -0,0 +1,151 @@
+"""
+Shared Data Versions
+--------------------
+Per-dataset version numbers in the DataVersions table
+(migrations/003_data_versions.sql), so each worker process learns about
+writes made by the others
+
+A writer bumps a dataset's version after its write commits. sync() reads
+every version in one query; a version that moved by more than this
+process's own bumps means another process wrote, and the dataset's
+listeners run (drop cached responses, rebuild an index, ...).
+"""
+
+import threading
+import time
+
+class DataVersions:
+    """
+    Process-side view of the DataVersions table
+
+    check_interval is how long a sync() result is trusted: 0 checks on
+    every call, larger values save round trips and let another worker's
+    write go unnoticed for up to that many seconds.
+    """
+
+    RETRY_AFTER = 5  # Seconds between attempts while the versions cannot be read
+
+    def __init__(self, connect, check_interval=0):
+        self.connect = connect
+        self.check_interval = check_interval
+        self._seen = {}        # dataset -> version this process is up to date with
+        self._listeners = {}   # dataset -> [(callback, initial)]
+        self._checked_at = 0.0
+        self._synced = False
+        self._failing = False
+        self._lock = threading.Lock()
+        self._stats = {'checks': 0, 'bumps': 0, 'foreign_changes': 0,
+                       'failures': 0, 'last_error': None}
+
+    def on_change(self, dataset, callback, initial=False):
+        """
+        Call `callback()` when another process changes `dataset`
+
+        With `initial` it also runs on the first successful sync, for state
+        that has to be read once at startup. If it raises, the change is
+        reported again on the next sync.
+        """
+        self._listeners.setdefault(dataset, []).append((callback, initial))
+
+    def bump(self, *datasets):
+        """Advance the versions of `datasets`; call after the write has committed"""
+        try:
+            conn = self.connect()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    UPDATE DataVersions SET Version = Version + 1
+                    OUTPUT INSERTED.Name, INSERTED.Version
+                    WHERE Name IN ({', '.join('?' for _ in datasets)})
+                """, datasets)
+                rows = cursor.fetchall()
+                conn.commit()
+                cursor.close()
+            finally:
+                conn.close()
+        except Exception as e:
+            with self._lock:
+                self._stats['failures'] += 1
+                self._stats['last_error'] = str(e)
+            print(f"❌ ERROR bumping data versions {datasets} (other workers may serve stale data): {str(e)}")
+            return
+        with self._lock:
+            self._stats['bumps'] += 1
+            for name, version in rows:
+                # Only our own write in between: stay current. Otherwise another
+                # process wrote too, and the next sync() reports it.
+                if self._seen.get(name) == version - 1:
+                    self._seen[name] = version
+
+    def sync(self):
+        """
+        Read every version and run the listeners of datasets changed elsewhere
+
+        Returns:
+            bool: False if the versions could not be read
+        """
+        now = time.monotonic()
+        if self._synced and now - self._checked_at < self.check_interval:
+            return True
+        if self._failing and now - self._checked_at < self.RETRY_AFTER:
+            return False
+        try:
+            conn = self.connect()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT Name, Version FROM DataVersions")
+                rows = cursor.fetchall()
+                cursor.close()
+            finally:
+                conn.close()
+        except Exception as e:
+            with self._lock:
+                report = not self._failing
+                self._synced = False
+                self._failing = True
+                self._checked_at = now
+                self._stats['failures'] += 1
+                self._stats['last_error'] = str(e)
+            if report:
+                print(f"❌ ERROR reading data versions (shared caches are bypassed until it works): {str(e)}")
+            return False
+
+        changed = []  # (dataset, previous version or None on first sight)
+        with self._lock:
+            for name, version in rows:
+                seen = self._seen.get(name)
+                if seen is None or version > seen:
+                    self._seen[name] = version
+                    changed.append((name, seen))
+                    if seen is not None:
+                        self._stats['foreign_changes'] += 1
+            self._checked_at = now
+            self._synced = True
+            self._failing = False
+            self._stats['checks'] += 1
+
+        for name, seen in changed:
+            for callback, initial in self._listeners.get(name, ()):
+                if seen is None and not initial:
+                    continue
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"❌ ERROR applying a {name} change from another worker (will retry): {str(e)}")
+                    with self._lock:
+                        if seen is None:
+                            self._seen.pop(name, None)
+                        else:
+                            self._seen[name] = seen
+        return True
+
+    @property
+    def synced(self):
+        """True while the last sync() succeeded"""
+        return self._synced
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['versions'] = dict(self._seen)
+        return snapshot
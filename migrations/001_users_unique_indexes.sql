@@ -0,0 +1,44 @@
+/****** Migration 001: unique indexes on users(username, email, phone) ******/
+-- register() probes these with EXISTS and relies on them to reject a
+-- duplicate that slips in between the probe and the INSERT.
+-- Safe to re-run. Fails before creating anything if duplicates exist.
+SET ANSI_NULLS ON
+GO
+SET QUOTED_IDENTIFIER ON
+GO
+
+-- 1. Report duplicates that would block the indexes (resolve them first)
+IF EXISTS (SELECT username FROM [dbo].[users] WHERE username IS NOT NULL GROUP BY username HAVING COUNT(*) > 1)
+   OR EXISTS (SELECT email FROM [dbo].[users] WHERE email IS NOT NULL GROUP BY email HAVING COUNT(*) > 1)
+   OR EXISTS (SELECT phone FROM [dbo].[users] WHERE phone IS NOT NULL GROUP BY phone HAVING COUNT(*) > 1)
+BEGIN
+    SELECT 'username' AS Field, username AS Value, COUNT(*) AS Users
+    FROM [dbo].[users] WHERE username IS NOT NULL GROUP BY username HAVING COUNT(*) > 1
+    UNION ALL
+    SELECT 'email', email, COUNT(*)
+    FROM [dbo].[users] WHERE email IS NOT NULL GROUP BY email HAVING COUNT(*) > 1
+    UNION ALL
+    SELECT 'phone', phone, COUNT(*)
+    FROM [dbo].[users] WHERE phone IS NOT NULL GROUP BY phone HAVING COUNT(*) > 1;
+
+    RAISERROR('users has duplicate username/email/phone values; resolve them and re-run', 16, 1);
+    SET NOEXEC ON;
+END
+GO
+
+-- 2. Filtered so legacy rows with NULLs do not collide
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_users_username' AND object_id = OBJECT_ID('dbo.users'))
+    CREATE UNIQUE NONCLUSTERED INDEX [UX_users_username] ON [dbo].[users] ([username] ASC)
+    WHERE [username] IS NOT NULL
+GO
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_users_email' AND object_id = OBJECT_ID('dbo.users'))
+    CREATE UNIQUE NONCLUSTERED INDEX [UX_users_email] ON [dbo].[users] ([email] ASC)
+    WHERE [email] IS NOT NULL
+GO
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'UX_users_phone' AND object_id = OBJECT_ID('dbo.users'))
+    CREATE UNIQUE NONCLUSTERED INDEX [UX_users_phone] ON [dbo].[users] ([phone] ASC)
+    WHERE [phone] IS NOT NULL
+GO
+
+SET NOEXEC OFF
+GO
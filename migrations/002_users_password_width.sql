@@ -0,0 +1,20 @@
+/****** Migration 002: widen users.password for salted KDF hashes ******/
+-- scrypt/PBKDF2 hashes ("scrypt$n=16384,r=8,p=1$<salt>$<hash>") are about
+-- 90 characters; legacy SHA-256 hex digests were 64. Widens the column to
+-- 255 characters, keeping its type family and nullability. Safe to re-run.
+DECLARE @type sysname, @max_length smallint, @nullable bit, @sql nvarchar(400);
+
+SELECT @type = t.name, @max_length = c.max_length, @nullable = c.is_nullable
+FROM sys.columns c
+JOIN sys.types t ON c.user_type_id = t.user_type_id
+WHERE c.object_id = OBJECT_ID('dbo.users') AND c.name = 'password';
+
+-- max_length is in bytes (-1 = MAX); nvarchar needs 510 bytes for 255 chars
+IF @max_length <> -1 AND @max_length < CASE WHEN @type LIKE 'n%' THEN 510 ELSE 255 END
+BEGIN
+    SET @sql = N'ALTER TABLE [dbo].[users] ALTER COLUMN [password] '
+             + CASE WHEN @type LIKE 'n%' THEN N'nvarchar(255)' ELSE N'varchar(255)' END
+             + CASE WHEN @nullable = 1 THEN N' NULL' ELSE N' NOT NULL' END;
+    EXEC sp_executesql @sql;
+END
+GO
@@ -0,0 +1,22 @@
+/****** Migration 003: shared data versions for multi-worker servers ******/
+-- Each serve.py worker keeps caches and indexes in memory. Writers bump a
+-- row here after committing; every worker reads the table (one small
+-- query) to notice the others' writes. Safe to re-run.
+SET ANSI_NULLS ON
+GO
+SET QUOTED_IDENTIFIER ON
+GO
+
+IF OBJECT_ID('dbo.DataVersions', 'U') IS NULL
+    CREATE TABLE [dbo].[DataVersions] (
+        [Name] varchar(50) NOT NULL CONSTRAINT [PK_DataVersions] PRIMARY KEY,
+        [Version] bigint NOT NULL CONSTRAINT [DF_DataVersions_Version] DEFAULT (0)
+    )
+GO
+
+-- One row per shared dataset
+INSERT INTO [dbo].[DataVersions] ([Name])
+SELECT v.Name
+FROM (VALUES ('jobs'), ('resumes'), ('users'), ('tokens')) AS v(Name)
+WHERE NOT EXISTS (SELECT 1 FROM [dbo].[DataVersions] d WHERE d.Name = v.Name)
+GO
@@ -0,0 +1,19 @@
+/****** Migration 004: logged-out session tokens shared by all workers ******/
+-- POST /api/auth/logout stores the token's ID here and bumps the 'tokens'
+-- row of DataVersions (migration 003); the other workers then reload the
+-- unexpired rows. ExpiresAt is the token's exp (Unix seconds); logout
+-- prunes rows past it. Safe to re-run.
+SET ANSI_NULLS ON
+GO
+SET QUOTED_IDENTIFIER ON
+GO
+
+IF OBJECT_ID('dbo.RevokedTokens', 'U') IS NULL
+    CREATE TABLE [dbo].[RevokedTokens] (
+        [Jti] varchar(32) NOT NULL CONSTRAINT [PK_RevokedTokens] PRIMARY KEY,
+        [ExpiresAt] bigint NOT NULL
+    )
+GO
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_RevokedTokens_ExpiresAt' AND object_id = OBJECT_ID('dbo.RevokedTokens'))
+    CREATE NONCLUSTERED INDEX [IX_RevokedTokens_ExpiresAt] ON [dbo].[RevokedTokens] ([ExpiresAt] ASC)
+GO
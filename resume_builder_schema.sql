@@ -215,3 +215,157 @@ REFERENCES [dbo].[Resumes] ([ResumeID])
 GO
 ALTER TABLE [dbo].[WorkExperience] CHECK CONSTRAINT [FK_Work_Resume]
 GO
+/****** Keyset pagination indexes ******/
+-- GET /api/resumes and GET /api/jobs page by (created date DESC, id DESC);
+-- these let each page start with an index seek past the cursor row.
+CREATE NONCLUSTERED INDEX [IX_Resumes_CreatedDate_ResumeID] ON [dbo].[Resumes]
+(
+	[CreatedDate] DESC,
+	[ResumeID] DESC
+)
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_Active_CreatedAt_JobID] ON [dbo].[Jobs]
+(
+	[IsActive] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+GO
+/****** Job search index plan ******/
+-- Each /api/jobs filter (see build_job_filters in backend/app.py) resolves a
+-- master name to its ID with a seek on the name index, then seeks the
+-- matching Jobs index. The indexes are filtered to active jobs and keep
+-- (CreatedAt, JobID) as trailing keys so a filtered page is still read in
+-- keyset order without a sort.
+CREATE NONCLUSTERED INDEX [IX_Jobs_Sector] ON [dbo].[Jobs]
+(
+	[SectorID] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_JobType] ON [dbo].[Jobs]
+(
+	[JobTypeID] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_Course] ON [dbo].[Jobs]
+(
+	[CourseID] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_Country] ON [dbo].[Jobs]
+(
+	[CountryID] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_State] ON [dbo].[Jobs]
+(
+	[StateID] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_City] ON [dbo].[Jobs]
+(
+	[CityID] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+CREATE NONCLUSTERED INDEX [IX_Jobs_Experience] ON [dbo].[Jobs]
+(
+	[ExperienceRequired] ASC,
+	[CreatedAt] DESC,
+	[JobID] DESC
+)
+WHERE [IsActive] = 1
+GO
+-- skills filter: name -> SkillID, then SkillID -> JobIDs
+CREATE NONCLUSTERED INDEX [IX_JobSkillsMaster_SkillName] ON [dbo].[JobSkillsMaster]
+(
+	[SkillName] ASC
+)
+INCLUDE ([SkillID])
+GO
+CREATE NONCLUSTERED INDEX [IX_JobSkills_SkillID_JobID] ON [dbo].[JobSkills]
+(
+	[SkillID] ASC,
+	[JobID] ASC
+)
+GO
+-- skill loading for a page of jobs (fetch_job_skills)
+CREATE NONCLUSTERED INDEX [IX_JobSkills_JobID_SkillID] ON [dbo].[JobSkills]
+(
+	[JobID] ASC,
+	[SkillID] ASC
+)
+GO
+-- master name lookups
+CREATE NONCLUSTERED INDEX [IX_Sectors_SectorName] ON [dbo].[Sectors] ([SectorName] ASC)
+GO
+CREATE NONCLUSTERED INDEX [IX_JobTypes_JobTypeName] ON [dbo].[JobTypes] ([JobTypeName] ASC)
+GO
+CREATE NONCLUSTERED INDEX [IX_Courses_CourseName] ON [dbo].[Courses] ([CourseName] ASC)
+GO
+CREATE NONCLUSTERED INDEX [IX_Countries_CountryName] ON [dbo].[Countries] ([CountryName] ASC)
+GO
+CREATE NONCLUSTERED INDEX [IX_States_StateName] ON [dbo].[States] ([StateName] ASC)
+GO
+CREATE NONCLUSTERED INDEX [IX_Cities_CityName] ON [dbo].[Cities] ([CityName] ASC)
+GO
+
+/****** Analytics event log and rollups ******/
+-- Append-only; one row per (type, resume, minute) per counter flush
+CREATE TABLE [dbo].[AnalyticsEvents](
+	[EventID] [bigint] IDENTITY(1,1) NOT NULL,
+	[EventType] [varchar](20) NOT NULL,
+	[ResumeID] [int] NULL,
+	[OccurredAt] [datetime2](0) NOT NULL,
+	[EventCount] [int] NOT NULL,
+	[RecordedAt] [datetime2](0) NOT NULL DEFAULT (sysdatetime()),
+PRIMARY KEY CLUSTERED 
+(
+	[EventID] ASC
+)
+) ON [PRIMARY]
+GO
+-- minute/hour/day counts, maintained by the same flush (MERGE ... + EventCount)
+CREATE TABLE [dbo].[AnalyticsRollups](
+	[BucketSize] [varchar](10) NOT NULL,
+	[BucketStart] [datetime2](0) NOT NULL,
+	[EventType] [varchar](20) NOT NULL,
+	[EventCount] [bigint] NOT NULL,
+PRIMARY KEY CLUSTERED 
+(
+	[BucketSize] ASC,
+	[BucketStart] ASC,
+	[EventType] ASC
+)
+) ON [PRIMARY]
+GO
+-- HyperLogLog unique-visitor sketches ('global', 'day:YYYY-MM-DD', 'resume:<id>'),
+-- merged register-wise by every worker's counter flush
+CREATE TABLE [dbo].[VisitorSketches](
+	[SketchKey] [varchar](50) NOT NULL,
+	[Precision] [tinyint] NOT NULL,
+	[Registers] [varbinary](max) NOT NULL,
+	[UpdatedAt] [datetime2](0) NOT NULL,
+PRIMARY KEY CLUSTERED 
+(
+	[SketchKey] ASC
+)
+) ON [PRIMARY] TEXTIMAGE_ON [PRIMARY]
+GO
@@ -126,12 +126,25 @@ let currentResumeId = null; // Store the current resume ID
 
 // ==================== TRACKING FUNCTIONS ====================
 
+// Anonymous ID kept in localStorage so the API can count unique visitors
+function getVisitorId() {
+    let visitorId = localStorage.getItem('visitor_id');
+    if (!visitorId) {
+        visitorId = window.crypto && crypto.randomUUID
+            ? crypto.randomUUID()
+            : Date.now().toString(36) + Math.random().toString(36).slice(2);
+        localStorage.setItem('visitor_id', visitorId);
+    }
+    return visitorId;
+}
+
 // Track visitor when page loads
 async function trackVisitor() {
     try {
         const response = await fetch('http://localhost:5000/api/visitor/increment', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ visitor_id: getVisitorId() })
         });
         const result = await response.json();
         if (result.success) {